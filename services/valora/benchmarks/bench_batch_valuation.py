@@ -0,0 +1,67 @@
+"""Rows per second of the batch valuation path versus one request per property.
+
+Run from ``services/valora``::
+
+    python -m benchmarks.bench_batch_valuation --rows 20000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from services.valuation_orchestrator.app.pipelines.real_estate import RealEstatePipeline
+from valora_common.schemas.valuation import ValuationRequest
+
+
+def build_portfolio(rows: int, seed: int = 7) -> list[ValuationRequest]:
+    rng = random.Random(seed)
+    return [
+        ValuationRequest(
+            class_="real_estate",
+            attributes={
+                "address": f"{index} Portfolio Way",
+                "zip": f"{60000 + index % 500}",
+                "living_area_sqft": rng.randint(700, 4200),
+                "bedrooms": rng.randint(1, 6),
+                "bathrooms": rng.choice([1, 1.5, 2, 2.5, 3, 4]),
+                "year_built": rng.randint(1920, 2023),
+            },
+        )
+        for index in range(rows)
+    ]
+
+
+def bench_per_request(portfolio: list[ValuationRequest]) -> float:
+    pipeline = RealEstatePipeline()
+    started = time.perf_counter()
+    for payload in portfolio:
+        pipeline.valuate(payload)
+    return time.perf_counter() - started
+
+
+def bench_batch(portfolio: list[ValuationRequest]) -> float:
+    pipeline = RealEstatePipeline()
+    started = time.perf_counter()
+    pipeline.valuate_batch(portfolio)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    portfolio = build_portfolio(args.rows)
+    per_request = min(bench_per_request(portfolio) for _ in range(args.repeat))
+    batch = min(bench_batch(portfolio) for _ in range(args.repeat))
+
+    print(f"rows: {args.rows}")
+    print(f"per-request: {args.rows / per_request:>12,.0f} rows/s ({per_request * 1000:.1f} ms)")
+    print(f"batch:       {args.rows / batch:>12,.0f} rows/s ({batch * 1000:.1f} ms)")
+    print(f"speedup:     {per_request / batch:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
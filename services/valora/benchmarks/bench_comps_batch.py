@@ -0,0 +1,103 @@
+"""Subjects per second through POST /comps/batch against sequential GET /comps.
+
+Both paths run the comparable engine app in process over httpx's ASGI transport,
+so the comparison includes request parsing and JSON encoding but no network.
+Pass ``--url`` to measure a running service instead. Run from
+``services/valora``::
+
+    python -m benchmarks.bench_comps_batch --rows 1000000 --subjects 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+from services.comparable_engine.app.sales import SalesTable
+
+
+def subjects(count: int, seed: int = 4) -> List[Dict[str, Any]]:
+    sales = SalesTable.synthetic(count, seed=seed)
+    return [
+        {"latitude": lat, "longitude": lon, "living_area_sqft": sqft, "bedrooms": beds}
+        for lat, lon, sqft, beds in zip(
+            sales.latitude.tolist(),
+            sales.longitude.tolist(),
+            sales.living_area_sqft.tolist(),
+            sales.bedrooms.tolist(),
+        )
+    ]
+
+
+async def sequential(client: httpx.AsyncClient, batch: List[Dict[str, Any]], k: int) -> float:
+    started = time.perf_counter()
+    for subject in batch:
+        response = await client.get("/comps", params={"class_": "real_estate", "k": k, **subject})
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def batched(client: httpx.AsyncClient, batch: List[Dict[str, Any]], k: int) -> float:
+    body: Dict[str, Any] = {"class": "real_estate", "k": k}
+    for name in batch[0]:
+        body[name] = [subject[name] for subject in batch]
+    started = time.perf_counter()
+    lines = 0
+    async with client.stream("POST", "/comps/batch", json=body) as response:
+        response.raise_for_status()
+        async for _ in response.aiter_lines():
+            lines += 1
+    assert lines == len(batch)
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> None:
+    batch = subjects(args.subjects)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=None)
+        await report(client, batch, args)
+        await client.aclose()
+        return
+    os.environ["COMPS_SYNTHETIC_ROWS"] = str(args.rows)
+    from services.comparable_engine.app.main import app
+
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        print(f"{args.rows} sales loaded in {time.perf_counter() - started:.1f}s")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://comps") as client:
+            await report(client, batch, args)
+
+
+async def report(
+    client: httpx.AsyncClient, batch: List[Dict[str, Any]], args: argparse.Namespace
+) -> None:
+    sample = batch[: args.sequential]
+    seq = await sequential(client, sample, args.k)
+    bat = await batched(client, batch, args.k)
+    seq_rate, bat_rate = len(sample) / seq, len(batch) / bat
+    print(f"  sequential GET /comps : {seq_rate:8.0f} subjects/s  ({len(sample)} calls)")
+    print(f"  POST /comps/batch     : {bat_rate:8.0f} subjects/s  ({len(batch)} subjects)")
+    print(f"  speed-up              : {bat_rate / seq_rate:8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--subjects", type=int, default=2000)
+    parser.add_argument("--sequential", type=int, default=500, help="GET calls to time")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--url", default="", help="base URL of a running comparable engine")
+    args = parser.parse_args()
+    np.seterr(all="ignore")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
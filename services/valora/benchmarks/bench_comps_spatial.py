@@ -0,0 +1,71 @@
+"""Comps query latency of the grid index as the number of sales grows.
+
+Builds the index over synthetic sales around one metro area and times k-nearest
+and radius queries from random subjects, next to a brute-force haversine scan of
+every sale. Run from ``services/valora``::
+
+    python -m benchmarks.bench_comps_spatial --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from services.comparable_engine.app.sales import SalesTable
+from services.comparable_engine.app.spatial import GridIndex, haversine_mi
+
+
+def percentiles(query: Callable[[int], object], subjects: int) -> tuple[float, float]:
+    timings: List[float] = []
+    for subject in range(subjects):
+        started = time.perf_counter()
+        query(subject)
+        timings.append((time.perf_counter() - started) * 1000)
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--radius-mi", type=float, default=1.0)
+    parser.add_argument("--cell-degrees", type=float, default=0.01)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    print(
+        f"{'sales':>9} {'build ms':>9} {'knn p50':>8} {'knn p99':>8}"
+        f" {'radius p50':>11} {'scan p50':>9}  (ms)"
+    )
+    for size in args.sizes:
+        sales = SalesTable.synthetic(size)
+        started = time.perf_counter()
+        index = GridIndex(sales.latitude, sales.longitude, cell_degrees=args.cell_degrees)
+        build_ms = (time.perf_counter() - started) * 1000
+        subjects = rng.choice(size, args.queries)
+        lat = sales.latitude[subjects] + rng.normal(0, 0.002, args.queries)
+        lon = sales.longitude[subjects] + rng.normal(0, 0.002, args.queries)
+
+        knn = percentiles(lambda i: index.nearest(lat[i], lon[i], args.k), args.queries)
+        radius = percentiles(
+            lambda i: index.within(lat[i], lon[i], args.radius_mi, limit=args.k), args.queries
+        )
+        scan = percentiles(
+            lambda i: np.argpartition(
+                haversine_mi(lat[i], lon[i], sales.latitude, sales.longitude), args.k
+            )[: args.k],
+            min(args.queries, 50),
+        )
+        print(
+            f"{size:>9} {build_ms:>9.1f} {knn[0]:>8.3f} {knn[1]:>8.3f}"
+            f" {radius[0]:>11.3f} {scan[0]:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Filtered, similarity-ranked comps queries against the columnar sales store.
+
+Times ``SalesStore.search`` (ranking plus building the ``Comparable`` records the
+endpoint returns) for subjects drawn from the data, without filters, with a
+selective attribute filter and with a sale-date window. Run from
+``services/valora``::
+
+    python -m benchmarks.bench_comps_store --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from services.comparable_engine.app.sales import SalesTable
+from services.comparable_engine.app.store import Bounds, CompsQuery, SalesStore
+
+SCENARIOS: Dict[str, Dict[str, Bounds]] = {
+    "no filters": {},
+    "3 bed, built 1990+": {"bedrooms": (3, 3), "year_built": (1990, None)},
+    "3000-3100 sqft": {"living_area_sqft": (3000, 3100)},
+    "sold in last 90 days": {
+        "sale_date": (float(np.datetime64("2024-04-01", "D").astype(int)), None)
+    },
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = SalesStore(SalesTable.synthetic(args.rows))
+    print(f"{args.rows} sales, store built in {time.perf_counter() - started:.2f}s")
+    rng = np.random.default_rng(9)
+    subjects = rng.choice(len(store), args.queries)
+    for label, ranges in SCENARIOS.items():
+        timings: List[float] = []
+        for row in subjects:
+            query = CompsQuery(
+                latitude=float(store.sales.latitude[row]) + rng.normal(0, 0.002),
+                longitude=float(store.sales.longitude[row]) + rng.normal(0, 0.002),
+                subject={"living_area_sqft": 1800.0, "bedrooms": 3.0, "bathrooms": 2.0},
+                ranges=ranges,
+                k=args.k,
+            )
+            began = time.perf_counter()
+            store.search(query)
+            timings.append((time.perf_counter() - began) * 1000)
+        p50, p99 = np.percentile(timings, [50, 99])
+        print(f"  {label:<22} p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
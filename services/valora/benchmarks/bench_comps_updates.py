@@ -0,0 +1,105 @@
+"""Comps query latency while the live index absorbs sale inserts and retirements.
+
+Times ``LiveSalesIndex.search`` on a settled index, then again while a writer thread
+applies feed-sized updates (new sales plus retirements) and the index merges them in
+the background, and compares both with rebuilding a ``SalesStore`` from scratch. Run
+from ``services/valora``::
+
+    python -m benchmarks.bench_comps_updates --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from services.comparable_engine.app.live import LiveSalesIndex
+from services.comparable_engine.app.sales import SalesTable
+from services.comparable_engine.app.store import CompsQuery, SalesStore
+
+
+def _queries(sales: SalesTable, count: int, k: int, seed: int) -> List[CompsQuery]:
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(sales), count)
+    return [
+        CompsQuery(
+            latitude=float(sales.latitude[row]) + rng.normal(0, 0.002),
+            longitude=float(sales.longitude[row]) + rng.normal(0, 0.002),
+            subject={"living_area_sqft": 1800.0, "bedrooms": 3.0, "bathrooms": 2.0},
+            k=k,
+        )
+        for row in rows
+    ]
+
+
+def _time(index: LiveSalesIndex, queries: List[CompsQuery]) -> List[float]:
+    timings = []
+    for query in queries:
+        began = time.perf_counter()
+        index.search(query)
+        timings.append((time.perf_counter() - began) * 1000)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(f"  {label:<30} p50 {p50:6.2f} ms   p99 {p99:6.2f} ms   ({len(timings)} queries)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--updates", type=int, default=40, help="update batches to apply")
+    parser.add_argument("--batch", type=int, default=2000, help="new sales per update")
+    parser.add_argument("--retire", type=int, default=500, help="retirements per update")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    incoming = args.updates * args.batch
+    sales = SalesTable.synthetic(args.rows + incoming)
+    started = time.perf_counter()
+    SalesStore(sales.take(np.arange(args.rows)))
+    rebuild = time.perf_counter() - started
+    index = LiveSalesIndex(sales.take(np.arange(args.rows)))
+    print(f"{args.rows} sales; a full rebuild takes {rebuild:.2f}s")
+    queries = _queries(sales, args.queries, args.k, seed=9)
+    _time(index, queries[:20])
+    _report("settled index", _time(index, queries))
+
+    rng = np.random.default_rng(5)
+    applied: List[float] = []
+
+    def write() -> None:
+        for update in range(args.updates):
+            start = args.rows + update * args.batch
+            retired = np.char.add("sale_", rng.choice(start, args.retire).astype(str))
+            began = time.perf_counter()
+            index.apply(sales.take(np.arange(start, start + args.batch)), retired.tolist())
+            applied.append((time.perf_counter() - began) * 1000)
+            time.sleep(0.01)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    during: List[float] = []
+    while writer.is_alive():
+        during.extend(_time(index, queries[:25]))
+    writer.join()
+    _report("while updating and merging", during)
+    index.wait_for_merges()
+    _report("after merges", _time(index, queries))
+    index.close()
+    stats = index.stats()
+    p50 = np.percentile(applied, 50)
+    print(
+        f"  {args.updates} updates of {args.batch} sales + {args.retire} retirements: "
+        f"apply p50 {p50:.1f} ms; {stats['merges']} merges; segments {stats['segments']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
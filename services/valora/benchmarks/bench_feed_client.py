@@ -0,0 +1,132 @@
+"""Upstream fetch latency: a new httpx client per call versus one pooled keep-alive client.
+
+Starts a stub property-sales API on localhost (plain HTTP, or HTTPS with a throwaway
+self-signed certificate when ``--tls`` is given and ``openssl`` is on the PATH) and
+times ``DataFeedClient.fetch_residential_sales`` both ways, one call at a time and
+with concurrent callers. Run from ``services/valora``::
+
+    python -m benchmarks.bench_feed_client --requests 500 --tls
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from services.data_feeds.app.clients.external import (
+    SAMPLE_DIR,
+    DataFeedClient,
+    create_http_client,
+)
+from services.data_feeds.app.settings import Settings
+
+BODY = json.dumps(json.loads((SAMPLE_DIR / "residential_sales.json").read_text())).encode()
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+    + f"content-length: {len(BODY)}\r\n\r\n".encode()
+    + BODY
+)
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            writer.write(RESPONSE)
+            await writer.drain()
+            if b"connection: close" in head.lower():
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _self_signed(directory: Path) -> Optional[ssl.SSLContext]:
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    try:
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+            + ["-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost"]
+            + ["-keyout", str(key), "-out", str(cert)],
+            check=True,
+            capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    # Both clients trust the throwaway certificate through the standard variable.
+    os.environ["SSL_CERT_FILE"] = str(cert)
+    return context
+
+
+async def _time(feeds: DataFeedClient, requests: int, concurrency: int) -> List[float]:
+    timings: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            began = time.perf_counter()
+            await feeds.fetch_residential_sales()
+            timings.append((time.perf_counter() - began) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return timings
+
+
+def _report(label: str, timings: List[float], elapsed: float) -> None:
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(
+        f"  {label:<22} p50 {p50:6.2f} ms   p99 {p99:6.2f} ms   {len(timings) / elapsed:7.0f} req/s"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        context = _self_signed(Path(directory)) if args.tls else None
+        if args.tls and context is None:
+            print("openssl is not available; falling back to plain HTTP")
+        server = await asyncio.start_server(_serve, "localhost", 0, ssl=context)
+        port = server.sockets[0].getsockname()[1]
+        scheme = "https" if context else "http"
+        os.environ["PROPERTY_SALES_API_URL"] = f"{scheme}://localhost:{port}/sales"
+        http = create_http_client(Settings())
+        print(f"stub upstream at {os.environ['PROPERTY_SALES_API_URL']}")
+        try:
+            for concurrency in (1, args.concurrency):
+                print(f"{args.requests} requests, {concurrency} at a time")
+                for label, feeds in (
+                    ("client per call", DataFeedClient()),
+                    ("pooled keep-alive", DataFeedClient(http)),
+                ):
+                    await _time(feeds, 10, concurrency)
+                    began = time.perf_counter()
+                    timings = await _time(feeds, args.requests, concurrency)
+                    _report(label, timings, time.perf_counter() - began)
+        finally:
+            await http.aclose()
+            server.close()
+            await server.wait_closed()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--tls", action="store_true", help="serve the stub over HTTPS")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Requests per second for a cached feed: re-encoding the dict per hit vs pre-encoded bytes.
+
+Seeds the feed cache with a residential sales feed of ``--markets`` entries, then
+drives ``GET /feeds/property-sales/residential`` straight through the ASGI app (no
+network), comparing a route that returns the cached dict, with and without
+``GZipMiddleware``, against the data_feeds app serving the cached JSON or gzip bytes,
+and answering ``If-None-Match`` with 304. Run from ``services/valora``::
+
+    python -m benchmarks.bench_feed_responses --markets 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+os.environ.setdefault("DATA_FEED_RATE_LIMIT", "1000000000")
+os.environ.setdefault("DATA_FEED_REFRESH_ENABLED", "false")
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from starlette.middleware.gzip import GZipMiddleware  # noqa: E402
+from starlette.types import ASGIApp  # noqa: E402
+
+from services.data_feeds.app.cache import feed_cache, get_cached  # noqa: E402
+from services.data_feeds.app.main import app as feeds_app  # noqa: E402
+from services.data_feeds.app.main import lifespan  # noqa: E402
+from services.data_feeds.app.security import rate_limiter  # noqa: E402
+from valora_common.security import SecurityHeadersMiddleware  # noqa: E402
+
+PATH = "/feeds/property-sales/residential"
+Headers = List[Tuple[bytes, bytes]]
+
+
+def _feed(markets: int) -> Dict[str, Any]:
+    return {
+        "period": "2025-05",
+        "region": "US",
+        "total_sales": 48231,
+        "median_price": 412000,
+        "median_days_on_market": 19,
+        "top_markets": [
+            {"msa": f"Market {index}, ST", "median_price": 300000 + index * 250, "volume": index}
+            for index in range(markets)
+        ],
+    }
+
+
+def _dict_app(gzip: bool) -> FastAPI:
+    """The route as it was: return the cached dict and let FastAPI encode it."""
+    app = FastAPI()
+    app.add_middleware(SecurityHeadersMiddleware)
+    if gzip:
+        app.add_middleware(GZipMiddleware, minimum_size=500)
+
+    async def unused() -> dict:  # pragma: no cover - the cache is seeded
+        raise RuntimeError("not cached")
+
+    @app.get(PATH, dependencies=[Depends(rate_limiter)])
+    async def residential() -> dict:
+        return await get_cached("residential_sales", unused)
+
+    return app
+
+
+async def _call(app: ASGIApp, headers: Headers) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+        "app": app,
+    }
+    status = 0
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _rps(app: ASGIApp, headers: Headers, seconds: float) -> Tuple[float, int]:
+    status = await _call(app, headers)
+    count, began = 0, time.perf_counter()
+    while time.perf_counter() - began < seconds:
+        for _ in range(50):
+            await _call(app, headers)
+        count += 50
+    return count / (time.perf_counter() - began), status
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with lifespan(feeds_app):
+        feed = _feed(args.markets)
+
+        async def fetch() -> Dict[str, Any]:
+            return feed
+
+        await feed_cache.refresh("residential_sales", fetch)
+        encoded = await feed_cache.get_encoded("residential_sales", fetch)
+        print(
+            f"feed of {args.markets} markets: {len(encoded.body)} bytes JSON, "
+            f"{len(encoded.gzipped)} gzipped"
+        )
+        gzip: Headers = [(b"accept-encoding", b"gzip")]
+        identity: Headers = [(b"accept-encoding", b"identity")]
+        revalidate = gzip + [(b"if-none-match", encoded.gzip_etag.encode())]
+        scenarios = [
+            ("dict, encoded per hit", _dict_app(gzip=False), identity),
+            ("dict + GZipMiddleware", _dict_app(gzip=True), gzip),
+            ("cached JSON bytes", feeds_app, identity),
+            ("cached gzip bytes", feeds_app, gzip),
+            ("If-None-Match -> 304", feeds_app, revalidate),
+        ]
+        for label, app, headers in scenarios:
+            rps, status = await _rps(app, headers, args.seconds)
+            print(f"  {label:<24} {rps:8.0f} req/s   (status {status})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--markets", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
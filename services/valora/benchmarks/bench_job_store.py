@@ -0,0 +1,86 @@
+"""Job store throughput: in-memory versus SQLite (WAL), single and multi-process.
+
+Run from ``services/valora``::
+
+    python -m benchmarks.bench_job_store --jobs 5000 --processes 4
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from services.valuation_orchestrator.app.storage.jobs import (
+    InMemoryJobStore,
+    JobStore,
+    SQLiteJobStore,
+)
+from valora_common.schemas.valuation import JobProgress
+
+
+def exercise(store: JobStore, prefix: str, jobs: int) -> None:
+    for index in range(jobs):
+        job_id = f"{prefix}_{index}"
+        store.create(job_id, total=1)
+        store.update(job_id, status="running", progress=JobProgress(total=1))
+        store.update(
+            job_id, status="succeeded", progress=JobProgress(processed=1, total=1, succeeded=1)
+        )
+        store.get(job_id)
+
+
+def _worker(path: str, prefix: str, jobs: int) -> None:
+    store = SQLiteJobStore(path)
+    exercise(store, prefix, jobs)
+    store.close()
+
+
+def bench_single(store: JobStore, jobs: int) -> float:
+    started = time.perf_counter()
+    exercise(store, "job", jobs)
+    return time.perf_counter() - started
+
+
+def bench_multi_process(path: str, jobs: int, processes: int) -> float:
+    SQLiteJobStore(path).close()
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_worker, args=(path, f"proc{index}", jobs))
+        for index in range(processes)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    # Each job is one create, two updates and one get.
+    operations = args.jobs * 4
+    with tempfile.TemporaryDirectory() as scratch:
+        memory = bench_single(InMemoryJobStore(), args.jobs)
+        sqlite_store = SQLiteJobStore(Path(scratch) / "single.db")
+        sqlite = bench_single(sqlite_store, args.jobs)
+        sqlite_store.close()
+        shared = bench_multi_process(str(Path(scratch) / "shared.db"), args.jobs, args.processes)
+
+    print(f"jobs per writer: {args.jobs}")
+    print(f"in-memory:              {operations / memory:>10,.0f} ops/s")
+    print(f"sqlite (1 process):     {operations / sqlite:>10,.0f} ops/s")
+    print(
+        f"sqlite ({args.processes} processes):    "
+        f"{operations * args.processes / shared:>10,.0f} ops/s (includes interpreter start-up)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Throughput and latency of /predict scoring with and without micro-batching.
+
+Closed-loop callers each submit one request at a time to the MicroBatcher that
+fronts the predictor, so batch sizes arise from concurrency alone. Run from
+``services/valora``::
+
+    python -m benchmarks.bench_micro_batching --callers 256 --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from services.model_serving.app.batching import MicroBatcher
+from services.model_serving.app.predictor import BaselinePredictor
+from valora_common.schemas.valuation import ValuationRequest
+
+
+def build_requests(count: int, seed: int = 11) -> list[ValuationRequest]:
+    rng = random.Random(seed)
+    return [
+        ValuationRequest(
+            class_="real_estate", attributes={"living_area_sqft": rng.randint(700, 4200)}
+        )
+        for _ in range(count)
+    ]
+
+
+async def run(
+    requests: list[ValuationRequest], callers: int, max_batch_size: int, window_ms: float
+) -> dict:
+    batcher = MicroBatcher(
+        BaselinePredictor().predict_batch, max_batch_size=max_batch_size, window_ms=window_ms
+    )
+    await batcher.start()
+    latencies: list[float] = []
+    pending = iter(requests)
+
+    async def caller() -> None:
+        for payload in pending:
+            started = time.perf_counter()
+            await batcher.submit(payload)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    elapsed = time.perf_counter() - started
+    stats = batcher.stats()
+    await batcher.stop()
+    latencies.sort()
+    return {
+        "rps": len(requests) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "mean_batch": stats["mean_batch_size"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=256)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--windows-ms", type=float, nargs="+", default=[0, 1, 2, 5])
+    args = parser.parse_args()
+
+    requests = build_requests(args.requests)
+    print(f"requests: {args.requests}  concurrent callers: {args.callers}")
+    print(f"{'mode':>22} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>10}")
+    modes = [("unbatched", 1, 0.0)] + [
+        (f"batched {window:g}ms window", args.max_batch_size, window) for window in args.windows_ms
+    ]
+    for label, size, window in modes:
+        result = asyncio.run(run(requests, args.callers, size, window))
+        print(
+            f"{label:>22} {result['rps']:9.0f} {result['p50_ms']:8.2f}"
+            f" {result['p99_ms']:8.2f} {result['mean_batch']:10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Start-up time and RSS of the memory-mapped model registry as the model count grows.
+
+Writes ``--models`` random tree ensembles under a temporary registry root, then, in
+a fresh interpreter per case, measures time to a first prediction and the private
+and shared (file-backed) RSS after scoring with every model, for the lazy mmap
+registry versus loading everything eagerly into memory. Run from ``services/valora``::
+
+    python -m benchmarks.bench_model_registry --models 1 16 64
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_tree_inference import random_ensemble
+
+_PROBE = """
+import json, sys, time
+import numpy as np
+started = time.perf_counter()
+from services.model_serving.app.registry import ModelRegistry
+from services.model_serving.app.trees import TreeEnsemble
+root, mode, regions, resident = sys.argv[1], sys.argv[2], json.loads(sys.argv[3]), int(sys.argv[4])
+rows = np.random.default_rng(0).uniform(0, 1, size=(64, 7))
+if mode == "registry":
+    registry = ModelRegistry(root, max_resident=resident)
+    get = lambda region: registry.get("real_estate", region)
+else:
+    models = {r: TreeEnsemble.load(f"{root}/real_estate/{r}/v1") for r in regions}
+    get = models.__getitem__
+get(regions[0]).predict(rows)
+first = time.perf_counter() - started
+for region in regions:
+    get(region).predict(rows)
+status = open("/proc/self/status").read()
+mb = lambda field: int(status.split(field + ":")[1].split()[0]) / 1024
+print(json.dumps({"first_ms": first * 1000, "anon_mb": mb("RssAnon"), "file_mb": mb("RssFile")}))
+"""
+
+
+def probe(root: Path, mode: str, regions: list[str], resident: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, str(root), mode, json.dumps(regions), str(resident)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--trees", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--max-resident", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        started = time.perf_counter()
+        model = random_ensemble(args.trees, args.depth)
+        regions = [f"region{index}" for index in range(max(args.models))]
+        for region in regions:
+            model.save(root / "real_estate" / region / "v1")
+        files = (root / "real_estate" / regions[0] / "v1").iterdir()
+        size_mb = sum(path.stat().st_size for path in files) / 2**20
+        print(
+            f"{len(regions)} models of {model.n_trees} trees, {size_mb:.1f} MB each "
+            f"(written in {time.perf_counter() - started:.1f}s)"
+        )
+        print(
+            f"registry keeps at most {args.max_resident} models mapped; "
+            "file-backed pages are shared"
+        )
+        print(
+            f"{'models':>7} {'mode':>9} {'first predict ms':>17}"
+            f" {'private MB':>11} {'shared MB':>10}"
+        )
+        for count in args.models:
+            for mode in ("eager", "registry"):
+                result = probe(root, mode, regions[:count], args.max_resident)
+                print(
+                    f"{count:>7} {mode:>9} {result['first_ms']:17.1f}"
+                    f" {result['anon_mb']:11.1f} {result['file_mb']:10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
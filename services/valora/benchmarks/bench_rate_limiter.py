@@ -0,0 +1,110 @@
+"""Rate-limit check cost: the old per-worker fixed window against the token-bucket stores.
+
+Times one check per call over ``--clients`` distinct client keys, for the fixed-window
+dict the data feeds service used (env read per call, buckets never pruned), a
+:class:`MemoryBucketStore` and a :class:`SQLiteBucketStore`, then runs the SQLite store
+from ``--workers`` processes at once to show the shared budget holding. Run from
+``services/valora``::
+
+    python -m benchmarks.bench_rate_limiter --checks 200000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from valora_common.ratelimit import (
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    SQLiteBucketStore,
+)
+
+
+@dataclass
+class _Window:
+    count: int
+    window_start: float
+
+
+def _fixed_window() -> Callable[[str], bool]:
+    """The check as it was, minus the HTTPException."""
+    buckets: Dict[str, _Window] = {}
+
+    def check(identifier: str) -> bool:
+        rate_limit = int(os.getenv("DATA_FEED_RATE_LIMIT", "60"))
+        window_seconds = int(os.getenv("DATA_FEED_WINDOW_SECONDS", "60"))
+        now = time.time()
+        bucket = buckets.get(identifier)
+        if not bucket or now - bucket.window_start >= window_seconds:
+            buckets[identifier] = _Window(count=1, window_start=now)
+            return True
+        if bucket.count >= rate_limit:
+            return False
+        bucket.count += 1
+        return True
+
+    return check
+
+
+def _rate(check: Callable[[str], object], checks: int, clients: int) -> float:
+    keys = [f"10.0.{index // 256}.{index % 256}" for index in range(clients)]
+    began = time.perf_counter()
+    for index in range(checks):
+        check(keys[index % clients])
+    return checks / (time.perf_counter() - began)
+
+
+def _worker(path: str, checks: int) -> Tuple[int, float, int]:
+    store = SQLiteBucketStore(path)
+    limiter = RateLimiter(RateLimit(1000, 3600), store, scope="bench")
+    began = time.perf_counter()
+    allowed = sum(limiter.check(f"client-{index % 4}").allowed for index in range(checks))
+    return allowed, checks / (time.perf_counter() - began), store.failed_open
+
+
+def run(args: argparse.Namespace) -> None:
+    limit = RateLimit(60, 60)
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_store = SQLiteBucketStore(str(Path(directory) / "buckets.sqlite3"))
+        scenarios: List[Tuple[str, Callable[[str], object]]] = [
+            ("fixed window (old)", _fixed_window()),
+            ("token bucket, memory", RateLimiter(limit, MemoryBucketStore(), scope="b").check),
+            ("token bucket, SQLite", RateLimiter(limit, sqlite_store, scope="b").check),
+        ]
+        print(f"{args.checks} checks over {args.clients} clients, one process")
+        for label, check in scenarios:
+            rate = _rate(check, args.checks, args.clients)
+            print(f"  {label:<22} {rate:10.0f} checks/s   {1e6 / rate:6.2f} us/check")
+        sqlite_store.close()
+
+        path = str(Path(directory) / "shared.sqlite3")
+        per_worker = args.checks // 10
+        with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+            results = pool.starmap(_worker, [(path, per_worker)] * args.workers)
+        allowed = sum(allowed for allowed, _, _ in results)
+        failed_open = sum(failed_open for _, _, failed_open in results)
+        print(
+            f"{args.workers} processes x {per_worker} checks, 4 clients allowed 1000/h each: "
+            f"{allowed} allowed (budget 4000, {failed_open} let through on lock timeout), "
+            f"{sum(rate for _, rate, _ in results):.0f} checks/s combined"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=200_000)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
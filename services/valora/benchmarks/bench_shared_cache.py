@@ -0,0 +1,88 @@
+"""Cache hit rate as worker processes are added: per-process memory vs shared SQLite.
+
+Requests are spread round-robin across workers, as a load balancer in front of several
+uvicorn workers would. Run from ``services/valora``::
+
+    python -m benchmarks.bench_shared_cache --requests 20000 --properties 2000
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from services.valuation_orchestrator.app.pipelines.real_estate import RealEstatePipeline
+from services.valuation_orchestrator.app.storage.result_cache import create_valuation_cache
+from valora_common.schemas.valuation import ValuationRequest
+
+
+def _request_stream(requests: int, properties: int, seed: int = 11) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.randrange(properties) for _ in range(requests)]
+
+
+def _worker(
+    backend: str, path: str, property_ids: list[int], results: "multiprocessing.Queue"
+) -> None:
+    cache = create_valuation_cache(backend, path=path, max_entries=100000, ttl_seconds=3600)
+    pipeline = RealEstatePipeline(cache=cache)
+    for property_id in property_ids:
+        pipeline.valuate(
+            ValuationRequest(
+                class_="real_estate",
+                attributes={
+                    "address": f"{property_id} Benchmark Blvd",
+                    "living_area_sqft": 900 + property_id % 2500,
+                },
+            )
+        )
+    stats = cache.stats()
+    results.put((stats["hits"], stats["misses"]))
+
+
+def run(backend: str, workers: int, stream: list[int], scratch: Path) -> tuple[float, float]:
+    context = multiprocessing.get_context("spawn")
+    results: multiprocessing.Queue = context.Queue()
+    path = str(scratch / f"{backend}_{workers}.db")
+    processes = [
+        context.Process(target=_worker, args=(backend, path, stream[index::workers], results))
+        for index in range(workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+    hits = sum(hit for hit, _ in totals)
+    lookups = sum(hit + miss for hit, miss in totals)
+    return hits / lookups, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--properties", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    stream = _request_stream(args.requests, args.properties)
+    print(
+        f"{'workers':>7}  {'memory hit rate':>15}  {'sqlite hit rate':>15}  {'sqlite wall s':>13}"
+    )
+    with tempfile.TemporaryDirectory() as scratch:
+        for workers in args.workers:
+            memory_rate, _ = run("memory", workers, stream, Path(scratch))
+            sqlite_rate, sqlite_elapsed = run("sqlite", workers, stream, Path(scratch))
+            print(
+                f"{workers:>7}  {memory_rate:>15.1%}  {sqlite_rate:>15.1%}"
+                f"  {sqlite_elapsed:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Rows per millisecond of the flattened NumPy tree engine, against scikit-learn.
+
+Fits a GradientBoostingRegressor on synthetic home sales when scikit-learn is
+installed (it is only needed here, never in the serving image), otherwise scores
+a random ensemble of the same shape. Run from ``services/valora``::
+
+    python -m benchmarks.bench_tree_inference --trees 300 --depth 6 --rows 100000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from services.model_serving.app.trees import TreeEnsemble
+
+FEATURES = [
+    "living_area_sqft",
+    "bedrooms",
+    "bathrooms",
+    "year_built",
+    "lot_sqft",
+    "latitude",
+    "longitude",
+]
+
+
+def synthetic_sales(rows: int, seed: int = 5) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    sqft = rng.uniform(600, 4500, rows)
+    beds = rng.integers(1, 7, rows)
+    baths = rng.choice([1, 1.5, 2, 2.5, 3, 4], rows)
+    year = rng.integers(1900, 2024, rows)
+    lot = rng.uniform(1000, 20000, rows)
+    lat, lon = rng.uniform(41.6, 42.1, rows), rng.uniform(-88.0, -87.5, rows)
+    price = (
+        sqft * 210 + beds * 9000 + baths * 12000 + (year - 1950) * 800 + np.sqrt(lot) * 400
+        + np.sin(lat * 40) * 30000 + rng.normal(0, 15000, rows)
+    )
+    return np.column_stack([sqft, beds, baths, year, lot, lat, lon]), price
+
+
+def random_ensemble(trees: int, depth: int, seed: int = 3) -> TreeEnsemble:
+    rng = np.random.default_rng(seed)
+    nodes = 2 ** (depth + 1) - 1
+    internal = 2**depth - 1
+    index = np.arange(nodes)
+    left = np.where(index < internal, 2 * index + 1, -1)
+    right = np.where(index < internal, 2 * index + 2, -1)
+    return TreeEnsemble.from_arrays(
+        [
+            (
+                rng.integers(0, len(FEATURES), nodes),
+                rng.uniform(0, 1, nodes),
+                left,
+                right,
+                None,
+                rng.normal(0, 1000, nodes),
+            )
+            for _ in range(trees)
+        ],
+        base_score=350000.0,
+        feature_names=FEATURES,
+    )
+
+
+def rows_per_ms(
+    predict: Callable[[np.ndarray], np.ndarray], rows: np.ndarray, repeat: int
+) -> float:
+    best = min(_timed(predict, rows) for _ in range(repeat))
+    return len(rows) / (best * 1000)
+
+
+def _timed(predict: Callable[[np.ndarray], np.ndarray], rows: np.ndarray) -> float:
+    started = time.perf_counter()
+    predict(rows)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trees", type=int, default=300)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    features, price = synthetic_sales(max(args.rows, 20000))
+    rows = features[: args.rows]
+    reference: Optional[object] = None
+    try:
+        from sklearn.ensemble import GradientBoostingRegressor
+    except ImportError:
+        model = random_ensemble(args.trees, args.depth)
+        print("scikit-learn not installed: scoring a random ensemble")
+    else:
+        reference = GradientBoostingRegressor(n_estimators=args.trees, max_depth=args.depth)
+        reference.fit(features[:20000], price[:20000])
+        model = TreeEnsemble.from_sklearn(reference, FEATURES)
+
+    print(
+        f"trees: {model.n_trees}  nodes: {model.n_nodes}  depth: {model.max_depth}"
+        f"  rows: {args.rows}"
+    )
+    for batch in (1, 64, 4096, args.rows):
+        rate = rows_per_ms(model.predict, rows[:batch], args.repeat)
+        print(f"  numpy engine, batch {batch:>6}: {rate:9.1f} rows/ms")
+    if reference is not None:
+        sklearn_rate = rows_per_ms(reference.predict, rows, args.repeat)  # type: ignore[attr-defined]
+        error = np.abs(model.predict(rows) - reference.predict(rows)).max()  # type: ignore[attr-defined]
+        print(
+            f"  scikit-learn, batch {args.rows:>6}: {sklearn_rate:9.1f} rows/ms"
+            f"  (max abs diff {error:.2e})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Latency of unrelated requests while multi-MB images are being uploaded.
+
+Starts the streaming upload route and the previous read-everything-then-write handler
+in turn under uvicorn, fires concurrent uploads at it and pings a trivial endpoint
+for as long as they are in flight. Run from ``services/valora``::
+
+    python -m benchmarks.bench_uploads --uploads 16 --size-mb 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+from services.valuation_orchestrator.app.routes import uploads
+from services.valuation_orchestrator.app.settings import Settings, get_settings
+
+
+def _base_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def create_legacy_app() -> FastAPI:
+    app = _base_app()
+    upload_dir = Path(os.environ["BENCH_UPLOAD_DIR"])
+
+    @app.post("/valuations/{valuation_id}/images", status_code=201)
+    async def upload_images(valuation_id: str, image: UploadFile = File(...)) -> dict[str, str]:
+        destination = upload_dir / f"{valuation_id}_{image.filename}"
+        contents = await image.read()
+        with destination.open("wb") as handle:
+            handle.write(contents)
+        return {"status": "stored", "path": str(destination)}
+
+    return app
+
+
+def create_streaming_app() -> FastAPI:
+    app = _base_app()
+    settings = Settings()
+    settings.upload_dir = os.environ["BENCH_UPLOAD_DIR"]
+    settings.max_upload_bytes = 1 << 30
+    app.dependency_overrides[get_settings] = lambda: settings
+    app.include_router(uploads.router)
+    return app
+
+
+async def measure(base_url: str, uploads_count: int, payload: bytes) -> tuple[list[float], float]:
+    limits = httpx.Limits(max_connections=uploads_count + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        latencies: list[float] = []
+
+        async def upload(index: int) -> None:
+            response = await client.post(
+                f"/valuations/bench{index}/images",
+                files={"image": (f"photo{index}.jpg", io.BytesIO(payload), "image/jpeg")},
+            )
+            response.raise_for_status()
+
+        async def ping_until(done: asyncio.Event) -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                (await client.get("/ping")).raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.001)
+
+        done = asyncio.Event()
+        pinger = asyncio.create_task(ping_until(done))
+        started = time.perf_counter()
+        await asyncio.gather(*(upload(index) for index in range(uploads_count)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await pinger
+        return latencies, elapsed
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(base_url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/ping", timeout=1).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+def _p(values: list[float], quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * quantile), len(ordered) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=16)
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = os.urandom(int(args.size_mb * 1024 * 1024))
+    print(f"{args.uploads} concurrent uploads of {args.size_mb:g} MB x {args.rounds} rounds")
+    print(
+        f"{'handler':>10}  {'pings':>5}  {'ping p50 ms':>11}  {'ping p99 ms':>11}"
+        f"  {'ping max ms':>11}  {'upload s':>8}"
+    )
+    for label, factory in (("legacy", "create_legacy_app"), ("streaming", "create_streaming_app")):
+        with tempfile.TemporaryDirectory() as scratch:
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = subprocess.Popen(
+                [
+                    sys.executable, "-m", "uvicorn", f"benchmarks.bench_uploads:{factory}",
+                    "--factory", "--port", str(port), "--log-level", "warning",
+                ],
+                env={**os.environ, "BENCH_UPLOAD_DIR": scratch},
+            )
+            try:
+                _wait_until_up(base_url)
+                latencies: list[float] = []
+                elapsed = 0.0
+                for _ in range(args.rounds):
+                    round_latencies, round_elapsed = asyncio.run(
+                        measure(base_url, args.uploads, payload)
+                    )
+                    latencies.extend(round_latencies)
+                    elapsed += round_elapsed
+            finally:
+                server.terminate()
+                server.wait()
+        print(
+            f"{label:>10}  {len(latencies):>5}  {statistics.median(latencies):>11.2f}"
+            f"  {_p(latencies, 0.99):>11.2f}  {max(latencies):>11.2f}  {elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
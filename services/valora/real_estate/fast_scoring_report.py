@@ -0,0 +1,89 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from ml.model_inference import decode_image_bytes, score_image
+
+
+# Varied synthetic photos: exposure, blur and texture spread across the thresholds
+def make_varied_photos(count: int, width: int, height: int, seed: int = 5) -> list:
+    rng = np.random.default_rng(seed)
+    photos = []
+    for _ in range(count):
+        base = rng.uniform(40, 200)
+        gradient = np.linspace(base - 30, base + 30, width, dtype=np.float32)[None, :, None]
+        image = np.broadcast_to(gradient, (height, width, 3)).copy()
+        image += rng.normal(0, rng.uniform(2, 25), size=image.shape).astype(np.float32)
+        for _ in range(rng.integers(4, 30)):
+            x, y = rng.integers(0, width - 160), rng.integers(0, height - 120)
+            colour = rng.uniform(0, 255, 3).tolist()
+            cv2.rectangle(image, (int(x), int(y)), (int(x) + 150, int(y) + 100), colour, -1)
+        sigma = rng.choice([0, 0, 1.0, 2.5, 5.0])
+        if sigma:
+            image = cv2.GaussianBlur(image, (0, 0), float(sigma))
+        pixels = np.clip(image, 0, 255).astype(np.uint8)
+        ok, encoded = cv2.imencode(".jpg", pixels, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        photos.append(encoded.tobytes())
+    return photos
+
+
+def run(photos: list, reduction: int):
+    scores = []
+    peak = 0
+    started = time.perf_counter()
+    for payload in photos:
+        image = decode_image_bytes(payload, reduction)
+        scores.append(score_image(image, reduction))
+        peak = max(peak, image.nbytes)
+    return scores, time.perf_counter() - started, peak
+
+
+def compare(reference: list, candidate: list) -> dict:
+    conditions = np.mean([a["condition"] == b["condition"] for a, b in zip(reference, candidate)])
+    features = np.mean([a["features"] == b["features"] for a, b in zip(reference, candidate)])
+    brightness = np.mean(
+        [abs(a["brightness"] - b["brightness"]) for a, b in zip(reference, candidate)]
+    )
+    full_sharpness = np.array([a["sharpness"] for a in reference])
+    fast_sharpness = np.array([b["sharpness"] for b in candidate])
+    ranks = np.corrcoef(
+        full_sharpness.argsort().argsort(), fast_sharpness.argsort().argsort()
+    )[0, 1]
+    return {
+        "condition_agreement": conditions,
+        "feature_agreement": features,
+        "brightness_mae": brightness,
+        "sharpness_rank_corr": ranks,
+        "sharpness_ratio": float(np.median(fast_sharpness / np.maximum(full_sharpness, 1e-9))),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy vs speed of reduced-resolution scoring")
+    parser.add_argument("--photos", type=int, default=60)
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--height", type=int, default=1536)
+    args = parser.parse_args()
+
+    photos = make_varied_photos(args.photos, args.width, args.height)
+    reference, full_time, full_peak = run(photos, 1)
+    print(f"{args.photos} JPEG photos at {args.width}x{args.height}")
+    print(
+        f"{'mode':>6} {'ms/img':>7} {'speedup':>7} {'decoded KB':>10} {'cond agree':>10}"
+        f" {'feat agree':>10} {'bright MAE':>10} {'sharp rank r':>12} {'sharp ratio':>11}"
+    )
+    for reduction in (1, 2, 4, 8):
+        if reduction == 1:
+            scores, elapsed, peak = reference, full_time, full_peak
+        else:
+            scores, elapsed, peak = run(photos, reduction)
+        quality = compare(reference, scores)
+        label = "full" if reduction == 1 else f"1/{reduction}"
+        print(
+            f"{label:>6} {elapsed / args.photos * 1000:7.1f} {full_time / elapsed:7.1f}x"
+            f" {peak / 1024:10.0f} {quality['condition_agreement']:10.0%}"
+            f" {quality['feature_agreement']:10.0%} {quality['brightness_mae']:10.2f}"
+            f" {quality['sharpness_rank_corr']:12.3f} {quality['sharpness_ratio']:11.2f}"
+        )
@@ -1,16 +1,97 @@
+import argparse
 import base64
-from ml.model_inference import analyze_images
+import json
+import time
+import tracemalloc
+
+from ml.ingest import image_buffers_from_body
+from ml.model_inference import analyze_image_buffers, analyze_images
+
+BOUNDARY = "valora-photo-boundary"
+
 
 # Load a sample image and convert to base64
 def encode_image_to_base64(path: str) -> str:
     with open(path, "rb") as img_file:
         return base64.b64encode(img_file.read()).decode("utf-8")
 
+
+def json_body(photos: list) -> bytes:
+    """What the base64 path receives: AssetInput-style JSON with base64 photos."""
+    images = [base64.b64encode(photo).decode("utf-8") for photo in photos]
+    return json.dumps({"assetId": "demo-001", "images": images}).encode("utf-8")
+
+
+def multipart_body(photos: list) -> bytes:
+    """What the binary path receives: one multipart file part per photo."""
+    chunks = []
+    for index, photo in enumerate(photos):
+        chunks.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="images"; '
+            f'filename="photo_{index}.jpg"\r\nContent-Type: image/jpeg\r\n\r\n'.encode("latin-1")
+        )
+        chunks.append(photo)
+        chunks.append(b"\r\n")
+    chunks.append(f"--{BOUNDARY}--\r\n".encode("latin-1"))
+    return b"".join(chunks)
+
+
+def ingest_base64(body: bytes) -> dict:
+    return analyze_images(json.loads(body)["images"])
+
+
+def ingest_binary(body: bytes) -> dict:
+    content_type = f"multipart/form-data; boundary={BOUNDARY}"
+    return analyze_image_buffers(image_buffers_from_body(body, content_type, "images"))
+
+
+def measure(ingest, body: bytes, rounds: int):
+    """Median latency over ``rounds`` and the peak memory allocated beyond the body."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        ingest(body)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    ingest(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sorted(timings)[len(timings) // 2], peak
+
+
+def compare(count: int, width: int, height: int, rounds: int) -> None:
+    from image_batch_benchmark import make_photo_set
+
+    photos = [base64.b64decode(photo) for photo in make_photo_set(count, width, height)]
+    bodies = {
+        "base64 JSON": (ingest_base64, json_body(photos)),
+        "multipart": (ingest_binary, multipart_body(photos)),
+    }
+    encoded_mb = sum(map(len, photos)) / 2**20
+    print(f"{count} JPEG photos at {width}x{height}, {encoded_mb:.1f} MB encoded")
+    print(f"{'path':>12} {'body MB':>8} {'median ms':>10} {'peak extra MB':>14}")
+    for name, (ingest, body) in bodies.items():
+        latency, peak = measure(ingest, body, rounds)
+        print(f"{name:>12} {len(body) / 2**20:8.1f} {latency * 1000:10.1f} {peak / 2**20:14.1f}")
+
+
 if __name__ == "__main__":
-    # Replace with the path to a local image on your Mac
-    image_path = "sample.jpg"
-    image_b64 = encode_image_to_base64(image_path)
+    parser = argparse.ArgumentParser(
+        description="Analyze a photo, or compare base64 vs binary ingest"
+    )
+    parser.add_argument("image_path", nargs="?", default="sample.jpg")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--photos", type=int, default=12)
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--height", type=int, default=1536)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--fast", action="store_true", help="score at FAST_REDUCTION scale")
+    args = parser.parse_args()
 
-    result = analyze_images([image_b64])
-    print("Analysis Result:")
-    print(result)
+    if args.compare:
+        compare(args.photos, args.width, args.height, args.rounds)
+    else:
+        with open(args.image_path, "rb") as img_file:
+            result = analyze_image_buffers([img_file.read()], fast=args.fast)
+        print("Analysis Result:")
+        print(result)
@@ -0,0 +1,55 @@
+import argparse
+import base64
+import time
+
+import cv2
+import numpy as np
+
+from ml.model_inference import analyze_images, analyze_images_batch, create_analysis_pool
+
+
+# Synthetic listing photos: gradients, texture and a few hard edges, JPEG encoded
+def make_photo_set(count: int, width: int, height: int, seed: int = 3) -> list:
+    rng = np.random.default_rng(seed)
+    photos = []
+    for _ in range(count):
+        gradient = np.linspace(40, 220, width, dtype=np.float32)[None, :, None]
+        image = np.broadcast_to(gradient, (height, width, 3)).copy()
+        image += rng.normal(0, rng.uniform(5, 40), size=image.shape).astype(np.float32)
+        for _ in range(8):
+            x, y = rng.integers(0, width - 200), rng.integers(0, height - 200)
+            colour = rng.uniform(0, 255, 3).tolist()
+            cv2.rectangle(image, (int(x), int(y)), (int(x) + 180, int(y) + 120), colour, -1)
+        pixels = np.clip(image, 0, 255).astype(np.uint8)
+        ok, encoded = cv2.imencode(".jpg", pixels, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        photos.append(base64.b64encode(encoded.tobytes()).decode("utf-8"))
+    return photos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs process-pool image analysis")
+    parser.add_argument("--photos", type=int, default=48)
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--height", type=int, default=1536)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    photos = make_photo_set(args.photos, args.width, args.height)
+    print(f"{args.photos} photos at {args.width}x{args.height}")
+
+    started = time.perf_counter()
+    analyze_images(photos)
+    sequential = time.perf_counter() - started
+    print(f"sequential:  {sequential * 1000:8.0f} ms  {args.photos / sequential:6.1f} photos/s")
+
+    for workers in args.workers:
+        # Warm pool, as a long-running service would hold one
+        with create_analysis_pool(workers) as pool:
+            analyze_images_batch(photos[:workers], max_workers=workers, executor=pool)
+            started = time.perf_counter()
+            analyze_images_batch(photos, max_workers=workers, executor=pool)
+            elapsed = time.perf_counter() - started
+        print(
+            f"{workers} workers:   {elapsed * 1000:8.0f} ms  {args.photos / elapsed:6.1f} photos/s"
+            f"  ({sequential / elapsed:.2f}x)"
+        )
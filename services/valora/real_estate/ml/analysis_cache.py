@@ -0,0 +1,99 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Union
+
+
+def content_hash(data: Union[bytes, bytearray, memoryview]) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImageAnalysisCache:
+    """Persistent cache of per-image scores keyed by the SHA-256 of the image bytes.
+
+    Re-uploaded photos cost a hash and a primary-key lookup instead of a full decode.
+    Once more than ``max_entries`` scores are stored the least recently used ones are
+    evicted. Counters cover this process only.
+    """
+
+    def __init__(self, path: str = "image_analysis_cache.db", max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS image_scores ("
+            "digest TEXT PRIMARY KEY, score TEXT NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS ix_image_scores_accessed ON image_scores (accessed_at)"
+        )
+
+    def get_many(self, digests: Iterable[str]) -> Dict[str, Dict]:
+        wanted = list(dict.fromkeys(digests))
+        found: Dict[str, Dict] = {}
+        with self._lock:
+            for start in range(0, len(wanted), 500):
+                batch = wanted[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                rows = self._db.execute(
+                    f"SELECT digest, score FROM image_scores WHERE digest IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                found.update((digest, json.loads(score)) for digest, score in rows)
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE image_scores SET accessed_at = ? WHERE digest = ?",
+                    [(now, digest) for digest in found],
+                )
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def get(self, digest: str) -> Optional[Dict]:
+        return self.get_many([digest]).get(digest)
+
+    def put_many(self, scores: Dict[str, Dict]) -> None:
+        if not scores:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO image_scores (digest, score, accessed_at) VALUES (?, ?, ?)",
+                [(digest, json.dumps(score), now) for digest, score in scores.items()],
+            )
+            (size,) = self._db.execute("SELECT COUNT(*) FROM image_scores").fetchone()
+            excess = size - self.max_entries
+            if excess > 0:
+                self.evictions += self._db.execute(
+                    "DELETE FROM image_scores WHERE digest IN ("
+                    "SELECT digest FROM image_scores ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                ).rowcount
+
+    def put(self, digest: str, score: Dict) -> None:
+        self.put_many({digest: score})
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (size,) = self._db.execute("SELECT COUNT(*) FROM image_scores").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
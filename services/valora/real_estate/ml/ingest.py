@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional, Union
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # pragma: no cover - python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError  # type: ignore[no-redef]
+    from multipart.multipart import MultipartParser, parse_options_header  # type: ignore[no-redef]
+
+Body = Union[bytes, bytearray]
+
+
+def image_buffers_from_body(
+    body: Body, content_type: str, field_name: Optional[str] = None
+) -> List[memoryview]:
+    """Returns the photos in a request body as views onto the body itself.
+
+    A raw ``image/*`` or ``application/octet-stream`` body is one photo; a
+    ``multipart/form-data`` body yields every file part (only those named
+    ``field_name`` when given). Nothing is copied: each view points into ``body``,
+    so keep the body alive while the views are in use.
+    """
+    media_type, params = parse_options_header(content_type)
+    media_type = media_type.strip().lower()
+    if media_type.startswith(b"image/") or media_type == b"application/octet-stream":
+        return [memoryview(body)] if body else []
+    if media_type != b"multipart/form-data":
+        name = media_type.decode("latin-1") or "missing"
+        raise ValueError(f"Unsupported content type for image ingest: {name}")
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise ValueError("multipart/form-data body without a boundary")
+    return split_multipart(body, boundary, field_name)
+
+
+class _Parts:
+    """MultipartParser callbacks that keep file parts as slices of the body."""
+
+    def __init__(self, body: Body, field_name: Optional[str]) -> None:
+        self.body = body
+        self.view = memoryview(body)
+        self.field_name = field_name
+        self.buffers: List[memoryview] = []
+        self.headers: Dict[bytes, bytes] = {}
+        self.header_field = bytearray()
+        self.header_value = bytearray()
+        self.capturing = False
+        self.start: Optional[int] = None
+        self.end = 0
+        self.spilled: Optional[bytearray] = None
+        self.finished = False
+
+    def on_part_begin(self) -> None:
+        self.headers = {}
+        self.capturing = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers[bytes(self.header_field).lower()] = bytes(self.header_value)
+        self.header_field.clear()
+        self.header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        self.capturing = b"filename" in options and self.field_name in (None, name)
+        self.start, self.end = None, 0
+        self.spilled = None
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self.capturing:
+            return
+        if self.spilled is None and data is self.body and self.start in (None, self.end):
+            # The body goes in as one write, so its data arrives as offsets into it.
+            if self.start is None:
+                self.start = start
+            self.end = end
+            return
+        # Anything else, such as the parser's look-behind buffer, has to be copied.
+        if self.spilled is None:
+            self.spilled = bytearray(self._data())
+        self.spilled += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self.capturing:
+            self.buffers.append(self._data())
+        self.capturing = False
+
+    def on_end(self) -> None:
+        self.finished = True
+
+    def _data(self) -> memoryview:
+        if self.spilled is not None:
+            return memoryview(self.spilled)
+        if self.start is None:
+            return self.view[:0]
+        return self.view[self.start:self.end]
+
+
+def split_multipart(
+    body: Body, boundary: bytes, field_name: Optional[str] = None
+) -> List[memoryview]:
+    parts = _Parts(body, field_name)
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": parts.on_part_begin,
+            "on_header_field": parts.on_header_field,
+            "on_header_value": parts.on_header_value,
+            "on_header_end": parts.on_header_end,
+            "on_headers_finished": parts.on_headers_finished,
+            "on_part_data": parts.on_part_data,
+            "on_part_end": parts.on_part_end,
+            "on_end": parts.on_end,
+        },
+    )
+    try:
+        parser.write(body)
+        parser.finalize()
+    except MultipartParseError as exc:
+        raise ValueError("Malformed multipart body") from exc
+    if not parts.finished:
+        raise ValueError("Unterminated multipart body")
+    return parts.buffers
@@ -1,41 +1,214 @@
 import cv2
 import numpy as np
 import base64
-from typing import List, Dict
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Optional, Sequence, Union
 
+from ml.analysis_cache import ImageAnalysisCache, content_hash
 
-def decode_base64_image(base64_str: str) -> np.ndarray:
+
+# Fast scoring decodes straight to 1/2, 1/4 or 1/8 scale grayscale; JPEG skips the
+# discarded DCT detail entirely, other formats are downsampled right after decode.
+# fast=True uses FAST_REDUCTION; 1/2 was the best accuracy/speed trade-off measured
+# with fast_scoring_report.py.
+FAST_REDUCTION = int(os.getenv("IMAGE_FAST_REDUCTION", "2"))
+_REDUCED_GRAYSCALE = {
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+# Laplacian variance grows as photos shrink (edges get steeper per pixel); these median
+# full/reduced ratios, measured with fast_scoring_report.py, map it back to full scale.
+_SHARPNESS_SCALE = {1: 1.0, 2: 2.0, 4: 4.5, 8: 5.0}
+
+ImageBuffer = Union[bytes, bytearray, memoryview]
+
+
+def decode_base64_image(base64_str: str, reduction: int = 1) -> np.ndarray:
     img_data = base64.b64decode(base64_str)
+    return decode_image_bytes(img_data, reduction)
+
+
+def decode_image_bytes(img_data: ImageBuffer, reduction: int = 1) -> np.ndarray:
+    # frombuffer wraps the caller's buffer; the encoded bytes are never copied
     np_arr = np.frombuffer(img_data, np.uint8)
-    image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-    return image
+    if reduction == 1:
+        return cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+    try:
+        flag = _REDUCED_GRAYSCALE[reduction]
+    except KeyError:
+        raise ValueError(f"reduction must be 1, 2, 4 or 8, got {reduction}") from None
+    return cv2.imdecode(np_arr, flag)
 
 
-def analyze_images(images: List[str]) -> Dict:
-    # Simulated feature detection
-    features = set()
-    for img_str in images:
-        image = decode_base64_image(img_str)
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+def score_image(image: np.ndarray, reduction: int = 1) -> Dict:
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
-        # Simple metrics
-        brightness = np.mean(gray)
-        sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
+    # Simple metrics
+    brightness = float(np.mean(gray))
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var()) / _SHARPNESS_SCALE[reduction]
 
-        # Naive condition inference
-        if brightness > 120 and sharpness > 100:
-            condition = "good"
-        else:
-            condition = "fair"
+    # Naive condition inference
+    if brightness > 120 and sharpness > 100:
+        condition = "good"
+    else:
+        condition = "fair"
 
-        # Fake detection logic
-        if brightness > 130:
-            features.add("garage")
-        if sharpness > 200:
-            features.add("pool")
+    # Fake detection logic
+    features = []
+    if brightness > 130:
+        features.append("garage")
+    if sharpness > 200:
+        features.append("pool")
 
     return {
-        "features": list(features),
+        "brightness": brightness,
+        "sharpness": sharpness,
+        "condition": condition,
+        "features": features,
+    }
+
+
+def aggregate_scores(scores: List[Dict]) -> Dict:
+    """Combines per-image scores into the listing-level verdict.
+
+    Features are the union across photos; the listing is "good" when at least half of
+    the photos that decoded are.
+    """
+    scored = [score for score in scores if "error" not in score]
+    features = sorted({feature for score in scored for feature in score["features"]})
+    good = sum(1 for score in scored if score["condition"] == "good")
+    condition = "good" if scored and good * 2 >= len(scored) else "fair"
+    return {
+        "features": features,
         "condition": condition,
         "property_type": "single_family"  # hardcoded for now
     }
+
+
+def resolve_reduction(reduction: Optional[int] = None, fast: bool = False) -> int:
+    """An explicit ``reduction`` wins; otherwise FAST_REDUCTION when ``fast``, else full size."""
+    if reduction is not None:
+        return reduction
+    return FAST_REDUCTION if fast else 1
+
+
+def analyze_images(
+    images: List[str],
+    cache: Optional[ImageAnalysisCache] = None,
+    reduction: Optional[int] = None,
+    fast: bool = False,
+) -> Dict:
+    """Scores a listing's photos; ``fast`` or ``reduction`` > 1 selects the reduced-size path."""
+    reduction = resolve_reduction(reduction, fast)
+    if cache is not None:
+        score_all = partial(_score_sequentially, reduction=reduction)
+        payloads = [base64.b64decode(img_str) for img_str in images]
+        return aggregate_scores(_score_with_cache(payloads, cache, score_all, reduction))
+    scores = _score_sequentially([base64.b64decode(img_str) for img_str in images], reduction)
+    return aggregate_scores(scores)
+
+
+def analyze_image_buffers(
+    buffers: Sequence[ImageBuffer],
+    cache: Optional[ImageAnalysisCache] = None,
+    reduction: Optional[int] = None,
+    fast: bool = False,
+) -> Dict:
+    """Binary counterpart of analyze_images for photos received as raw bytes.
+
+    Takes the encoded photos as-is, typically memoryviews from ml.ingest pointing into
+    the request body, so no base64 text or intermediate copies are ever made. Like
+    analyze_images_batch it also returns the per-photo "images" scores.
+    """
+    reduction = resolve_reduction(reduction, fast)
+    if cache is None:
+        scores = _score_sequentially(buffers, reduction)
+    else:
+        score_all = partial(_score_sequentially, reduction=reduction)
+        scores = _score_with_cache(buffers, cache, score_all, reduction)
+    return {**aggregate_scores(scores), "images": scores}
+
+
+def _analyze_bytes(img_data: ImageBuffer, reduction: int = 1) -> Dict:
+    image = decode_image_bytes(img_data, reduction)
+    if image is None:
+        return {"error": "undecodable image"}
+    return score_image(image, reduction)
+
+
+def _score_sequentially(payloads: Sequence[ImageBuffer], reduction: int = 1) -> List[Dict]:
+    return [_analyze_bytes(payload, reduction) for payload in payloads]
+
+
+def _score_with_cache(
+    payloads: Sequence[ImageBuffer], cache: ImageAnalysisCache, score_all, reduction: int = 1
+) -> List[Dict]:
+    """Scores only photos whose content hash is not cached yet, each distinct one once."""
+    # Full-resolution scores keep the bare digest; fast-path scores are kept apart.
+    suffix = "" if reduction == 1 else f":r{reduction}"
+    digests = [content_hash(payload) + suffix for payload in payloads]
+    known = cache.get_many(digests)
+    missing = {digest: payload for digest, payload in zip(digests, payloads) if digest not in known}
+    fresh = dict(zip(missing, score_all(list(missing.values()))))
+    cache.put_many({digest: score for digest, score in fresh.items() if "error" not in score})
+    known.update(fresh)
+    return [known[digest] for digest in digests]
+
+
+def _init_worker() -> None:
+    # One OpenCV thread per process; parallelism comes from the pool itself.
+    cv2.setNumThreads(1)
+
+
+def default_worker_count() -> int:
+    return int(os.getenv("IMAGE_ANALYSIS_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def create_analysis_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool for analyze_images_batch; reuse it across listings to skip start-up."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers or default_worker_count(), initializer=_init_worker
+    )
+
+
+def analyze_images_batch(
+    images: List[str],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    cache: Optional[ImageAnalysisCache] = None,
+    reduction: Optional[int] = None,
+    fast: bool = False,
+) -> Dict:
+    """Decodes and scores a listing's photos across a process pool.
+
+    Returns the aggregate verdict of analyze_images plus an "images" list with the
+    brightness, sharpness, condition and features of each photo, in input order.
+    Photos that fail to decode are reported with an "error" and left out of the verdict.
+    With a cache, photos already scored are looked up by content hash and only new
+    ones reach the pool. ``fast`` or ``reduction`` > 1 selects the reduced-size path.
+    """
+    reduction = resolve_reduction(reduction, fast)
+    if not images:
+        return {**aggregate_scores([]), "images": []}
+    workers = max_workers or default_worker_count()
+    owned = executor is None
+    pool = executor or create_analysis_pool(workers)
+
+    def score_all(payloads: List[bytes]) -> List[Dict]:
+        chunksize = max(1, len(payloads) // (workers * 4))
+        analyze = partial(_analyze_bytes, reduction=reduction)
+        return list(pool.map(analyze, payloads, chunksize=chunksize))
+
+    try:
+        if cache is None:
+            scores = score_all([base64.b64decode(img_str) for img_str in images])
+        else:
+            payloads = [base64.b64decode(img_str) for img_str in images]
+            scores = _score_with_cache(payloads, cache, score_all, reduction)
+    finally:
+        if owned:
+            pool.shutdown()
+    return {**aggregate_scores(scores), "images": scores}
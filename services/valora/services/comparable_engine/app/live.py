@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.comparable_engine.app.sales import SalesTable
+from services.comparable_engine.app.store import (
+    CompsBatch,
+    CompsQuery,
+    Ranked,
+    SalesStore,
+    _smallest,
+)
+from valora_common.schemas.valuation import Comparable
+
+
+@dataclass(frozen=True)
+class Segment:
+    """An immutable :class:`SalesStore` plus the mask of its rows retired so far.
+
+    Retiring rows makes a new segment with a new mask; the store is shared, so the
+    segments of older snapshots keep answering as they did.
+    """
+
+    store: SalesStore
+    sorted_ids: np.ndarray
+    id_rows: np.ndarray
+    retired: Optional[np.ndarray] = None
+
+    @classmethod
+    def build(cls, sales: SalesTable, **options: Any) -> "Segment":
+        store = SalesStore(sales, **options)
+        id_rows = np.argsort(store.sales.sale_id, kind="stable")
+        return cls(store=store, sorted_ids=store.sales.sale_id[id_rows], id_rows=id_rows)
+
+    @property
+    def retired_count(self) -> int:
+        return 0 if self.retired is None else int(np.count_nonzero(self.retired))
+
+    @property
+    def live_count(self) -> int:
+        return len(self.store) - self.retired_count
+
+    def live_rows(self) -> np.ndarray:
+        if self.retired is None:
+            return np.arange(len(self.store))
+        return np.flatnonzero(~self.retired)
+
+    def find(self, sale_ids: np.ndarray) -> np.ndarray:
+        """Live rows holding any of ``sale_ids``."""
+        if not len(self.sorted_ids) or not len(sale_ids):
+            return np.empty(0, dtype=np.int64)
+        slots = np.minimum(np.searchsorted(self.sorted_ids, sale_ids), len(self.sorted_ids) - 1)
+        rows = self.id_rows[slots[self.sorted_ids[slots] == sale_ids]]
+        return rows if self.retired is None else rows[~self.retired[rows]]
+
+    def retire(self, rows: np.ndarray) -> "Segment":
+        if not len(rows):
+            return self
+        retired = (
+            np.zeros(len(self.store), dtype=bool) if self.retired is None else self.retired.copy()
+        )
+        retired[rows] = True
+        return replace(self, retired=retired)
+
+
+@dataclass(frozen=True)
+class SalesSnapshot:
+    """The segments that made up the index at one moment, queried as one store.
+
+    A query holds on to a snapshot for its whole run, so it never sees half of an
+    update or a merge. Every segment is ranked exactly and the per-segment top ``k``
+    lists are merged, which is the exact top ``k`` of the union. Sale ages are measured
+    from the newest sale in any segment.
+    """
+
+    segments: Tuple[Segment, ...]
+    as_of: float
+    version: int = 0
+
+    def __len__(self) -> int:
+        return sum(segment.live_count for segment in self.segments)
+
+    def search(self, query: CompsQuery) -> List[Comparable]:
+        parts: List[Ranked] = []
+        penalties = np.empty(0)
+        for segment in self.segments:
+            parts.append(segment.store.rank(query, retired=segment.retired, as_of=self.as_of))
+            penalties = np.concatenate([penalties, parts[-1][2]])
+            distance_weight = segment.store._distance_weight()
+            if len(penalties) >= query.k and distance_weight > 0:
+                # Nothing farther than the k-th penalty's distance equivalent can make the
+                # list, so later segments search a smaller radius.
+                worst = float(np.partition(penalties, query.k - 1)[query.k - 1])
+                query = replace(
+                    query, max_distance_mi=min(query.max_distance_mi, worst / distance_weight)
+                )
+        return self._merge(parts, query.k)
+
+    def search_batch(self, batch: CompsBatch) -> List[List[Comparable]]:
+        """:meth:`search` for every subject of ``batch``, ranking each segment vectorized."""
+        ranked = [
+            segment.store.rank_batch(batch, retired=segment.retired, as_of=self.as_of)
+            for segment in self.segments
+        ]
+        return [
+            self._merge([per_segment[subject] for per_segment in ranked], batch.k)
+            for subject in range(len(batch))
+        ]
+
+    def _merge(self, parts: Sequence[Ranked], k: int) -> List[Comparable]:
+        if len(parts) == 1:
+            return self.segments[0].store.comparables(*parts[0])
+        penalties = np.concatenate([part[2] for part in parts])
+        owners = np.repeat(np.arange(len(parts)), [len(part[2]) for part in parts])
+        offsets = np.concatenate(([0], np.cumsum([len(part[2]) for part in parts])))
+        best = _smallest(penalties, k)
+        comps: List[Optional[Comparable]] = [None] * len(best)
+        for owner, (rows, distances, scores) in enumerate(parts):
+            slots = np.flatnonzero(owners[best] == owner)
+            if not len(slots):
+                continue
+            picked = best[slots] - offsets[owner]
+            store = self.segments[owner].store
+            records = store.comparables(rows[picked], distances[picked], scores[picked])
+            for slot, comp in zip(slots.tolist(), records):
+                comps[slot] = comp
+        return [comp for comp in comps if comp is not None]
+
+
+class LiveSalesIndex:
+    """A comps index that takes sale inserts and retirements while serving queries.
+
+    The index is a base segment plus small delta segments, one per :meth:`apply`.
+    Retiring a sale sets a tombstone in the segment that holds it; re-inserting an
+    existing ``sale_id`` retires the old copy first, so an insert is also an update.
+    Every change publishes a new :class:`SalesSnapshot` atomically; queries read
+    whichever snapshot is current when they start and are never blocked by writers.
+
+    Merges run on a background thread. Once there are more than
+    ``max_delta_segments`` deltas the newest ones are merged into one; once deltas and
+    tombstones together exceed ``merge_ratio`` of the base, everything is rebuilt into
+    a new base without the retired rows. Changes made while a merge runs are carried over to the
+    merged segment when it is published.
+    """
+
+    def __init__(
+        self,
+        sales: SalesTable,
+        *,
+        max_delta_segments: int = 4,
+        merge_ratio: float = 0.1,
+        **options: Any,
+    ) -> None:
+        self.max_delta_segments = max_delta_segments
+        self.merge_ratio = merge_ratio
+        self._options = options
+        base = Segment.build(sales, **options)
+        self._snapshot = SalesSnapshot(segments=(base,), as_of=base.store.as_of)
+        self._lock = threading.Lock()
+        self._merger = ThreadPoolExecutor(max_workers=1, thread_name_prefix="comps-merge")
+        self._merging: Optional[Future[None]] = None
+        self._updates = 0
+        self._inserted = 0
+        self._merges = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def snapshot(self) -> SalesSnapshot:
+        return self._snapshot
+
+    def search(self, query: CompsQuery) -> List[Comparable]:
+        return self._snapshot.search(query)
+
+    def search_batch(self, batch: CompsBatch) -> List[List[Comparable]]:
+        return self._snapshot.search_batch(batch)
+
+    def apply(
+        self, sales: Optional[SalesTable] = None, retired: Sequence[str] = ()
+    ) -> SalesSnapshot:
+        """Retires the ``retired`` sale ids and upserts ``sales`` as one change.
+
+        When ``sales`` repeats a ``sale_id`` the last row wins. Returns the snapshot
+        that includes the change.
+        """
+        delta: Optional[Segment] = None
+        ids = np.asarray(retired, dtype=str)
+        if sales is not None and len(sales):
+            _, last = np.unique(sales.sale_id[::-1], return_index=True)
+            sales = sales.take(np.sort(len(sales) - 1 - last))
+            # Built outside the lock: writers only wait for each other to publish.
+            delta = Segment.build(sales, **self._options)
+            ids = np.concatenate([ids, sales.sale_id])
+        ids = np.unique(ids)
+        with self._lock:
+            current = self._snapshot
+            segments = [segment.retire(segment.find(ids)) for segment in current.segments]
+            as_of = current.as_of
+            if delta is not None:
+                segments.append(delta)
+                as_of = max(as_of, delta.store.as_of)
+                self._inserted += len(delta.store)
+            self._updates += 1
+            self._snapshot = SalesSnapshot(tuple(segments), as_of, current.version + 1)
+            self._schedule_merge()
+            return self._snapshot
+
+    def wait_for_merges(self) -> None:
+        """Blocks until no merge is running or due; re-raises a failed merge."""
+        while True:
+            with self._lock:
+                merging = self._merging
+            if merging is None:
+                return
+            merging.result()
+            with self._lock:
+                if self._merging is merging:
+                    self._merging = None
+
+    def close(self) -> None:
+        self._merger.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version,
+            "live": len(snapshot),
+            "segments": [len(segment.store) for segment in snapshot.segments],
+            "tombstones": sum(segment.retired_count for segment in snapshot.segments),
+            "updates": self._updates,
+            "inserted": self._inserted,
+            "merges": self._merges,
+            "merging": self._merging is not None and not self._merging.done(),
+        }
+
+    def _schedule_merge(self) -> None:
+        # Called with the lock held; one merge at a time.
+        if self._merging is not None and not self._merging.done():
+            return
+        self._merging = None
+        segments = self._snapshot.segments
+        base, deltas = segments[0], segments[1:]
+        changed = sum(len(delta.store) for delta in deltas)
+        changed += sum(segment.retired_count for segment in segments)
+        if changed > self.merge_ratio * len(base.store) and (deltas or base.retired_count):
+            merging = segments
+        elif len(deltas) > self.max_delta_segments:
+            merging = deltas[-_merge_run(deltas) :]
+        else:
+            return
+        self._merging = self._merger.submit(self._merge, merging)
+
+    def _merge(self, merging: Tuple[Segment, ...]) -> None:
+        live = [segment.live_rows() for segment in merging]
+        merged = Segment.build(
+            SalesTable.concat([seg.store.sales.take(rows) for seg, rows in zip(merging, live)]),
+            **self._options,
+        )
+        # Where each source row landed in the merged store.
+        landed = np.empty(len(merged.store), dtype=np.int64)
+        landed[merged.store.order] = np.arange(len(merged.store))
+        offsets = np.cumsum([0] + [len(rows) for rows in live])
+        with self._lock:
+            current = self._snapshot
+            first = next(
+                position
+                for position, segment in enumerate(current.segments)
+                if segment.store is merging[0].store
+            )
+            now = current.segments[first : first + len(merging)]
+            late = []
+            for offset, before, after, rows in zip(offsets, merging, now, live):
+                if after.retired is None:
+                    continue
+                since = np.flatnonzero(after.retired)
+                if before.retired is not None:
+                    since = since[~before.retired[since]]
+                late.append(landed[offset + np.searchsorted(rows, since)])
+            if late:
+                merged = merged.retire(np.concatenate(late))
+            segments = current.segments[:first] + (merged,) + current.segments[first + len(now) :]
+            self._snapshot = SalesSnapshot(segments, current.as_of, current.version + 1)
+            self._merges += 1
+            self._merging = None
+            self._schedule_merge()
+
+
+def _merge_run(deltas: Sequence[Segment]) -> int:
+    """How many of the newest ``deltas`` to merge: size-tiered, as in an LSM tree.
+
+    The run grows backwards while the next delta is at most a few times the size of
+    the run so far, so a stream of small updates does not keep re-copying one large
+    delta. When no such run exists every delta is merged.
+    """
+    run, size = 1, len(deltas[-1].store)
+    while run < len(deltas) and len(deltas[-run - 1].store) <= 4 * size:
+        run += 1
+        size += len(deltas[-run].store)
+    return run if run > 1 else len(deltas)
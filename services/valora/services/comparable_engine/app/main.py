@@ -1,26 +1,179 @@
 from __future__ import annotations
 
-from typing import List
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Annotated, Any, AsyncIterator, Dict, Iterator, List, Optional
 
-from fastapi import FastAPI
+import numpy as np
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from valora_common.schemas.valuation import Comparable
+from services.comparable_engine.app.live import LiveSalesIndex, SalesSnapshot
+from services.comparable_engine.app.sales import SalesTable
+from services.comparable_engine.app.settings import get_settings
+from services.comparable_engine.app.schemas import CompsBatchRequest, CompsFilters, SalesUpdate
+from services.comparable_engine.app.store import CompsBatch, CompsQuery, parse_weights
 
-app = FastAPI(title="VALORA Comparable Engine (Mock)")
+# Asset classes the sales store holds.
+SUPPORTED_CLASSES = {"real_estate"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    if settings.sales_path:
+        sales = SalesTable.load(settings.sales_path)
+    else:
+        sales = SalesTable.synthetic(settings.synthetic_rows)
+    index = LiveSalesIndex(
+        sales,
+        max_delta_segments=settings.max_delta_segments,
+        merge_ratio=settings.merge_ratio,
+        cell_degrees=settings.grid_cell_degrees,
+        weights=parse_weights(settings.similarity_weights),
+    )
+    app.state.sales_index = index
+    try:
+        yield
+    finally:
+        index.close()
+
+
+app = FastAPI(title="VALORA Comparable Engine", lifespan=lifespan)
+
+
+def get_sales_index() -> LiveSalesIndex:
+    return app.state.sales_index  # type: ignore[no-any-return]
 
 
 @app.get("/comps")
 async def search_comps(
-    class_: str, latitude: float | None = None, longitude: float | None = None
+    class_: str,
+    index: Annotated[LiveSalesIndex, Depends(get_sales_index)],
+    latitude: Annotated[Optional[float], Query(ge=-90, le=90)] = None,
+    longitude: Annotated[Optional[float], Query(ge=-180, le=180)] = None,
+    k: Annotated[Optional[int], Query(ge=1)] = None,
+    radius_mi: Annotated[Optional[float], Query(gt=0)] = None,
+    living_area_sqft: Optional[float] = None,
+    bedrooms: Optional[float] = None,
+    bathrooms: Optional[float] = None,
+    year_built: Optional[float] = None,
+    min_living_area_sqft: Optional[float] = None,
+    max_living_area_sqft: Optional[float] = None,
+    min_bedrooms: Optional[float] = None,
+    max_bedrooms: Optional[float] = None,
+    min_bathrooms: Optional[float] = None,
+    max_bathrooms: Optional[float] = None,
+    min_year_built: Optional[float] = None,
+    max_year_built: Optional[float] = None,
+    sold_after: Optional[date] = None,
+    sold_before: Optional[date] = None,
 ) -> dict[str, List[dict]]:
-    comps = [
-        Comparable(
-            comparable_id="comp_demo",
-            address="129 Main St",
-            price=240000,
-            distance_mi=0.2,
-            attributes={"class": class_},
-            source="mock",
+    """Most similar sales to the subject within ``radius_mi``, best first.
+
+    Subject attributes steer the similarity ranking; ``min_*``/``max_*`` and the sale
+    date bounds are hard filters.
+    """
+    if class_ not in SUPPORTED_CLASSES or latitude is None or longitude is None:
+        return {"results": []}
+    settings = get_settings()
+    _check_k(k, settings.max_k)
+    filters = CompsFilters(
+        min_living_area_sqft=min_living_area_sqft,
+        max_living_area_sqft=max_living_area_sqft,
+        min_bedrooms=min_bedrooms,
+        max_bedrooms=max_bedrooms,
+        min_bathrooms=min_bathrooms,
+        max_bathrooms=max_bathrooms,
+        min_year_built=min_year_built,
+        max_year_built=max_year_built,
+        sold_after=sold_after,
+        sold_before=sold_before,
+    )
+    subject = {
+        "living_area_sqft": living_area_sqft,
+        "bedrooms": bedrooms,
+        "bathrooms": bathrooms,
+        "year_built": year_built,
+    }
+    query = CompsQuery(
+        latitude=latitude,
+        longitude=longitude,
+        subject={name: value for name, value in subject.items() if value is not None},
+        ranges=filters.ranges(),
+        k=k or settings.default_k,
+        max_distance_mi=radius_mi or settings.max_distance_mi,
+    )
+    return {"results": [comp.model_dump() for comp in index.search(query)]}
+
+
+@app.post("/comps/batch")
+async def search_comps_batch(
+    payload: CompsBatchRequest, index: Annotated[LiveSalesIndex, Depends(get_sales_index)]
+) -> StreamingResponse:
+    """Comps for many subjects, streamed as NDJSON: one ``{"index", "results"}`` line each.
+
+    Subjects are ranked together a chunk at a time, and each chunk's lines are sent as
+    soon as it is done. Lines follow request order, and every line is answered from the
+    sales as they were when the request arrived.
+    """
+    settings = get_settings()
+    _check_k(payload.k, settings.max_k)
+    if len(payload.latitude) > settings.max_batch_subjects:
+        raise HTTPException(
+            status_code=422, detail=f"At most {settings.max_batch_subjects} subjects per batch"
         )
-    ]
-    return {"results": [comp.model_dump() for comp in comps]}
+    batch = CompsBatch(
+        latitudes=np.asarray(payload.latitude, dtype=np.float64),
+        longitudes=np.asarray(payload.longitude, dtype=np.float64),
+        subjects=payload.subjects(),
+        ranges=payload.filters.ranges(),
+        k=payload.k or settings.default_k,
+        max_distance_mi=payload.radius_mi or settings.max_distance_mi,
+    )
+    supported = payload.class_ in SUPPORTED_CLASSES
+    return StreamingResponse(
+        _ndjson_lines(index.snapshot(), batch, settings.batch_chunk_size, supported),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/sales/updates")
+def update_sales(
+    payload: SalesUpdate, index: Annotated[LiveSalesIndex, Depends(get_sales_index)]
+) -> Dict[str, Any]:
+    """Upserts ``sales`` and retires ``retired`` ids as one change, e.g. after a feed pull.
+
+    Queries see the change as soon as this returns; the index merges it in the
+    background.
+    """
+    sales = SalesTable.from_records(
+        [sale.model_dump() for sale in payload.sales], source=payload.source
+    )
+    index.apply(sales, payload.retired)
+    return index.stats()
+
+
+@app.get("/sales/stats")
+async def sales_stats(index: Annotated[LiveSalesIndex, Depends(get_sales_index)]) -> Dict[str, Any]:
+    return index.stats()
+
+
+def _ndjson_lines(
+    snapshot: SalesSnapshot, batch: CompsBatch, chunk_size: int, supported: bool
+) -> Iterator[bytes]:
+    # A plain generator: Starlette iterates it on a worker thread, off the event loop.
+    for start in range(0, len(batch), max(chunk_size, 1)):
+        chunk = batch.slice(start, start + chunk_size)
+        results = snapshot.search_batch(chunk) if supported else [[]] * len(chunk)
+        lines = []
+        for offset, comps in enumerate(results):
+            line = {"index": start + offset, "results": [c.model_dump(mode="json") for c in comps]}
+            lines.append(json.dumps(line, separators=(",", ":")))
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _check_k(k: Optional[int], max_k: int) -> None:
+    if k is not None and k > max_k:
+        raise HTTPException(status_code=422, detail=f"k may be at most {max_k}")
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from valora_common.schemas.valuation import Comparable
+
+NUMERIC_COLUMNS = (
+    "price",
+    "latitude",
+    "longitude",
+    "bedrooms",
+    "bathrooms",
+    "living_area_sqft",
+    "year_built",
+)
+ATTRIBUTE_COLUMNS = ("bedrooms", "bathrooms", "living_area_sqft", "year_built")
+
+
+@dataclass(frozen=True)
+class SalesTable:
+    """Closed sales held column by column, one NumPy array per field.
+
+    Row ``i`` of every array is the same sale. ``sale_date`` is ``datetime64[D]``;
+    unknown numeric values are NaN. ``source`` names where the sales came from, either
+    one name for the table or one per row once tables from different feeds are combined.
+    """
+
+    sale_id: np.ndarray
+    address: np.ndarray
+    price: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    bedrooms: np.ndarray
+    bathrooms: np.ndarray
+    living_area_sqft: np.ndarray
+    year_built: np.ndarray
+    sale_date: np.ndarray
+    source: Union[str, np.ndarray] = "sales"
+
+    def __len__(self) -> int:
+        return len(self.sale_id)
+
+    def take(self, rows: np.ndarray) -> "SalesTable":
+        """A table of ``rows`` in the given order."""
+        columns = {
+            field.name: getattr(self, field.name)[rows]
+            for field in fields(self)
+            if field.name != "source"
+        }
+        source = self.source if isinstance(self.source, str) else self.source[rows]
+        return SalesTable(**columns, source=source)
+
+    @classmethod
+    def concat(cls, tables: Sequence["SalesTable"]) -> "SalesTable":
+        """One table holding the rows of ``tables`` in order."""
+        columns = {
+            field.name: np.concatenate([getattr(table, field.name) for table in tables])
+            for field in fields(cls)
+            if field.name != "source"
+        }
+        sources = {table.source for table in tables if isinstance(table.source, str)}
+        if len(sources) == 1 and all(isinstance(table.source, str) for table in tables):
+            return cls(**columns, source=sources.pop())
+        source = np.concatenate(
+            [np.broadcast_to(np.asarray(table.source, dtype=str), len(table)) for table in tables]
+        )
+        return cls(**columns, source=source)
+
+    def comparables(self, rows: np.ndarray, distances: np.ndarray) -> List[Comparable]:
+        """Builds response records for ``rows`` with their distances from the subject."""
+        columns = {name: getattr(self, name)[rows].tolist() for name in ATTRIBUTE_COLUMNS}
+        dates = self.sale_date[rows]
+        results = []
+        for position, row in enumerate(rows.tolist()):
+            date: Optional[datetime] = None
+            if not np.isnat(dates[position]):
+                date = dates[position].astype("datetime64[s]").item()
+            results.append(
+                Comparable(
+                    comparable_id=str(self.sale_id[row]),
+                    address=str(self.address[row]),
+                    price=float(self.price[row]),
+                    distance_mi=round(float(distances[position]), 3),
+                    attributes={
+                        name: values[position]
+                        for name, values in columns.items()
+                        if values[position] == values[position]  # drops NaN
+                    },
+                    source=self.source if isinstance(self.source, str) else str(self.source[row]),
+                    sale_date=date,
+                )
+            )
+        return results
+
+    def save(self, path: str | Path) -> Path:
+        """Writes an ``.npz`` that :meth:`load` reads back without parsing."""
+        path = Path(path)
+        np.savez(
+            path, **{field.name: np.asarray(getattr(self, field.name)) for field in fields(self)}
+        )
+        return path if path.suffix == ".npz" else path.with_suffix(".npz")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SalesTable":
+        """Reads an ``.npz`` from :meth:`save`, or a CSV with one column per field."""
+        path = Path(path)
+        if path.suffix == ".npz":
+            with np.load(path, allow_pickle=False) as archive:
+                columns = {name: archive[name] for name in archive.files}
+            source = columns.pop("source", np.asarray("sales"))
+            return cls(**columns, source=str(source) if source.ndim == 0 else source)
+        return cls.from_csv(path)
+
+    @classmethod
+    def from_records(
+        cls, records: Sequence[Mapping[str, Any]], *, source: str = "sales"
+    ) -> "SalesTable":
+        """Builds a table from sale dicts keyed by column name; absent values are unknown."""
+        columns: Dict[str, np.ndarray] = {
+            "sale_id": np.array([str(record["sale_id"]) for record in records], dtype=str),
+            "address": np.array([record.get("address") or "" for record in records], dtype=str),
+            "sale_date": np.array(
+                [record.get("sale_date") or "NaT" for record in records], dtype="datetime64[D]"
+            ),
+        }
+        for name in NUMERIC_COLUMNS:
+            columns[name] = np.array(
+                [_number(record.get(name)) for record in records], dtype=np.float64
+            )
+        return cls(**columns, source=source)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "SalesTable":
+        with open(path, newline="", encoding="utf-8") as handle:
+            records = list(csv.DictReader(handle))
+        return cls.from_records(records, source=Path(path).stem)
+
+    @classmethod
+    def synthetic(
+        cls,
+        rows: int,
+        *,
+        seed: int = 11,
+        center: tuple[float, float] = (41.88, -87.63),
+        spread_deg: float = 0.35,
+    ) -> "SalesTable":
+        """Plausible sales scattered around ``center``, for local runs and benchmarks."""
+        rng = np.random.default_rng(seed)
+        latitude = center[0] + rng.normal(0, spread_deg / 2, rows)
+        longitude = center[1] + rng.normal(0, spread_deg / 2, rows)
+        sqft = np.round(rng.lognormal(7.45, 0.35, rows), -1)
+        bedrooms = np.clip(np.round(sqft / 550 + rng.normal(0, 0.7, rows)), 1, 7)
+        bathrooms = np.clip(np.round((bedrooms * 0.6 + rng.normal(0, 0.5, rows)) * 2) / 2, 1, 5)
+        year_built = rng.integers(1900, 2024, rows).astype(np.float64)
+        price = np.round(
+            sqft * 210 + bedrooms * 9000 + (year_built - 1950) * 600 + rng.normal(0, 20000, rows),
+            -2,
+        )
+        numbers = rng.integers(100, 9999, rows)
+        streets = np.array(
+            ["Main St", "Oak Ave", "Maple Dr", "Cedar Ln", "Lake Shore Dr", "Elm St"]
+        )
+        return cls(
+            sale_id=np.char.add("sale_", np.arange(rows).astype(str)),
+            address=np.char.add(
+                np.char.add(numbers.astype(str), " "), streets[rng.integers(0, len(streets), rows)]
+            ),
+            price=np.maximum(price, 50000.0),
+            latitude=latitude,
+            longitude=longitude,
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+            living_area_sqft=sqft,
+            year_built=year_built,
+            sale_date=np.datetime64("2024-06-30")
+            - rng.integers(0, 3 * 365, rows).astype("timedelta64[D]"),
+            source="synthetic",
+        )
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value) if value not in (None, "") else float("nan")
+    except ValueError:
+        return float("nan")
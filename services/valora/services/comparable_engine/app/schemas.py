@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Annotated, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from services.comparable_engine.app.store import Bounds
+
+SUBJECT_ATTRIBUTES = ("living_area_sqft", "bedrooms", "bathrooms", "year_built")
+
+# The ranges GET /comps enforces on its query parameters.
+Latitude = Annotated[float, Field(ge=-90, le=90)]
+Longitude = Annotated[float, Field(ge=-180, le=180)]
+
+
+class CompsFilters(BaseModel):
+    """Hard filters every comp must pass; bounds are inclusive."""
+
+    min_living_area_sqft: Optional[float] = None
+    max_living_area_sqft: Optional[float] = None
+    min_bedrooms: Optional[float] = None
+    max_bedrooms: Optional[float] = None
+    min_bathrooms: Optional[float] = None
+    max_bathrooms: Optional[float] = None
+    min_year_built: Optional[float] = None
+    max_year_built: Optional[float] = None
+    sold_after: Optional[date] = None
+    sold_before: Optional[date] = None
+
+    def ranges(self) -> Dict[str, Bounds]:
+        ranges: Dict[str, Bounds] = {
+            name: (getattr(self, f"min_{name}"), getattr(self, f"max_{name}"))
+            for name in SUBJECT_ATTRIBUTES
+        }
+        ranges["sale_date"] = (_epoch_days(self.sold_after), _epoch_days(self.sold_before))
+        return ranges
+
+
+class CompsBatchRequest(BaseModel):
+    """Many subjects as parallel arrays; attribute arrays may hold nulls or be omitted."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    class_: str = Field(alias="class")
+    latitude: List[Latitude] = Field(..., min_length=1)
+    longitude: List[Longitude] = Field(..., min_length=1)
+    living_area_sqft: Optional[List[Optional[float]]] = None
+    bedrooms: Optional[List[Optional[float]]] = None
+    bathrooms: Optional[List[Optional[float]]] = None
+    year_built: Optional[List[Optional[float]]] = None
+    filters: CompsFilters = Field(default_factory=CompsFilters)
+    k: Optional[int] = Field(default=None, ge=1)
+    radius_mi: Optional[float] = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def _same_lengths(self) -> "CompsBatchRequest":
+        for name in ("longitude",) + SUBJECT_ATTRIBUTES:
+            values = getattr(self, name)
+            if values is not None and len(values) != len(self.latitude):
+                raise ValueError(f"'{name}' must have one entry per latitude")
+        return self
+
+    def subjects(self) -> Dict[str, np.ndarray]:
+        return {
+            name: np.array(
+                [np.nan if value is None else value for value in getattr(self, name)],
+                dtype=np.float64,
+            )
+            for name in SUBJECT_ATTRIBUTES
+            if getattr(self, name) is not None
+        }
+
+
+class SaleRecord(BaseModel):
+    """One closed sale as delivered by a feed; unknown attributes are null."""
+
+    sale_id: str = Field(..., min_length=1)
+    address: str = ""
+    price: float = Field(..., gt=0)
+    latitude: Latitude
+    longitude: Longitude
+    bedrooms: Optional[float] = None
+    bathrooms: Optional[float] = None
+    living_area_sqft: Optional[float] = None
+    year_built: Optional[float] = None
+    sale_date: Optional[date] = None
+
+
+class SalesUpdate(BaseModel):
+    """Sales to insert or replace (matched on ``sale_id``) and sale ids to retire."""
+
+    sales: List[SaleRecord] = Field(default_factory=list)
+    retired: List[str] = Field(default_factory=list)
+    source: str = "feed"
+
+
+def _epoch_days(day: Optional[date]) -> Optional[float]:
+    if day is None:
+        return None
+    return float(np.datetime64(day, "D").astype(np.int64))
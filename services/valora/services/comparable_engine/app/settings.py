@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+
+class Settings:
+    def __init__(self) -> None:
+        self.environment = os.getenv("ENVIRONMENT", "local")
+        # .npz written by SalesTable.save or a CSV; empty serves synthetic sales.
+        self.sales_path = os.getenv("COMPS_SALES_PATH", "")
+        self.synthetic_rows = int(os.getenv("COMPS_SYNTHETIC_ROWS", "20000"))
+        # ~0.7 miles per cell suits metro-density sales; sparser data can use larger cells.
+        self.grid_cell_degrees = float(os.getenv("COMPS_GRID_CELL_DEGREES", "0.01"))
+        self.default_k = int(os.getenv("COMPS_DEFAULT_K", "10"))
+        self.max_k = int(os.getenv("COMPS_MAX_K", "100"))
+        self.max_distance_mi = float(os.getenv("COMPS_MAX_DISTANCE_MI", "25"))
+        # Subjects ranked together per vectorized pass of POST /comps/batch.
+        self.batch_chunk_size = int(os.getenv("COMPS_BATCH_CHUNK_SIZE", "64"))
+        self.max_batch_subjects = int(os.getenv("COMPS_MAX_BATCH_SUBJECTS", "10000"))
+        # Sales updates land in delta segments; more than this many are merged in the
+        # background, and once deltas plus retired sales pass the ratio of the base the
+        # whole index is rebuilt.
+        self.max_delta_segments = int(os.getenv("COMPS_MAX_DELTA_SEGMENTS", "4"))
+        self.merge_ratio = float(os.getenv("COMPS_MERGE_RATIO", "0.1"))
+        # "term=weight" overrides of the similarity weights in store.DEFAULT_WEIGHTS.
+        self.similarity_weights = os.getenv("COMPS_SIMILARITY_WEIGHTS", "")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+EARTH_RADIUS_MI = 3958.8
+MAX_DISTANCE_MI = math.pi * EARTH_RADIUS_MI
+
+
+def haversine_mi(
+    latitude: float | np.ndarray,
+    longitude: float | np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+) -> np.ndarray:
+    """Great-circle distance in miles from each origin to each point, broadcasting."""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MI * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Points as ``(n, 3)`` unit vectors, so distances need no trigonometry per pair."""
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord_squared(radius_mi: float | np.ndarray) -> np.ndarray:
+    """Squared unit-sphere chord length spanning a great-circle distance of ``radius_mi``."""
+    angle = np.minimum(np.asarray(radius_mi, dtype=np.float64) / EARTH_RADIUS_MI, math.pi)
+    return (2 * np.sin(angle / 2)) ** 2
+
+
+def chord_to_mi(squared: np.ndarray) -> np.ndarray:
+    """Great-circle miles for squared unit-sphere chord lengths; same as :func:`haversine_mi`."""
+    return 2 * EARTH_RADIUS_MI * np.arcsin(np.minimum(np.sqrt(squared) / 2, 1.0))
+
+
+class GridIndex:
+    """Points bucketed into a fixed latitude/longitude grid for nearest and radius queries.
+
+    Points are sorted by cell, so every cell is one contiguous slice and a query reads
+    only the cells its bounding box touches. The bounding box is exact on the sphere
+    (it widens in longitude towards the poles and wraps at the antimeridian), so results
+    match a brute-force haversine scan. Positions returned index the arrays the grid was
+    built from.
+    """
+
+    def __init__(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, *, cell_degrees: float = 0.05
+    ) -> None:
+        if cell_degrees <= 0:
+            raise ValueError("cell_degrees must be positive")
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.cell_degrees = cell_degrees
+        self._rows = int(math.ceil(180 / cell_degrees))
+        self._cols = int(math.ceil(360 / cell_degrees))
+        keys = self._cell_keys(latitudes, longitudes)
+        self.order = np.argsort(keys, kind="stable")
+        self._keys, self._starts, counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+        self._ends = self._starts + counts
+        # Coordinates in cell order, so candidate slices are contiguous reads.
+        self._latitudes = latitudes[self.order]
+        self._longitudes = longitudes[self.order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int, *, max_distance_mi: float = MAX_DISTANCE_MI
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """The ``k`` points closest to the origin within ``max_distance_mi``, nearest first.
+
+        Searches a radius that doubles until it holds ``k`` points; everything outside
+        a radius is farther than everything inside it, so the answer is exact.
+        """
+        if k < 1 or not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        per_cell = len(self) / len(self._keys)
+        radius = self.cell_degrees * 69.0 * max(math.sqrt(k / per_cell), 1.0) / 2
+        while True:
+            radius = min(radius, max_distance_mi)
+            positions, distances = self._within(latitude, longitude, radius)
+            if len(positions) >= k or radius >= max_distance_mi:
+                break
+            radius *= 2
+        return self._closest(positions, distances, k)
+
+    def within(
+        self, latitude: float, longitude: float, radius_mi: float, *, limit: int | None = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Points within ``radius_mi`` of the origin, nearest first, at most ``limit``."""
+        positions, distances = self._within(latitude, longitude, radius_mi)
+        return self._closest(positions, distances, len(positions) if limit is None else limit)
+
+    def candidates(self, latitude: float, longitude: float, radius_mi: float) -> np.ndarray:
+        """Every point in a cell the query's bounding box touches: a superset of :meth:`within`."""
+        return self.order[_concat_ranges(*self._cell_ranges(latitude, longitude, radius_mi))]
+
+    def candidate_count(self, latitude: float, longitude: float, radius_mi: float) -> int:
+        """``len(candidates(...))`` without materializing them."""
+        starts, ends = self._cell_ranges(latitude, longitude, radius_mi)
+        return int((ends - starts).sum())
+
+    def _within(
+        self, latitude: float, longitude: float, radius_mi: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        positions = _concat_ranges(*self._cell_ranges(latitude, longitude, radius_mi))
+        distances = haversine_mi(
+            latitude, longitude, self._latitudes[positions], self._longitudes[positions]
+        )
+        inside = distances <= radius_mi
+        return positions[inside], distances[inside]
+
+    def _closest(
+        self, positions: np.ndarray, distances: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if len(positions) > k:
+            keep = np.argpartition(distances, k - 1)[:k]
+            positions, distances = positions[keep], distances[keep]
+        ranked = np.argsort(distances, kind="stable")
+        return self.order[positions[ranked]], distances[ranked]
+
+    def candidates_many(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, radii_mi: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """:meth:`candidates` for many origins at once, as ``(origin, point)`` pairs.
+
+        Pairs are grouped by origin, in origin order.
+        """
+        owners, starts, ends = self._cell_ranges_many(latitudes, longitudes, radii_mi)
+        return np.repeat(owners, ends - starts), self.order[_concat_ranges(starts, ends)]
+
+    def _cell_ranges(
+        self, latitude: float, longitude: float, radius_mi: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        _, starts, ends = self._cell_ranges_many(
+            np.array([latitude]), np.array([longitude]), np.array([radius_mi])
+        )
+        return starts, ends
+
+    def _cell_ranges_many(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, radii_mi: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Slices of the sorted points for every cell each origin's bounding box touches."""
+        angle = np.maximum(np.asarray(radii_mi, dtype=np.float64), 0.0) / EARTH_RADIUS_MI
+        lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+        south, north = np.degrees(lat - angle), np.degrees(lat + angle)
+        first_row = self._row(np.maximum(south, -90.0))
+        heights = self._row(np.minimum(north, 90.0)) - first_row + 1
+        # A box over a pole, or wider than the globe, takes every column.
+        polar = (north >= 90) | (south <= -90) | (angle >= math.pi / 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread = np.degrees(np.arcsin(np.minimum(np.sin(angle) / np.cos(lat), 1.0)))
+        spread[polar] = 0.0
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        first_col = self._col(longitudes - spread)
+        widths = self._col(longitudes + spread) - first_col + 1
+        everything = polar | (widths >= self._cols)
+        first_col[everything] = 0
+        widths[everything] = self._cols
+
+        cells = heights * widths
+        owners = np.repeat(np.arange(len(cells)), cells)
+        local = np.arange(int(cells.sum()), dtype=np.int64) - np.repeat(
+            np.cumsum(cells) - cells, cells
+        )
+        rows = first_row[owners] + local // widths[owners]
+        cols = (first_col[owners] + local % widths[owners]) % self._cols
+        slots, found = _matching(self._keys, rows * self._cols + cols)
+        return owners[found], self._starts[slots], self._ends[slots]
+
+    def _cell_keys(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        rows = np.clip(((latitudes + 90) // self.cell_degrees).astype(np.int64), 0, self._rows - 1)
+        cols = ((longitudes + 180) // self.cell_degrees).astype(np.int64) % self._cols
+        return rows * self._cols + cols
+
+    def _row(self, latitudes: np.ndarray) -> np.ndarray:
+        return np.minimum(((latitudes + 90) // self.cell_degrees).astype(np.int64), self._rows - 1)
+
+    def _col(self, longitudes: np.ndarray) -> np.ndarray:
+        return ((longitudes + 180) // self.cell_degrees).astype(np.int64)
+
+
+def _matching(sorted_keys: np.ndarray, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Slots of the ``keys`` present in ``sorted_keys``, and which keys those are."""
+    slots = np.searchsorted(sorted_keys, keys)
+    found = slots < len(sorted_keys)
+    found[found] = sorted_keys[slots[found]] == keys[found]
+    return slots[found], found
+
+
+def _concat_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """``np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])`` without the loop."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return offsets + np.arange(total, dtype=np.int64)
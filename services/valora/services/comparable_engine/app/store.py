@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from services.comparable_engine.app.sales import ATTRIBUTE_COLUMNS, SalesTable
+from services.comparable_engine.app.spatial import (
+    GridIndex,
+    chord_squared,
+    chord_to_mi,
+    unit_vectors,
+)
+from valora_common.schemas.valuation import Comparable
+
+RANGE_COLUMNS = ATTRIBUTE_COLUMNS + ("sale_date",)
+Bounds = Tuple[Optional[float], Optional[float]]
+
+# One unit of difference in each term, before weighting: 1 mile, 250 sqft, one bedroom,
+# one bathroom, ten years of age, six months since the sale.
+SIMILARITY_SCALES: Dict[str, float] = {
+    "distance_mi": 1.0,
+    "living_area_sqft": 250.0,
+    "bedrooms": 1.0,
+    "bathrooms": 1.0,
+    "year_built": 10.0,
+    "sale_age_days": 180.0,
+}
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "distance_mi": 1.0,
+    "living_area_sqft": 1.0,
+    "bedrooms": 0.5,
+    "bathrooms": 0.5,
+    "year_built": 0.3,
+    "sale_age_days": 0.3,
+}
+# Scale units charged when a comp lacks an attribute the subject has.
+MISSING_PENALTY = 3.0
+# Stores this small (fresh delta segments, say) are scanned whole: cheaper than the grid.
+SCAN_ROWS = 4096
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parses ``"distance_mi=1,living_area_sqft=0.8"`` onto :data:`DEFAULT_WEIGHTS`."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in spec.split(","):
+        name, sep, weight = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        if name.strip() not in SIMILARITY_SCALES:
+            raise ValueError(f"Unknown similarity term '{name.strip()}'")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+@dataclass(frozen=True)
+class CompsQuery:
+    """A subject property plus the filters its comps must pass.
+
+    ``subject`` holds the attributes similarity is measured against; ``ranges`` holds
+    inclusive bounds per :data:`RANGE_COLUMNS` entry, ``sale_date`` in days since the
+    epoch.
+    """
+
+    latitude: float
+    longitude: float
+    subject: Mapping[str, float] = field(default_factory=dict)
+    ranges: Mapping[str, Bounds] = field(default_factory=dict)
+    k: int = 10
+    max_distance_mi: float = 25.0
+
+
+@dataclass(frozen=True)
+class CompsBatch:
+    """Many subjects sharing one set of filters, one per row of the arrays.
+
+    ``subjects`` maps attribute names to one value per subject, NaN where a subject
+    does not have it.
+    """
+
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    subjects: Mapping[str, np.ndarray] = field(default_factory=dict)
+    ranges: Mapping[str, Bounds] = field(default_factory=dict)
+    k: int = 10
+    max_distance_mi: float = 25.0
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    def slice(self, start: int, stop: int) -> "CompsBatch":
+        return replace(
+            self,
+            latitudes=self.latitudes[start:stop],
+            longitudes=self.longitudes[start:stop],
+            subjects={name: values[start:stop] for name, values in self.subjects.items()},
+        )
+
+
+Ranked = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class SortedColumn:
+    """A column's values in ascending order with the row each came from.
+
+    A range filter is two binary searches and returns a slice of row ids. Unknown
+    values sort last and never match.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.rows = np.argsort(values, kind="stable")
+        self.values = values[self.rows]
+        self._known = int(np.count_nonzero(~np.isnan(values)))
+
+    def between(self, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        return self.rows[slice(*self._bounds(low, high))]
+
+    def count(self, low: Optional[float], high: Optional[float]) -> int:
+        start, stop = self._bounds(low, high)
+        return max(stop - start, 0)
+
+    def _bounds(self, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        start = (
+            0 if low is None else int(np.searchsorted(self.values[: self._known], low, side="left"))
+        )
+        stop = (
+            self._known
+            if high is None
+            else int(np.searchsorted(self.values[: self._known], high, side="right"))
+        )
+        return start, stop
+
+
+class SalesStore:
+    """Sales laid out column by column for filtered, similarity-ranked comps queries.
+
+    Rows are stored in spatial-grid order, so the sales near a subject are a handful of
+    contiguous slices of every column. Each range column also has a :class:`SortedColumn`
+    index; a query starts from whichever is smaller, the grid cells around the subject
+    or the narrowest range filter, and checks the remaining filters vectorized.
+
+    Comps are ranked by a weighted penalty, the sum over terms of
+    ``weight * |comp - subject| / scale`` (see :data:`SIMILARITY_SCALES`), and reported
+    as ``similarity = 1 / (1 + penalty)``. The search radius doubles from
+    ``initial_radius_mi`` until the k-th best penalty is below the distance penalty of
+    anything outside the radius, so the top k are exact without scoring every sale.
+    Stores of at most :data:`SCAN_ROWS` sales skip the grid and score every sale.
+
+    The store itself never changes. Retired sales are hidden by passing a ``retired``
+    mask over its rows to :meth:`rank` and :meth:`rank_batch`; see
+    :class:`~services.comparable_engine.app.live.LiveSalesIndex`.
+    """
+
+    def __init__(
+        self,
+        sales: SalesTable,
+        *,
+        cell_degrees: float = 0.01,
+        weights: Optional[Mapping[str, float]] = None,
+        initial_radius_mi: float = 0.5,
+    ) -> None:
+        layout = GridIndex(sales.latitude, sales.longitude, cell_degrees=cell_degrees)
+        # Row i of the store is row order[i] of the table it was built from.
+        self.order = layout.order
+        self.sales = sales.take(layout.order)
+        self.grid = GridIndex(self.sales.latitude, self.sales.longitude, cell_degrees=cell_degrees)
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self.initial_radius_mi = initial_radius_mi
+        self._points = unit_vectors(self.sales.latitude, self.sales.longitude)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.asarray(getattr(self.sales, name), dtype=np.float64)
+            for name in ATTRIBUTE_COLUMNS
+        }
+        self.columns["sale_date"] = _days(self.sales.sale_date)
+        self.indexes = {name: SortedColumn(self.columns[name]) for name in RANGE_COLUMNS}
+        known_dates = self.columns["sale_date"][~np.isnan(self.columns["sale_date"])]
+        # Sale age is measured from the newest sale, so a snapshot ranks as it did when taken.
+        self.as_of = float(known_dates.max()) if len(known_dates) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.sales)
+
+    def search(self, query: CompsQuery) -> List[Comparable]:
+        return self.comparables(*self.rank(query))
+
+    def comparables(
+        self, rows: np.ndarray, distances: np.ndarray, penalties: np.ndarray
+    ) -> List[Comparable]:
+        comps = self.sales.comparables(rows, distances)
+        for comp, penalty in zip(comps, penalties.tolist()):
+            comp.similarity = round(1.0 / (1.0 + penalty), 4)
+        return comps
+
+    def rank(
+        self,
+        query: CompsQuery,
+        *,
+        retired: Optional[np.ndarray] = None,
+        as_of: Optional[float] = None,
+    ) -> Ranked:
+        """Rows, distances and penalties of the best ``k`` comps, best first.
+
+        Rows set in ``retired`` are skipped; ``as_of`` overrides the day sale ages are
+        measured from.
+        """
+        ranges = _active(query.ranges)
+        narrowest = min(
+            ranges, key=lambda name: self.indexes[name].count(*ranges[name]), default=None
+        )
+        origin = unit_vectors(np.array([query.latitude]), np.array([query.longitude]))[0]
+        distance_weight = self._distance_weight()
+        radius = self._initial_radius(query.max_distance_mi)
+        while True:
+            if len(self) <= SCAN_ROWS:
+                radius = query.max_distance_mi
+                rows = np.arange(len(self))
+            elif narrowest is not None and self.indexes[narrowest].count(
+                *ranges[narrowest]
+            ) <= self.grid.candidate_count(query.latitude, query.longitude, radius):
+                # The filter alone is the smaller scan, and it covers every distance.
+                radius = query.max_distance_mi
+                rows = np.sort(self.indexes[narrowest].between(*ranges[narrowest]))
+            else:
+                rows = self.grid.candidates(query.latitude, query.longitude, radius)
+            rows = rows[self._passes(rows, ranges, retired)]
+            inside, distances = self._inside(rows, origin, chord_squared(radius))
+            rows = rows[inside]
+            penalties = self._score(rows, distances, query.subject, as_of)
+            best = _smallest(penalties, query.k)
+            if radius >= query.max_distance_mi or (
+                len(best) >= query.k and penalties[best[-1]] <= distance_weight * radius
+            ):
+                return rows[best], distances[best], penalties[best]
+            radius = self._next_radius(
+                radius, penalties[best[-1]] if len(best) >= query.k else 0.0, query.max_distance_mi
+            )
+
+    def rank_batch(
+        self,
+        batch: CompsBatch,
+        *,
+        retired: Optional[np.ndarray] = None,
+        as_of: Optional[float] = None,
+    ) -> List[Ranked]:
+        """:meth:`rank` for every subject of ``batch`` in one vectorized pass per round.
+
+        Each round gathers ``(subject, sale)`` candidate pairs for every unfinished
+        subject from the grid, then filters them, measures distances and scores them
+        together; only the per-subject partial sort runs subject by subject. Subjects
+        whose answer is not yet exact go round again with a wider radius. Range filters
+        prune candidates but the sorted indexes are not consulted.
+        """
+        ranges = _active(batch.ranges)
+        distance_weight = self._distance_weight()
+        origins = unit_vectors(batch.latitudes, batch.longitudes)
+        radius = self._initial_radius(batch.max_distance_mi)
+        if len(self) <= SCAN_ROWS:
+            radius = batch.max_distance_mi
+        radii = np.full(len(batch), radius)
+        results: List[Ranked] = [_EMPTY] * len(batch)
+        pending = np.arange(len(batch))
+        while len(pending):
+            if len(self) <= SCAN_ROWS:
+                owners = np.repeat(np.arange(len(pending)), len(self))
+                rows = np.tile(np.arange(len(self)), len(pending))
+            else:
+                owners, rows = self.grid.candidates_many(
+                    batch.latitudes[pending], batch.longitudes[pending], radii[pending]
+                )
+            keep = self._passes(rows, ranges, retired)
+            owners, rows = owners[keep], rows[keep]
+            limits = chord_squared(radii[pending])
+            inside, distances = self._inside(rows, origins[pending[owners]], limits[owners])
+            owners, rows = owners[inside], rows[inside]
+            subjects = pending[owners]
+            penalties = self._score(
+                rows,
+                distances,
+                {name: values[subjects] for name, values in batch.subjects.items()},
+                as_of,
+            )
+            # Pairs stay grouped by subject, so each subject's pairs are one slice.
+            bounds = np.concatenate(([0], np.cumsum(np.bincount(owners, minlength=len(pending)))))
+            finished = np.zeros(len(pending), dtype=bool)
+            for owner, subject in enumerate(pending.tolist()):
+                start = int(bounds[owner])
+                best = start + _smallest(penalties[start : bounds[owner + 1]], batch.k)
+                worst = penalties[best[-1]] if len(best) >= batch.k else None
+                radius = float(radii[subject])
+                if radius >= batch.max_distance_mi or (
+                    worst is not None and worst <= distance_weight * radius
+                ):
+                    results[subject] = (rows[best], distances[best], penalties[best])
+                    finished[owner] = True
+                else:
+                    radii[subject] = self._next_radius(radius, worst or 0.0, batch.max_distance_mi)
+            pending = pending[~finished]
+        return results
+
+    def _initial_radius(self, max_distance_mi: float) -> float:
+        if self._distance_weight() <= 0:
+            return max_distance_mi
+        return min(self.initial_radius_mi, max_distance_mi)
+
+    def _next_radius(self, radius: float, worst: float, max_distance_mi: float) -> float:
+        # Widening to the k-th penalty's distance equivalent settles the answer in one more
+        # round; with fewer than k comps found, double.
+        return min(max(radius * 2, worst / self._distance_weight()), max_distance_mi)
+
+    def _inside(
+        self, rows: np.ndarray, origins: np.ndarray, limits: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Which candidates lie within their origin's :func:`chord_squared` limit, and how far."""
+        delta = self._points[rows] - origins
+        squared = np.einsum("ij,ij->i", delta, delta)
+        inside = squared <= limits
+        return inside, chord_to_mi(squared[inside])
+
+    def _passes(
+        self,
+        rows: np.ndarray,
+        ranges: Mapping[str, Bounds],
+        retired: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        keep = np.ones(len(rows), dtype=bool) if retired is None else ~retired[rows]
+        for name, (low, high) in ranges.items():
+            values = self.columns[name][rows]
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+        return keep
+
+    def _score(
+        self,
+        rows: np.ndarray,
+        distances: np.ndarray,
+        subject: Mapping[str, Union[float, np.ndarray]],
+        as_of: Optional[float] = None,
+    ) -> np.ndarray:
+        """Penalty of each candidate; subject values are scalars or one per candidate."""
+        penalties = self._term("distance_mi", distances)
+        for name in ATTRIBUTE_COLUMNS:
+            target = subject.get(name)
+            if target is None:
+                continue
+            target = np.asarray(target, dtype=np.float64)
+            term = self._term(name, np.abs(self.columns[name][rows] - target))
+            # An attribute the subject lacks costs nothing.
+            penalties += np.where(np.isnan(target), 0.0, term)
+        newest = self.as_of if as_of is None else as_of
+        penalties += self._term("sale_age_days", newest - self.columns["sale_date"][rows])
+        return penalties
+
+    def _term(self, name: str, differences: np.ndarray) -> np.ndarray:
+        scaled = differences / SIMILARITY_SCALES[name]
+        return self.weights.get(name, 0.0) * np.where(np.isnan(scaled), MISSING_PENALTY, scaled)
+
+    def _distance_weight(self) -> float:
+        return self.weights.get("distance_mi", 0.0) / SIMILARITY_SCALES["distance_mi"]
+
+
+_EMPTY: Ranked = (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+
+
+def _smallest(values: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the ``k`` smallest ``values``, smallest first: a partial sort."""
+    if len(values) > k:
+        top = np.argpartition(values, k - 1)[:k]
+        return top[np.argsort(values[top], kind="stable")]
+    return np.argsort(values, kind="stable")
+
+
+def _active(ranges: Mapping[str, Bounds]) -> Dict[str, Bounds]:
+    return {name: bounds for name, bounds in ranges.items() if bounds != (None, None)}
+
+
+def _days(dates: np.ndarray) -> np.ndarray:
+    days = dates.astype("datetime64[D]").astype(np.int64).astype(np.float64)
+    days[np.isnat(dates)] = np.nan
+    return days
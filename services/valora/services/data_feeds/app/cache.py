@@ -1,21 +1,231 @@
 from __future__ import annotations
 
-import os
+import asyncio
+import gzip
+import hashlib
+import json
 import time
-from typing import Any, Awaitable, Callable, Dict, Tuple
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
-CacheEntry = Tuple[float, Any]
+from services.data_feeds.app.settings import get_settings
 
-_CACHE: Dict[str, CacheEntry] = {}
-_DEFAULT_TTL = int(os.getenv("DATA_FEED_CACHE_TTL_SECONDS", "300"))
+Fetcher = Callable[[], Awaitable[Any]]
 
 
-async def get_cached(key: str, fetcher: Callable[[], Awaitable[Any]], ttl: int | None = None) -> Any:
-    effective_ttl = ttl or _DEFAULT_TTL
-    now = time.monotonic()
-    entry = _CACHE.get(key)
-    if entry and now - entry[0] < effective_ttl:
-        return entry[1]
-    result = await fetcher()
-    _CACHE[key] = (now, result)
-    return result
+@dataclass(frozen=True)
+class EncodedFeed:
+    """A feed value encoded once for serving: JSON bytes, their gzip and strong ETags."""
+
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+
+    @classmethod
+    def of(cls, value: Any) -> "EncodedFeed":
+        # Same encoding as Starlette's JSONResponse.
+        body = json.dumps(
+            value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # mtime=0 keeps the gzip bytes, and so their ETag, stable across workers.
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+        return cls(body=body, gzipped=gzipped, etag=f'"{digest}"', gzip_etag=f'"{digest}-gz"')
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    encoded: EncodedFeed
+    fetched_at: float
+
+
+@dataclass
+class KeyStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    fetches: int = 0
+    errors: int = 0
+    last_fetch_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class FeedCache:
+    """Upstream feed responses by key, with at most one fetch in flight per key.
+
+    Each value is stored with its :class:`EncodedFeed`, encoded once per fetch rather
+    than on every read. A value is fresh for ``ttl_seconds``. For ``stale_seconds``
+    after that it is still returned immediately while one background fetch refreshes
+    it, and a failed refresh leaves it in place. Callers with nothing usable wait on
+    the key's in-flight fetch rather than starting their own, so an expiry costs the
+    upstream one call however many requests arrive at once. At most ``max_entries``
+    keys are kept, least recently used first out, and per-key stats are bounded the
+    same way.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task[CacheEntry]] = {}
+        self._stats: "OrderedDict[str, KeyStats]" = OrderedDict()
+        self._evictions = 0
+
+    async def get(self, key: str, fetcher: Fetcher, ttl: Optional[float] = None) -> Any:
+        return (await self._entry(key, fetcher, ttl)).value
+
+    async def get_encoded(
+        self, key: str, fetcher: Fetcher, ttl: Optional[float] = None
+    ) -> EncodedFeed:
+        """Like :meth:`get`, but the value's pre-encoded response bytes."""
+        return (await self._entry(key, fetcher, ttl)).encoded
+
+    async def refresh(self, key: str, fetcher: Fetcher) -> Any:
+        """Fetches ``key`` now, or joins the fetch already in flight, and caches the result."""
+        task, _ = self._fetch(key, fetcher)
+        return (await asyncio.shield(task)).value
+
+    async def _entry(self, key: str, fetcher: Fetcher, ttl: Optional[float]) -> CacheEntry:
+        ttl = ttl or self.ttl_seconds
+        stats = self._key_stats(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            if age < ttl + self.stale_seconds:
+                self._entries.move_to_end(key)
+                if age < ttl:
+                    stats.hits += 1
+                else:
+                    stats.stale_hits += 1
+                    self._fetch(key, fetcher)
+                return entry
+        stats.misses += 1
+        task, started = self._fetch(key, fetcher)
+        if not started:
+            stats.coalesced += 1
+        # Shielded: a caller that disconnects does not cancel the fetch for the others.
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._entries.clear()
+            self._stats.clear()
+        else:
+            self._entries.pop(key, None)
+            self._stats.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        keys = {}
+        for key, stats in self._stats.items():
+            entry = self._entries.get(key)
+            keys[key] = {
+                **asdict(stats),
+                "age_seconds": round(now - entry.fetched_at, 3) if entry else None,
+                "refreshing": key in self._inflight,
+            }
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "evictions": self._evictions,
+            "keys": keys,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key_stats(self, key: str) -> KeyStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = KeyStats()
+            if len(self._stats) > self.max_entries:
+                self._drop_stats(keep=key)
+        self._stats.move_to_end(key)
+        return stats
+
+    def _drop_stats(self, keep: str) -> None:
+        # Keys never stored, such as ones whose fetches keep failing, would otherwise
+        # pile up here. Stats for a cached value or a fetch in flight stay.
+        for key in self._stats:
+            if key != keep and key not in self._entries and key not in self._inflight:
+                del self._stats[key]
+                return
+
+    def _fetch(self, key: str, fetcher: Fetcher) -> Tuple[asyncio.Task[CacheEntry], bool]:
+        """The key's in-flight fetch, starting one if there is none; and whether it started."""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        # A task left behind by a loop that has since closed will never finish.
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return task, False
+        task = loop.create_task(self._refresh(key, fetcher), name=f"feed-refresh:{key}")
+        task.add_done_callback(_retrieve_exception)
+        self._inflight[key] = task
+        return task, True
+
+    async def _refresh(self, key: str, fetcher: Fetcher) -> CacheEntry:
+        stats = self._key_stats(key)
+        stats.fetches += 1
+        started = self._clock()
+        try:
+            value = await fetcher()
+        except Exception as exc:
+            stats.errors += 1
+            stats.last_error = repr(exc)
+            raise
+        else:
+            return self._store(key, value)
+        finally:
+            stats.last_fetch_seconds = round(self._clock() - started, 6)
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _store(self, key: str, value: Any) -> CacheEntry:
+        entry = CacheEntry(value=value, encoded=EncodedFeed.of(value), fetched_at=self._clock())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            if evicted not in self._inflight:
+                self._stats.pop(evicted, None)
+            self._evictions += 1
+        return entry
+
+
+def _retrieve_exception(task: asyncio.Task[Any]) -> None:
+    # Background refreshes have no awaiter; their errors are counted in KeyStats instead.
+    if not task.cancelled():
+        task.exception()
+
+
+_settings = get_settings()
+feed_cache = FeedCache(
+    ttl_seconds=_settings.cache_ttl_seconds,
+    stale_seconds=_settings.cache_stale_seconds,
+    max_entries=_settings.cache_max_entries,
+)
+
+
+async def get_cached(key: str, fetcher: Fetcher, ttl: float | None = None) -> Any:
+    return await feed_cache.get(key, fetcher, ttl)
+
+
+async def get_cached_encoded(key: str, fetcher: Fetcher, ttl: float | None = None) -> EncodedFeed:
+    return await feed_cache.get_encoded(key, fetcher, ttl)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Optional
 
 import httpx
 
+from services.data_feeds.app.settings import Settings
+
 SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample_data"
 
 
@@ -15,37 +18,73 @@ def _load_sample(name: str) -> Dict[str, Any]:
         return json.load(handle)
 
 
+def http2_available() -> bool:
+    # httpx only speaks HTTP/2 with the optional h2 package (httpx[http2]).
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """The process-wide upstream client: pooled keep-alive connections, HTTP/2 if possible."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.upstream_max_connections,
+            max_keepalive_connections=settings.upstream_max_keepalive_connections,
+            keepalive_expiry=settings.upstream_keepalive_seconds,
+        ),
+        http2=settings.upstream_http2 and http2_available(),
+        headers={"User-Agent": "valora-data-feeds/0.1.0"},
+    )
+
+
 class DataFeedClient:
-    def __init__(self) -> None:
+    """Fetches market data from the configured upstream APIs, or sample data without them.
+
+    Calls go through ``http``, the long-lived pooled client from :func:`create_http_client`,
+    so they reuse warm connections. Without one, each call opens and closes its own.
+    """
+
+    def __init__(self, http: Optional[httpx.AsyncClient] = None) -> None:
         self.interest_rate_url = os.getenv("INTEREST_RATE_API_URL")
         self.property_sales_url = os.getenv("PROPERTY_SALES_API_URL")
         self.api_key = os.getenv("DATA_FEED_API_KEY")
+        self._http = http
 
     async def fetch_interest_rates(self) -> Dict[str, Any]:
         if not self.interest_rate_url:
             return _load_sample("interest_rates")
         headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
-        async with httpx.AsyncClient(timeout=6) as client:
-            response = await client.get(self.interest_rate_url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(self.interest_rate_url, headers=headers, timeout=6)
 
     async def fetch_residential_sales(self) -> Dict[str, Any]:
         if not self.property_sales_url:
             return _load_sample("residential_sales")
         headers = {"x-api-key": self.api_key} if self.api_key else {}
         params = {"type": "residential"}
-        async with httpx.AsyncClient(timeout=8) as client:
-            response = await client.get(self.property_sales_url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(
+            self.property_sales_url, headers=headers, params=params, timeout=8
+        )
 
     async def fetch_commercial_sales(self) -> Dict[str, Any]:
         if not self.property_sales_url:
             return _load_sample("commercial_sales")
         headers = {"x-api-key": self.api_key} if self.api_key else {}
         params = {"type": "commercial"}
-        async with httpx.AsyncClient(timeout=8) as client:
-            response = await client.get(self.property_sales_url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(
+            self.property_sales_url, headers=headers, params=params, timeout=8
+        )
+
+    async def _get_json(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        params: Optional[Mapping[str, str]] = None,
+        timeout: float,
+    ) -> Dict[str, Any]:
+        if self._http is None:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.get(url, params=params, headers=headers)
+        else:
+            response = await self._http.get(url, params=params, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
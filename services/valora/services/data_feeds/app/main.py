@@ -1,18 +1,63 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
 from fastapi import FastAPI
 
+from services.data_feeds.app.cache import feed_cache
+from services.data_feeds.app.clients.external import DataFeedClient, create_http_client
 from services.data_feeds.app.routes import feeds
-+from valora_common.security import SecurityHeadersMiddleware
-+
+from services.data_feeds.app.scheduler import FeedRefresher, feed_fetchers
+from services.data_feeds.app.settings import get_settings
+from valora_common.security import SecurityHeadersMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    http = create_http_client(settings)
+    app.state.feed_client = DataFeedClient(http)
+    refresher: Optional[FeedRefresher] = None
+    if settings.refresh_enabled:
+        refresher = FeedRefresher(
+            feed_cache,
+            feed_fetchers(app.state.feed_client),
+            interval_seconds=feed_cache.ttl_seconds * settings.refresh_fraction,
+            jitter=settings.refresh_jitter,
+            retry_base_seconds=settings.refresh_retry_base_seconds,
+            retry_max_seconds=settings.refresh_retry_max_seconds,
+        )
+        # Every feed is in memory before the first request is served.
+        await refresher.start()
+    app.state.feed_refresher = refresher
+    try:
+        yield
+    finally:
+        if refresher is not None:
+            await refresher.stop()
+        await http.aclose()
 
--app = FastAPI(title="VALORA Data Feeds API")
-+app = FastAPI(title="VALORA Data Feeds API")
-+app.add_middleware(SecurityHeadersMiddleware)
+
+app = FastAPI(title="VALORA Data Feeds API", lifespan=lifespan)
+app.add_middleware(SecurityHeadersMiddleware)
 
 app.include_router(feeds.router)
-+
-+
-+@app.get("/healthz")
-+async def healthcheck() -> dict[str, str]:
-+    return {"status": "ok"}
+
+
+@app.get("/healthz")
+async def healthcheck() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@app.get("/feeds/cache/stats")
+async def cache_stats() -> Dict[str, Any]:
+    """Feed cache size and per-key hits, stale hits, coalesced waits and fetches."""
+    return feed_cache.stats()
+
+
+@app.get("/feeds/status")
+async def feed_status() -> Dict[str, Any]:
+    """Per feed: age of the last successful background refresh, failures, next refresh."""
+    refresher: Optional[FeedRefresher] = app.state.feed_refresher
+    return refresher.stats() if refresher is not None else {"feeds": {}}
@@ -1,35 +1,86 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
 
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from services.data_feeds.app.cache import EncodedFeed, Fetcher, get_cached_encoded
 from services.data_feeds.app.clients.external import DataFeedClient
-from services.data_feeds.app.cache import get_cached
 from services.data_feeds.app.security import rate_limiter
 
 router = APIRouter(prefix="/feeds", tags=["Data Feeds"], dependencies=[Depends(rate_limiter)])
 
-client = DataFeedClient()
+
+async def get_feed_client(request: Request) -> DataFeedClient:
+    return request.app.state.feed_client  # type: ignore[no-any-return]
+
+
+FeedClient = Annotated[DataFeedClient, Depends(get_feed_client)]
 
 
 @router.get("/interest-rates")
-async def get_interest_rates() -> dict:
-    try:
-        return await get_cached("interest_rates", client.fetch_interest_rates)
-    except Exception as exc:  # pragma: no cover - network failure
-        raise HTTPException(status_code=502, detail="Failed to fetch interest rates") from exc
+async def get_interest_rates(request: Request, client: FeedClient) -> Response:
+    return await _serve(request, "interest_rates", client.fetch_interest_rates, "interest rates")
 
 
 @router.get("/property-sales/residential")
-async def get_residential_sales() -> dict:
-    try:
-        return await get_cached("residential_sales", client.fetch_residential_sales)
-    except Exception as exc:  # pragma: no cover
-        raise HTTPException(status_code=502, detail="Failed to fetch residential sales data") from exc
+async def get_residential_sales(request: Request, client: FeedClient) -> Response:
+    return await _serve(
+        request, "residential_sales", client.fetch_residential_sales, "residential sales data"
+    )
 
 
 @router.get("/property-sales/commercial")
-async def get_commercial_sales() -> dict:
+async def get_commercial_sales(request: Request, client: FeedClient) -> Response:
+    return await _serve(
+        request, "commercial_sales", client.fetch_commercial_sales, "commercial sales data"
+    )
+
+
+async def _serve(request: Request, key: str, fetcher: Fetcher, label: str) -> Response:
     try:
-        return await get_cached("commercial_sales", client.fetch_commercial_sales)
-    except Exception as exc:  # pragma: no cover
-        raise HTTPException(status_code=502, detail="Failed to fetch commercial sales data") from exc
+        feed = await get_cached_encoded(key, fetcher)
+    except Exception as exc:  # pragma: no cover - network failure
+        raise HTTPException(status_code=502, detail=f"Failed to fetch {label}") from exc
+    return feed_response(request, feed)
+
+
+def feed_response(request: Request, feed: EncodedFeed) -> Response:
+    """The cached bytes as they are: 304 when the client's ETag is current, gzip if accepted."""
+    gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = feed.gzip_etag if gzip else feed.etag
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match"), (feed.etag, feed.gzip_etag)):
+        return Response(status_code=304, headers=headers)
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(feed.gzipped, media_type="application/json", headers=headers)
+    return Response(feed.body, media_type="application/json", headers=headers)
+
+
+def _accepts_gzip(header: str) -> bool:
+    # Explicit gzip (or its x-gzip alias) wins over "*"; q=0 means the client refuses it.
+    qualities: dict[str, float] = {}
+    for coding in header.lower().split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            field, _, value = param.partition("=")
+            if field.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip()] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
+def _etag_matches(header: str | None, current: tuple[str, ...]) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches.
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return any(etag in tags for etag in current)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+from services.data_feeds.app.cache import FeedCache, Fetcher
+from services.data_feeds.app.clients.external import DataFeedClient
+
+
+def feed_fetchers(client: DataFeedClient) -> Dict[str, Fetcher]:
+    """Every feed the service serves, by cache key."""
+    return {
+        "interest_rates": client.fetch_interest_rates,
+        "residential_sales": client.fetch_residential_sales,
+        "commercial_sales": client.fetch_commercial_sales,
+    }
+
+
+@dataclass
+class FeedState:
+    refreshes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_refresh: Optional[float] = None
+    last_error: Optional[str] = None
+    next_refresh: Optional[float] = None
+
+
+class FeedRefresher:
+    """Keeps every feed in the cache fresh, so requests never wait on the upstream.
+
+    Each feed is refreshed every ``interval_seconds`` (set below the cache TTL), spread
+    by +/- ``jitter`` so feeds and workers do not all call upstream at the same moment.
+    A failed refresh is retried after an exponential backoff from
+    ``retry_base_seconds`` up to ``retry_max_seconds``, also jittered; the cache keeps
+    serving the last good value meanwhile. Refreshes go through the cache's single
+    flight, so they never duplicate a fetch a request already started.
+    """
+
+    def __init__(
+        self,
+        cache: FeedCache,
+        fetchers: Mapping[str, Fetcher],
+        *,
+        interval_seconds: float,
+        jitter: float = 0.1,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._cache = cache
+        self._fetchers = dict(fetchers)
+        self.interval_seconds = interval_seconds
+        self.jitter = jitter
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._states = {name: FeedState() for name in self._fetchers}
+        self._tasks: List[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Loads every feed once, then keeps refreshing each in its own task."""
+        await asyncio.gather(*(self.refresh(name) for name in self._fetchers))
+        self._tasks = [
+            asyncio.create_task(self._run(name), name=f"feed-refresher:{name}")
+            for name in self._fetchers
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def refresh(self, name: str) -> bool:
+        """One refresh attempt for feed ``name``; schedules the next and says if it worked."""
+        state = self._states[name]
+        try:
+            await self._cache.refresh(name, self._fetchers[name])
+        except Exception as exc:
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.last_error = repr(exc)
+        else:
+            state.refreshes += 1
+            state.consecutive_failures = 0
+            state.last_refresh = self._clock()
+        state.next_refresh = self._clock() + self._next_delay(name)
+        return state.consecutive_failures == 0
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        feeds = {}
+        for name, state in self._states.items():
+            feed = asdict(state)
+            last_refresh, next_refresh = feed.pop("last_refresh"), feed.pop("next_refresh")
+            feed["last_refresh_age_seconds"] = (
+                round(now - last_refresh, 3) if last_refresh is not None else None
+            )
+            feed["next_refresh_in_seconds"] = (
+                round(max(next_refresh - now, 0.0), 3) if next_refresh is not None else None
+            )
+            feeds[name] = feed
+        return {"interval_seconds": self.interval_seconds, "feeds": feeds}
+
+    async def _run(self, name: str) -> None:
+        while True:
+            next_refresh = self._states[name].next_refresh
+            delay = self.interval_seconds
+            if next_refresh is not None:
+                delay = max(next_refresh - self._clock(), 0.0)
+            await self._sleep(delay)
+            await self.refresh(name)
+
+    def _next_delay(self, name: str) -> float:
+        failures = self._states[name].consecutive_failures
+        if not failures:
+            spread = self._rng.uniform(-self.jitter, self.jitter)
+            return self.interval_seconds * (1 + spread)
+        backoff = min(self.retry_base_seconds * 2 ** (failures - 1), self.retry_max_seconds)
+        # Equal jitter: at least half the backoff, so retries still slow down.
+        return backoff * self._rng.uniform(0.5, 1.0)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from functools import lru_cache
+
+
+class Settings:
+    def __init__(self) -> None:
+        self.environment = os.getenv("ENVIRONMENT", "local")
+        # Feeds are fresh for the TTL, then served stale for up to the stale window while
+        # one background fetch refreshes them; past that, callers wait for the fetch.
+        self.cache_ttl_seconds = float(os.getenv("DATA_FEED_CACHE_TTL_SECONDS", "300"))
+        self.cache_stale_seconds = float(os.getenv("DATA_FEED_CACHE_STALE_SECONDS", "3600"))
+        self.cache_max_entries = int(os.getenv("DATA_FEED_CACHE_MAX_ENTRIES", "256"))
+        # Each feed is refreshed in the background at this fraction of the TTL, +/- the
+        # jitter fraction; failures retry with exponential backoff between the bounds.
+        self.refresh_enabled = _flag("DATA_FEED_REFRESH_ENABLED", True)
+        self.refresh_fraction = float(os.getenv("DATA_FEED_REFRESH_FRACTION", "0.8"))
+        self.refresh_jitter = float(os.getenv("DATA_FEED_REFRESH_JITTER", "0.1"))
+        self.refresh_retry_base_seconds = float(os.getenv("DATA_FEED_RETRY_BASE_SECONDS", "2"))
+        self.refresh_retry_max_seconds = float(os.getenv("DATA_FEED_RETRY_MAX_SECONDS", "300"))
+        # One pooled client per worker talks to the upstream APIs. Idle connections stay
+        # open for the keep-alive expiry; HTTP/2 is used when h2 is installed.
+        self.upstream_max_connections = int(os.getenv("DATA_FEED_MAX_CONNECTIONS", "20"))
+        self.upstream_max_keepalive_connections = int(
+            os.getenv("DATA_FEED_MAX_KEEPALIVE_CONNECTIONS", "10")
+        )
+        self.upstream_keepalive_seconds = float(os.getenv("DATA_FEED_KEEPALIVE_SECONDS", "60"))
+        self.upstream_http2 = _flag("DATA_FEED_HTTP2", True)
+        # Each client gets a token bucket of the burst size (the limit when unset),
+        # refilled at limit per window. Buckets live in a SQLite file that every worker
+        # on the host shares, or per worker when the store is "memory".
+        self.rate_limit = int(os.getenv("DATA_FEED_RATE_LIMIT", "60"))
+        self.rate_window_seconds = float(os.getenv("DATA_FEED_WINDOW_SECONDS", "60"))
+        burst = os.getenv("DATA_FEED_RATE_BURST")
+        self.rate_burst = int(burst) if burst else None
+        self.rate_limit_store = os.getenv(
+            "DATA_FEED_RATE_LIMIT_STORE",
+            os.path.join(tempfile.gettempdir(), "valora-ratelimit.sqlite3"),
+        )
+
+
+def _flag(name: str, default: bool) -> bool:
+    return os.getenv(name, "true" if default else "false").lower() in {"1", "true", "yes"}
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
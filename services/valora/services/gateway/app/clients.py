@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Union
+from typing import Any, Dict, Union
 
 import httpx
 from fastapi import UploadFile
@@ -38,7 +38,7 @@ class ValuationOrchestratorClient:
         response.raise_for_status()
         return JobStatus.model_validate(response.json())
 
-    async def upload_image(self, valuation_id: str, image: UploadFile) -> dict[str, str]:
+    async def upload_image(self, valuation_id: str, image: UploadFile) -> Dict[str, Any]:
         file_bytes = await image.read()
         files = {"image": (image.filename or "upload.jpg", file_bytes, image.content_type or "application/octet-stream")}
         response = await self._client.post(f"/valuations/{valuation_id}/images", files=files)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Union
+from typing import Any, AsyncIterator, Dict, Union
 
 import httpx
 from fastapi import Depends, FastAPI, File, HTTPException, UploadFile, status
@@ -98,7 +98,7 @@ async def upload_images(
     valuation_id: str,
     image: UploadFile = File(...),
     orchestrator: ValuationOrchestratorClient = Depends(get_client),
-) -> dict[str, str]:
+) -> Dict[str, Any]:
     try:
         return await orchestrator.upload_image(valuation_id, image)
     except httpx.HTTPStatusError as exc:
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BatchHandler = Callable[[List[T]], Sequence[Union[R, BaseException]]]
+
+
+class BatcherStoppedError(RuntimeError):
+    pass
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesces concurrent single-item calls into one vectorized handler call.
+
+    The first waiting item opens a batch; the batch closes after ``window_ms`` or as
+    soon as ``max_batch_size`` items are waiting, whichever comes first. ``handler``
+    receives the items in arrival order and returns one result per item; an exception
+    in its place fails only that caller. If the handler raises for a batch, each item is
+    retried on its own, so one bad item never fails the callers batched with it.
+    """
+
+    def __init__(
+        self, handler: BatchHandler[T, R], *, max_batch_size: int, window_ms: float
+    ) -> None:
+        self._handler = handler
+        self._max_batch_size = max(max_batch_size, 1)
+        self._window = max(window_ms, 0.0) / 1000
+        self._queue: asyncio.Queue[Tuple[T, asyncio.Future[R]]] = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._held = 0  # items the collector has taken off the queue for the open batch
+        self._collector: Optional[asyncio.Task[None]] = None
+        self._batches = 0
+        self._items = 0
+        self._largest = 0
+
+    async def start(self) -> None:
+        self._collector = asyncio.create_task(self._collect(), name="micro-batcher")
+
+    async def stop(self) -> None:
+        if self._collector is not None:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+            self._collector = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(BatcherStoppedError("Micro-batcher stopped"))
+
+    async def submit(self, item: T) -> R:
+        if self._collector is None:
+            raise BatcherStoppedError("MicroBatcher.start() was not awaited")
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        if self._held + self._queue.qsize() >= self._max_batch_size:
+            self._full.set()
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self._window * 1000,
+            "max_batch_size": self._max_batch_size,
+            "queued": self._queue.qsize(),
+            "batches": self._batches,
+            "items": self._items,
+            "mean_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "largest_batch": self._largest,
+        }
+
+    async def _collect(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            self._held = len(batch)
+            if self._window and self._queue.qsize() < self._max_batch_size - 1:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self._window)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._held = 0
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[T, asyncio.Future[R]]]) -> None:
+        self._batches += 1
+        self._items += len(batch)
+        self._largest = max(self._largest, len(batch))
+        items = [item for item, _ in batch]
+        try:
+            results = self._handler(items)
+        except Exception as exc:  # noqa: BLE001 - surfaced to the caller(s) it belongs to
+            results = [exc] if len(items) == 1 else [self._handle_one(item) for item in items]
+        for (_, future), result in zip(batch, results):
+            if future.done():  # caller went away
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _handle_one(self, item: T) -> Union[R, BaseException]:
+        try:
+            return self._handler([item])[0]
+        except Exception as exc:  # noqa: BLE001 - this item's own failure
+            return exc
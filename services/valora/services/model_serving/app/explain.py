@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.model_serving.app.predictor import request_region
+from services.model_serving.app.quantize import FeatureQuantizer
+from services.model_serving.app.registry import ModelRegistry
+from services.model_serving.app.trees import TreeEnsemble
+from valora_common.cache import LRUTTLCache
+from valora_common.schemas.valuation import ValuationRequest
+
+ExplanationList = List[Dict[str, Any]]
+
+# Served while no model is registered for an asset class.
+PLACEHOLDER_EXPLANATIONS: ExplanationList = [
+    {"feature": "living_area_sqft", "direction": "+", "magnitude": 0.31},
+    {"feature": "year_built", "direction": "+", "magnitude": 0.12},
+]
+
+
+class AttributionEngine:
+    """Batch feature attributions with a cache keyed by model version and quantized row.
+
+    Rows are quantized first and attributions are computed for the quantized rows, so
+    every row that snaps to the same grid point gets the same, cached answer. Misses of
+    a batch are deduplicated and computed in one vectorized pass.
+    """
+
+    def __init__(
+        self,
+        quantizer: FeatureQuantizer,
+        cache: LRUTTLCache[Tuple[str, bytes], np.ndarray],
+    ) -> None:
+        self.quantizer = quantizer
+        self.cache = cache
+
+    def contributions(self, model: TreeEnsemble, matrix: np.ndarray) -> Tuple[float, np.ndarray]:
+        quantized = self.quantizer.quantize(matrix, model.feature_names)
+        keys = [(model.version, key) for key in self.quantizer.keys(quantized)]
+
+        def compute(indexes: List[int]) -> np.ndarray:
+            computed = model.contributions(quantized[indexes])[1]
+            computed.flags.writeable = False
+            return computed
+
+        rows = self.cache.get_or_compute_many(keys, compute)
+        bias = model.base_score + float(np.take(model.value, model.roots).sum())
+        return bias, np.stack(rows)
+
+
+class Explainer:
+    """Explains batches of requests with the registry's active model for each group."""
+
+    def __init__(
+        self, engine: AttributionEngine, registry: Optional[ModelRegistry] = None, *, top_k: int = 5
+    ) -> None:
+        self.engine = engine
+        self.registry = registry
+        self.top_k = top_k
+
+    def explain_batch(self, payloads: Sequence[ValuationRequest]) -> List[ExplanationList]:
+        results: List[ExplanationList] = [PLACEHOLDER_EXPLANATIONS for _ in payloads]
+        groups: Dict[Tuple[str, Optional[str]], List[int]] = defaultdict(list)
+        for index, payload in enumerate(payloads):
+            groups[(payload.class_, request_region(payload))].append(index)
+        for (asset_class, region), indexes in groups.items():
+            model = self.registry.get(asset_class, region) if self.registry is not None else None
+            if model is None:
+                continue
+            matrix = model.feature_matrix([payloads[index].attributes for index in indexes])
+            _, contributions = self.engine.contributions(model, matrix)
+            for index, row in zip(indexes, contributions):
+                results[index] = top_explanations(model.feature_names, row, self.top_k)
+        return results
+
+
+def top_explanations(
+    feature_names: Sequence[str], contributions: np.ndarray, top_k: int
+) -> ExplanationList:
+    """The ``top_k`` largest attributions; magnitude is each one's share of the total."""
+    total = float(np.abs(contributions).sum())
+    order = np.argsort(-np.abs(contributions), kind="stable")[:top_k]
+    explanations = []
+    for column in order.tolist():
+        value = float(contributions[column])
+        if value == 0:
+            break
+        explanations.append(
+            {
+                "feature": feature_names[column],
+                "direction": "+" if value > 0 else "-",
+                "magnitude": round(abs(value) / total, 4),
+                "contribution": round(value, 2),
+                "human_readable": f"{feature_names[column]} {'adds' if value > 0 else 'subtracts'} "
+                f"{abs(value):,.0f}",
+            }
+        )
+    return explanations
@@ -1,27 +1,168 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, AsyncIterator, Dict, Optional
 
+from fastapi import Depends, FastAPI, HTTPException
+from pydantic import BaseModel
+
+from services.model_serving.app.batching import MicroBatcher
+from services.model_serving.app.explain import AttributionEngine, Explainer, ExplanationList
+from services.model_serving.app.predictor import (
+    BaselinePredictor,
+    InvalidAttributesError,
+    Prediction,
+    PredictionCache,
+    UnsupportedAssetClassError,
+)
+from services.model_serving.app.quantize import FeatureQuantizer
+from services.model_serving.app.registry import ModelNotFoundError, ModelRegistry
+from services.model_serving.app.settings import get_settings
+from valora_common.cache import LRUTTLCache
 from valora_common.schemas.valuation import ValuationRequest
 
-app = FastAPI(title="VALORA Model Serving (Mock)")
+
+class ActivateModelRequest(BaseModel):
+    version: str
+
+
+async def poll_registry(registry: ModelRegistry, interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        registry.refresh()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    registry: Optional[ModelRegistry] = None
+    poller: Optional[asyncio.Task[None]] = None
+    if settings.model_registry_path:
+        registry = ModelRegistry(
+            settings.model_registry_path, max_resident=settings.model_registry_max_resident
+        )
+        poller = asyncio.create_task(poll_registry(registry, settings.model_registry_poll_seconds))
+    app.state.model_registry = registry
+    quantizer = FeatureQuantizer.from_spec(
+        settings.feature_quantization, significant_digits=settings.feature_significant_digits
+    )
+    prediction_cache: Optional[PredictionCache] = None
+    if settings.prediction_cache_max_entries > 0:
+        prediction_cache = PredictionCache(
+            quantizer,
+            LRUTTLCache(
+                max_entries=settings.prediction_cache_max_entries,
+                ttl_seconds=settings.prediction_cache_ttl_seconds,
+            ),
+        )
+    app.state.predictor = BaselinePredictor(registry=registry, cache=prediction_cache)
+    app.state.predict_batcher = MicroBatcher(
+        app.state.predictor.predict_batch,
+        max_batch_size=settings.predict_max_batch_size,
+        window_ms=settings.predict_batch_window_ms,
+    )
+    attributions = AttributionEngine(
+        quantizer,
+        LRUTTLCache(
+            max_entries=settings.explanation_cache_max_entries,
+            ttl_seconds=settings.explanation_cache_ttl_seconds,
+        ),
+    )
+    if registry is not None:
+        # Cached answers never outlive the model version that produced them.
+        if prediction_cache is not None:
+            registry.add_swap_listener(prediction_cache.invalidate)
+        registry.add_swap_listener(lambda *_swap: attributions.cache.invalidate())
+    app.state.explainer = Explainer(attributions, registry, top_k=settings.explanation_top_k)
+    app.state.explain_batcher = MicroBatcher(
+        app.state.explainer.explain_batch,
+        max_batch_size=settings.predict_max_batch_size,
+        window_ms=settings.predict_batch_window_ms,
+    )
+    await app.state.predict_batcher.start()
+    await app.state.explain_batcher.start()
+    yield
+    await app.state.explain_batcher.stop()
+    await app.state.predict_batcher.stop()
+    if poller is not None:
+        poller.cancel()
+
+
+app = FastAPI(title="VALORA Model Serving (Mock)", lifespan=lifespan)
+
+
+def get_predict_batcher() -> MicroBatcher[ValuationRequest, Prediction]:
+    return app.state.predict_batcher  # type: ignore[no-any-return]
+
+
+def get_explain_batcher() -> MicroBatcher[ValuationRequest, ExplanationList]:
+    return app.state.explain_batcher  # type: ignore[no-any-return]
+
+
+def get_model_registry() -> ModelRegistry:
+    registry: Optional[ModelRegistry] = app.state.model_registry
+    if registry is None:
+        raise HTTPException(status_code=404, detail="No model registry configured")
+    return registry
 
 
 @app.post("/predict")
-async def predict(payload: ValuationRequest) -> dict[str, float]:
-    if payload.class_ == "real_estate":
-        sqft = payload.attributes.get("living_area_sqft", 1600)
-        price = max(200000, sqft * 210)
-        return {"estimate": float(price), "confidence": 0.74}
-    if payload.class_ == "auto":
-        return {"estimate": 24000.0, "confidence": 0.65}
-    raise HTTPException(status_code=422, detail="Unsupported asset class")
+async def predict(
+    payload: ValuationRequest,
+    batcher: Annotated[MicroBatcher[ValuationRequest, Prediction], Depends(get_predict_batcher)],
+) -> dict[str, float]:
+    try:
+        return await batcher.submit(payload)
+    except UnsupportedAssetClassError as exc:
+        raise HTTPException(status_code=422, detail="Unsupported asset class") from exc
+    except InvalidAttributesError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@app.get("/predict/stats")
+async def predict_stats(
+    batcher: Annotated[MicroBatcher[ValuationRequest, Prediction], Depends(get_predict_batcher)],
+) -> Dict[str, Any]:
+    cache: Optional[PredictionCache] = app.state.predictor.cache
+    return {**batcher.stats(), "cache": cache.cache.stats() if cache is not None else None}
+
+
+@app.get("/models")
+async def list_models(
+    registry: Annotated[ModelRegistry, Depends(get_model_registry)],
+) -> Dict[str, Any]:
+    return registry.stats()
+
+
+@app.post("/models/{asset_class}/{region}/activate")
+async def activate_model(
+    asset_class: str,
+    region: str,
+    payload: ActivateModelRequest,
+    registry: Annotated[ModelRegistry, Depends(get_model_registry)],
+) -> Dict[str, Any]:
+    try:
+        registry.activate(asset_class, region, payload.version)
+    except ModelNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"asset_class": asset_class, "region": region, "active": payload.version}
 
 
 @app.post("/explain")
-async def explain(payload: ValuationRequest) -> dict[str, list[dict[str, float | str]]]:
-    explanations = [
-        {"feature": "living_area_sqft", "direction": "+", "magnitude": 0.31},
-        {"feature": "year_built", "direction": "+", "magnitude": 0.12},
-    ]
-    return {"explanations": explanations}
+async def explain(
+    payload: ValuationRequest,
+    batcher: Annotated[
+        MicroBatcher[ValuationRequest, ExplanationList], Depends(get_explain_batcher)
+    ],
+) -> Dict[str, ExplanationList]:
+    return {"explanations": await batcher.submit(payload)}
+
+
+@app.get("/explain/stats")
+async def explain_stats(
+    batcher: Annotated[
+        MicroBatcher[ValuationRequest, ExplanationList], Depends(get_explain_batcher)
+    ],
+) -> Dict[str, Any]:
+    return {**batcher.stats(), "cache": app.state.explainer.engine.cache.stats()}
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from services.model_serving.app.quantize import FeatureQuantizer
+from services.model_serving.app.registry import ModelRegistry
+from services.model_serving.app.trees import TreeEnsemble, as_float
+from valora_common.cache import LRUTTLCache
+from valora_common.schemas.valuation import ValuationRequest
+
+Prediction = Dict[str, float]
+
+
+class UnsupportedAssetClassError(ValueError):
+    pass
+
+
+class InvalidAttributesError(ValueError):
+    """A request's attributes cannot be priced, e.g. a non-numeric ``living_area_sqft``."""
+
+
+def request_region(payload: ValuationRequest) -> Optional[str]:
+    """Model region for a request: ``options.region``, else ``attributes.region``."""
+    region = payload.options.get("region") or payload.attributes.get("region")
+    return str(region).strip().lower() if region else None
+
+
+class PredictionCache:
+    """Model outputs cached by model version and quantized feature vector.
+
+    Requests that differ only by noise (1602 vs 1600 sqft) snap to the same grid point
+    and share one entry; the model scores the quantized row, so a hit and a miss for the
+    same point always agree. Misses of a batch are deduplicated and scored in one call.
+    """
+
+    def __init__(
+        self, quantizer: FeatureQuantizer, cache: LRUTTLCache[Tuple[str, bytes], float]
+    ) -> None:
+        self.quantizer = quantizer
+        self.cache = cache
+
+    def predict(self, model: TreeEnsemble, matrix: np.ndarray) -> np.ndarray:
+        quantized = self.quantizer.quantize(matrix, model.feature_names)
+        keys = [(model.version, key) for key in self.quantizer.keys(quantized)]
+        estimates = self.cache.get_or_compute_many(
+            keys, lambda indexes: model.predict(quantized[indexes]).tolist()
+        )
+        return np.asarray(estimates, dtype=np.float64)
+
+    def invalidate(self, *_swap: Optional[str]) -> None:
+        """Drops every entry; registered as a registry swap listener."""
+        self.cache.invalidate()
+
+
+class BaselinePredictor:
+    """Pricing model scored over whole batches of requests at once.
+
+    Requests are grouped by asset class and region and each group is scored in one call
+    to the registry's active model for it; classes without a model use the placeholder
+    formulas below. With a ``cache``, model scores go through :class:`PredictionCache`.
+    """
+
+    REAL_ESTATE_PRICE_SQFT = 210.0
+    REAL_ESTATE_FLOOR = 200000.0
+    REAL_ESTATE_CONFIDENCE = 0.74
+    AUTO_ESTIMATE = 24000.0
+    AUTO_CONFIDENCE = 0.65
+    CONFIDENCE = {"real_estate": REAL_ESTATE_CONFIDENCE, "auto": AUTO_CONFIDENCE}
+
+    def __init__(
+        self, registry: Optional[ModelRegistry] = None, *, cache: Optional[PredictionCache] = None
+    ) -> None:
+        self.registry = registry
+        self.cache = cache
+
+    def predict_batch(
+        self, payloads: Sequence[ValuationRequest]
+    ) -> List[Union[Prediction, ValueError]]:
+        """Returns one prediction per payload, or the error for payloads it cannot price.
+
+        A payload the model or formula cannot score (its estimate is not finite) gets an
+        :class:`InvalidAttributesError` of its own; the rest of its group is unaffected.
+        """
+        results: List[Union[Prediction, ValueError]] = [
+            UnsupportedAssetClassError(payload.class_) for payload in payloads
+        ]
+        groups: Dict[Tuple[str, Optional[str]], List[int]] = defaultdict(list)
+        for index, payload in enumerate(payloads):
+            if payload.class_ in self.CONFIDENCE:
+                groups[(payload.class_, request_region(payload))].append(index)
+        for (asset_class, region), indexes in groups.items():
+            attributes = [payloads[index].attributes for index in indexes]
+            estimates = self._estimates(asset_class, region, attributes)
+            confidence = self.CONFIDENCE[asset_class]
+            for index, estimate in zip(indexes, estimates.tolist()):
+                if np.isfinite(estimate):
+                    results[index] = {"estimate": estimate, "confidence": confidence}
+                else:
+                    results[index] = InvalidAttributesError(
+                        f"Cannot price {asset_class} request from its attributes"
+                    )
+        return results
+
+    def _estimates(
+        self, asset_class: str, region: Optional[str], attributes: Sequence[Dict[str, Any]]
+    ) -> np.ndarray:
+        # One lookup per group: a concurrent swap never splits a group across versions.
+        model = self.registry.get(asset_class, region) if self.registry is not None else None
+        if model is not None:
+            matrix = model.feature_matrix(attributes)
+            if self.cache is not None:
+                return self.cache.predict(model, matrix)
+            return model.predict(matrix)
+        if asset_class == "auto":
+            return np.full(len(attributes), self.AUTO_ESTIMATE)
+        # Coerced per row: a null or non-numeric size is NaN for that row alone.
+        sqft = np.fromiter(
+            (as_float(row.get("living_area_sqft", 1600)) for row in attributes),
+            dtype=np.float64,
+            count=len(attributes),
+        )
+        # np.maximum propagates NaN, so unpriceable rows stay non-finite.
+        return np.maximum(self.REAL_ESTATE_FLOOR, sqft * self.REAL_ESTATE_PRICE_SQFT)
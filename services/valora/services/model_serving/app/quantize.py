@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+
+class FeatureQuantizer:
+    """Snaps feature vectors to a grid so near-identical properties share cache entries.
+
+    Features listed in ``steps`` are rounded to a multiple of their step (e.g.
+    ``latitude=0.001``); every other feature keeps ``significant_digits`` significant
+    digits, so 1602 and 1600 sqft both become 1600. Missing values stay missing.
+    """
+
+    def __init__(
+        self, steps: Mapping[str, float] | None = None, *, significant_digits: int = 3
+    ) -> None:
+        self.steps: Dict[str, float] = dict(steps or {})
+        self.significant_digits = significant_digits
+
+    @classmethod
+    def from_spec(cls, spec: str, *, significant_digits: int = 3) -> "FeatureQuantizer":
+        """Parses ``"latitude=0.001,longitude=0.001"`` style settings."""
+        steps = {}
+        for item in spec.split(","):
+            name, sep, step = item.partition("=")
+            if sep and name.strip():
+                steps[name.strip()] = float(step)
+        return cls(steps, significant_digits=significant_digits)
+
+    def quantize(self, matrix: np.ndarray, feature_names: Sequence[str]) -> np.ndarray:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        magnitude = np.floor(np.log10(np.abs(np.where(matrix == 0, 1.0, matrix))))
+        scale = 10.0 ** (magnitude - self.significant_digits + 1)
+        for column, name in enumerate(feature_names):
+            if name in self.steps:
+                scale[:, column] = self.steps[name]
+        with np.errstate(invalid="ignore"):
+            return (np.round(matrix / scale) * scale).astype(np.float32)
+
+    @staticmethod
+    def keys(quantized: np.ndarray) -> List[bytes]:
+        return [row.tobytes() for row in np.ascontiguousarray(quantized, dtype=np.float32)]
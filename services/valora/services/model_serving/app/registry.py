@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from services.model_serving.app.trees import META_FILE, TreeEnsemble
+
+ACTIVE_FILE = "ACTIVE"
+DEFAULT_REGION = "default"
+
+ModelKey = Tuple[str, str]
+SwapListener = Callable[[str, str, Optional[str], Optional[str]], None]
+
+
+class ModelNotFoundError(LookupError):
+    pass
+
+
+class ModelRegistry:
+    """Versioned tree models per asset class and region, loaded on first use.
+
+    Artifacts live at ``root/<asset_class>/<region>/<version>/`` as written by
+    :meth:`TreeEnsemble.save`; an ``ACTIVE`` file next to the versions names the one to
+    serve (the highest version name when it is absent). Regions come from requests, so
+    only names that exist as directories under ``root/<asset_class>/`` are used; any
+    other region, or one without models, falls back to ``default``. Models are
+    memory-mapped, so start-up reads nothing and every worker shares the page cache; at
+    most ``max_resident`` stay mapped, least recently used first out. :meth:`activate`
+    swaps versions atomically: requests that already hold the old model finish on it,
+    later ones get the new one.
+    """
+
+    def __init__(self, root: str | Path, *, max_resident: int = 8) -> None:
+        self._root = Path(root)
+        self._max_resident = max(max_resident, 1)
+        self._lock = threading.Lock()
+        self._active: Dict[ModelKey, Optional[str]] = {}
+        self._regions: Dict[str, FrozenSet[str]] = {}
+        self._resident: "OrderedDict[Tuple[str, str, str], TreeEnsemble]" = OrderedDict()
+        self._listeners: List[SwapListener] = []
+        self._loads = 0
+        self._evictions = 0
+        self._swaps = 0
+
+    def get(self, asset_class: str, region: Optional[str] = None) -> Optional[TreeEnsemble]:
+        """The active model for ``asset_class`` in ``region``, or None when there is none."""
+        for candidate in dict.fromkeys((self._region(asset_class, region), DEFAULT_REGION)):
+            version = self._active_version(asset_class, candidate)
+            if version is not None:
+                return self._resident_model(asset_class, candidate, version)
+        return None
+
+    def versions(self, asset_class: str, region: str = DEFAULT_REGION) -> List[str]:
+        if not (_is_name(asset_class) and _is_name(region)):
+            return []
+        directory = self._root / asset_class / region
+        if not directory.is_dir():
+            return []
+        return sorted(path.name for path in directory.iterdir() if (path / META_FILE).is_file())
+
+    def activate(self, asset_class: str, region: str, version: str) -> None:
+        """Makes ``version`` the served model, for this process and, via ``ACTIVE``, the rest."""
+        if version not in self.versions(asset_class, region):
+            raise ModelNotFoundError(f"No model {asset_class}/{region}/{version}")
+        directory = self._root / asset_class / region
+        pending = directory / f".{ACTIVE_FILE}.{os.getpid()}"
+        pending.write_text(version, encoding="utf-8")
+        os.replace(pending, directory / ACTIVE_FILE)
+        self._set_active(asset_class, region, version)
+
+    def refresh(self) -> None:
+        """Re-reads regions and active versions, picking up other workers' swaps and new regions."""
+        with self._lock:
+            asset_classes = list(self._regions)
+        for asset_class in asset_classes:
+            regions = self._list_regions(asset_class)
+            with self._lock:
+                self._regions[asset_class] = regions
+        with self._lock:
+            keys = list(self._active)
+        for asset_class, region in keys:
+            self._set_active(asset_class, region, self._read_active(asset_class, region))
+
+    def add_swap_listener(self, listener: SwapListener) -> None:
+        """Calls ``listener(asset_class, region, old_version, new_version)`` after each swap."""
+        self._listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": {
+                    f"{cls}/{region}": version for (cls, region), version in self._active.items()
+                },
+                "resident": [
+                    f"{cls}/{region}/{version}" for cls, region, version in self._resident
+                ],
+                "max_resident": self._max_resident,
+                "loads": self._loads,
+                "evictions": self._evictions,
+                "swaps": self._swaps,
+            }
+
+    def _region(self, asset_class: str, region: Optional[str]) -> str:
+        """``region`` when it is a directory under ``asset_class``, else ``default``."""
+        if not region or not _is_name(region):
+            return DEFAULT_REGION
+        with self._lock:
+            regions = self._regions.get(asset_class)
+        if regions is None:
+            regions = self._list_regions(asset_class)
+            with self._lock:
+                regions = self._regions.setdefault(asset_class, regions)
+        return region if region in regions else DEFAULT_REGION
+
+    def _list_regions(self, asset_class: str) -> FrozenSet[str]:
+        if not _is_name(asset_class):
+            return frozenset()
+        try:
+            paths = (self._root / asset_class).iterdir()
+            return frozenset(path.name for path in paths if path.is_dir())
+        except (FileNotFoundError, NotADirectoryError):
+            return frozenset()
+
+    def _active_version(self, asset_class: str, region: str) -> Optional[str]:
+        key = (asset_class, region)
+        with self._lock:
+            if key in self._active:
+                return self._active[key]
+        version = self._read_active(asset_class, region)
+        with self._lock:
+            return self._active.setdefault(key, version)
+
+    def _read_active(self, asset_class: str, region: str) -> Optional[str]:
+        pointer = self._root / asset_class / region / ACTIVE_FILE
+        try:
+            return pointer.read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            versions = self.versions(asset_class, region)
+            return versions[-1] if versions else None
+
+    def _set_active(self, asset_class: str, region: str, version: Optional[str]) -> None:
+        with self._lock:
+            previous = self._active.get((asset_class, region))
+            self._active[(asset_class, region)] = version
+            if previous == version:
+                return
+            self._swaps += 1
+        for listener in self._listeners:
+            listener(asset_class, region, previous, version)
+
+    def _resident_model(self, asset_class: str, region: str, version: str) -> TreeEnsemble:
+        key = (asset_class, region, version)
+        with self._lock:
+            model = self._resident.get(key)
+            if model is not None:
+                self._resident.move_to_end(key)
+                return model
+        # Mapping only reads headers; concurrent first uses may both map, one copy wins.
+        model = replace(
+            TreeEnsemble.load(self._root / asset_class / region / version, mmap=True),
+            version=f"{asset_class}/{region}/{version}",
+        )
+        with self._lock:
+            model = self._resident.setdefault(key, model)
+            self._resident.move_to_end(key)
+            self._loads += 1
+            while len(self._resident) > self._max_resident:
+                self._resident.popitem(last=False)
+                self._evictions += 1
+        return model
+
+
+def _is_name(segment: str) -> bool:
+    """Whether ``segment`` is a single path component, never a way out of the registry."""
+    if not segment or segment == ".":
+        return False
+    return not any(part in segment for part in ("..", "/", "\\"))
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+
+class Settings:
+    def __init__(self) -> None:
+        self.environment = os.getenv("ENVIRONMENT", "local")
+        # How long the first /predict or /explain call in a batch waits for company, and
+        # the cap on rows per vectorized call. A window of 0 batches whatever queued up
+        # while the previous batch ran; a size of 1 turns micro-batching off.
+        self.predict_batch_window_ms = float(os.getenv("PREDICT_BATCH_WINDOW_MS", "0"))
+        self.predict_max_batch_size = int(os.getenv("PREDICT_MAX_BATCH_SIZE", "256"))
+        # Root of <asset_class>/<region>/<version>/ model artifacts; empty serves the
+        # placeholder formulas only.
+        self.model_registry_path = os.getenv("MODEL_REGISTRY_PATH", "")
+        self.model_registry_max_resident = int(os.getenv("MODEL_REGISTRY_MAX_RESIDENT", "8"))
+        # How often each worker re-reads ACTIVE files to pick up swaps made elsewhere.
+        self.model_registry_poll_seconds = float(os.getenv("MODEL_REGISTRY_POLL_SECONDS", "5"))
+        # Grid shared by the prediction and explanation caches: "feature=step" pairs, every
+        # other feature keeps N significant digits.
+        self.feature_quantization = os.getenv(
+            "FEATURE_QUANTIZATION", "latitude=0.001,longitude=0.001,year_built=1"
+        )
+        self.feature_significant_digits = int(os.getenv("FEATURE_SIGNIFICANT_DIGITS", "3"))
+        # 0 entries scores every request with the model directly.
+        self.prediction_cache_max_entries = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "100000"))
+        self.prediction_cache_ttl_seconds = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "600"))
+        self.explanation_cache_max_entries = int(
+            os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", "50000")
+        )
+        self.explanation_cache_ttl_seconds = float(
+            os.getenv("EXPLANATION_CACHE_TTL_SECONDS", "3600")
+        )
+        self.explanation_top_k = int(os.getenv("EXPLANATION_TOP_K", "5"))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+ARRAY_FIELDS = ("feature", "threshold", "left", "missing_left", "value", "roots")
+META_FILE = "model.json"
+
+# Traversal state is a (trees x rows) matrix; this many cells keeps it cache resident.
+_CHUNK_CELLS = 256 * 1024
+
+
+@dataclass(frozen=True)
+class TreeEnsemble:
+    """A regression tree ensemble flattened into contiguous node arrays.
+
+    Every tree lives in the same arrays; ``roots`` holds the index of each tree's first
+    node. Siblings are stored next to each other, so internal node ``i`` sends a row to
+    ``left[i]`` when its ``feature[i]`` value is ``<= threshold[i]`` and to
+    ``left[i] + 1`` (``right``) otherwise; missing values follow ``missing_left[i]``.
+    Leaves point at themselves and always go left, so traversal runs a fixed
+    ``max_depth`` steps with no per-row branching. ``value`` holds every node's output,
+    already scaled by the learning rate or averaging weight; a prediction is
+    ``base_score`` plus the leaf values. Inputs are compared in float32, as in
+    scikit-learn, XGBoost and LightGBM, against float32 thresholds rounded down so the
+    decisions are exact.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    missing_left: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    base_score: float
+    max_depth: int
+    feature_names: Tuple[str, ...]
+    version: str = "unversioned"
+
+    @property
+    def right(self) -> np.ndarray:
+        return self.left + 1
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        """Scores a ``(n_rows, n_features)`` matrix; columns follow ``feature_names``."""
+        out = np.empty(len(rows), dtype=np.float64)
+        for start, leaves in self._leaf_chunks(rows):
+            out[start : start + leaves.shape[1]] = np.take(self.value, leaves).sum(axis=0)
+        return out + self.base_score
+
+    def apply(self, rows: np.ndarray) -> np.ndarray:
+        """Leaf index reached by each row in each tree, shape ``(n_rows, n_trees)``."""
+        out = np.empty((len(rows), self.n_trees), dtype=np.int32)
+        for start, leaves in self._leaf_chunks(rows):
+            out[start : start + leaves.shape[1]] = leaves.T
+        return out
+
+    def contributions(self, rows: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Per-feature attributions for every row, computed in one pass over the batch.
+
+        Uses path attribution (Saabas): each split a row passes through credits its
+        feature with the change in node value it causes. Returns ``(bias, contributions)``
+        where ``bias`` is the expected prediction before any split and ``contributions``
+        has shape ``(n_rows, n_features)``; ``bias + contributions.sum(axis=1)`` equals
+        :meth:`predict`.
+        """
+        n_features = len(self.feature_names)
+        out = np.empty((len(rows), n_features), dtype=np.float64)
+        for start, chunk in self._row_chunks(rows):
+            count = len(chunk)
+            feature_slot = np.arange(count, dtype=np.int64) * n_features
+            totals = np.zeros(count * n_features, dtype=np.float64)
+            for nodes, following in self._walk(chunk):
+                delta = np.take(self.value, following) - np.take(self.value, nodes)
+                slots = np.take(self.feature, nodes) + feature_slot
+                totals += np.bincount(slots.ravel(), weights=delta.ravel(), minlength=len(totals))
+            out[start : start + count] = totals.reshape(count, n_features)
+        bias = self.base_score + float(np.take(self.value, self.roots).sum())
+        return bias, out
+
+    def _leaf_chunks(self, rows: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        for start, chunk in self._row_chunks(rows):
+            nodes = np.repeat(self.roots[:, None], len(chunk), axis=1)
+            for _, nodes in self._walk(chunk):
+                pass
+            yield start, nodes
+
+    def _row_chunks(self, rows: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        rows = np.asarray(rows, dtype=np.float32)
+        if rows.ndim != 2 or rows.shape[1] != len(self.feature_names):
+            raise ValueError(
+                f"Expected rows of {len(self.feature_names)} features, got {rows.shape}"
+            )
+        chunk = max(64, _CHUNK_CELLS // max(self.n_trees, 1))
+        for start in range(0, len(rows), chunk):
+            yield start, rows[start : start + chunk]
+
+    def _walk(self, rows: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yields ``(nodes, next_nodes)``, each ``(n_trees, n_rows)``, once per level."""
+        count = len(rows)
+        # Feature-major copy: node i of a tree reads column feature[i] at row r.
+        columns = np.ascontiguousarray(rows.T).ravel()
+        column_start = self.feature * np.int32(count)
+        row_offset = np.arange(count, dtype=np.int32)
+        missing = bool(np.isnan(columns).any())
+        nodes = np.repeat(self.roots[:, None], count, axis=1)
+        for _ in range(self.max_depth):
+            values = np.take(columns, np.take(column_start, nodes) + row_offset)
+            go_right = values > np.take(self.threshold, nodes)
+            if missing:
+                go_right |= np.isnan(values) & ~np.take(self.missing_left, nodes)
+            following = np.take(self.left, nodes) + go_right
+            yield nodes, following
+            nodes = following
+
+    def feature_matrix(self, records: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Builds model input from attribute dicts; absent or null attributes are missing."""
+        matrix = np.full((len(records), len(self.feature_names)), np.nan, dtype=np.float32)
+        for column, name in enumerate(self.feature_names):
+            matrix[:, column] = [as_float(record.get(name)) for record in records]
+        return matrix
+
+    def save(self, directory: str | Path) -> Path:
+        """Writes one ``.npy`` per node array plus ``model.json``, ready to memory-map."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_FIELDS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        meta = {
+            "base_score": self.base_score,
+            "max_depth": self.max_depth,
+            "feature_names": list(self.feature_names),
+            "version": self.version,
+        }
+        (directory / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path, *, mmap: bool = False) -> "TreeEnsemble":
+        directory = Path(directory)
+        meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+        mode = "r" if mmap else None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in ARRAY_FIELDS}
+        return cls(
+            **arrays,
+            base_score=float(meta["base_score"]),
+            max_depth=int(meta["max_depth"]),
+            feature_names=tuple(meta["feature_names"]),
+            version=str(meta.get("version", "unversioned")),
+        )
+
+    @classmethod
+    def from_sklearn(
+        cls, model: Any, feature_names: Sequence[str], *, version: str = "unversioned"
+    ) -> "TreeEnsemble":
+        """Flattens a fitted scikit-learn tree regressor without importing scikit-learn.
+
+        Supports ``GradientBoostingRegressor`` (squared-error or zero init) and forest
+        regressors such as ``RandomForestRegressor`` and ``ExtraTreesRegressor``.
+        """
+        if hasattr(model, "learning_rate"):
+            trees = [estimator.tree_ for estimator in np.ravel(model.estimators_)]
+            scale = float(model.learning_rate)
+            if isinstance(model.init_, str):
+                base_score = 0.0
+            else:
+                prior = model.init_.predict(np.zeros((1, len(feature_names))))
+                base_score = float(np.ravel(prior)[0])
+        else:
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            scale = 1.0 / len(trees)
+            base_score = 0.0
+        return cls.from_arrays(
+            [
+                (
+                    tree.feature,
+                    tree.threshold,
+                    tree.children_left,
+                    tree.children_right,
+                    getattr(tree, "missing_go_to_left", None),
+                    tree.value.reshape(tree.node_count, -1)[:, 0] * scale,
+                )
+                for tree in trees
+            ],
+            base_score=base_score,
+            feature_names=feature_names,
+            version=version,
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        trees: Sequence[
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray], np.ndarray]
+        ],
+        *,
+        base_score: float,
+        feature_names: Sequence[str],
+        version: str = "unversioned",
+    ) -> "TreeEnsemble":
+        """Flattens per-tree ``(feature, threshold, left, right, missing_left, value)``.
+
+        Child indexes are local to each tree and leaves use ``-1`` children, as in
+        scikit-learn's ``tree_`` arrays; ``missing_left`` may be None (missing goes right).
+        Nodes are renumbered breadth first so that siblings are adjacent.
+        """
+        features: List[int] = []
+        thresholds: List[float] = []
+        lefts: List[int] = []
+        missing: List[bool] = []
+        values: List[float] = []
+        roots: List[int] = []
+        max_depth = 0
+        for feature, threshold, left, right, missing_left, value in trees:
+            base = len(features)
+            roots.append(base)
+            order = [(0, 0)]
+            position = 0
+            while position < len(order):
+                node, depth = order[position]
+                position += 1
+                max_depth = max(max_depth, depth)
+                if left[node] < 0:
+                    features.append(0)
+                    thresholds.append(np.inf)
+                    lefts.append(base + position - 1)
+                    missing.append(True)
+                else:
+                    features.append(int(feature[node]))
+                    thresholds.append(float(threshold[node]))
+                    lefts.append(base + len(order))
+                    missing.append(bool(missing_left[node]) if missing_left is not None else False)
+                    order.append((int(left[node]), depth + 1))
+                    order.append((int(right[node]), depth + 1))
+                values.append(float(value[node]))
+        return cls(
+            feature=np.asarray(features, dtype=np.int32),
+            threshold=_round_down_to_float32(np.asarray(thresholds, dtype=np.float64)),
+            left=np.asarray(lefts, dtype=np.int32),
+            missing_left=np.asarray(missing, dtype=bool),
+            value=np.asarray(values, dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            base_score=float(base_score),
+            max_depth=max_depth,
+            feature_names=tuple(feature_names),
+            version=version,
+        )
+
+
+def _round_down_to_float32(thresholds: np.ndarray) -> np.ndarray:
+    # For float32 x, x <= t exactly when x <= the largest float32 not above t.
+    rounded = thresholds.astype(np.float32)
+    above = rounded.astype(np.float64) > thresholds
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def as_float(value: Any) -> float:
+    if value is None or isinstance(value, bool):
+        return float("nan")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from valora_common.schemas.valuation import Comparable, Explanation, ValuationRequest
+
+
+class DownstreamClients:
+    """Async clients for the services a valuation draws on.
+
+    A service whose base URL is empty has no client; its stage then runs the local
+    fallback directly instead of making a request.
+    """
+
+    def __init__(
+        self,
+        *,
+        comparable_engine_url: str = "",
+        model_serving_url: str = "",
+        data_feeds_url: str = "",
+        timeout_seconds: float = 5.0,
+    ) -> None:
+        self.comparable_engine = _client(comparable_engine_url, timeout_seconds)
+        self.model_serving = _client(model_serving_url, timeout_seconds)
+        self.data_feeds = _client(data_feeds_url, timeout_seconds)
+
+    async def search_comps(self, payload: ValuationRequest) -> List[Comparable]:
+        assert self.comparable_engine is not None
+        params: Dict[str, Any] = {"class_": payload.class_}
+        for name in (
+            "latitude",
+            "longitude",
+            "living_area_sqft",
+            "bedrooms",
+            "bathrooms",
+            "year_built",
+        ):
+            if payload.attributes.get(name) is not None:
+                params[name] = payload.attributes[name]
+        response = await self.comparable_engine.get("/comps", params=params)
+        response.raise_for_status()
+        return [Comparable.model_validate(item) for item in response.json()["results"]]
+
+    async def predict(self, payload: ValuationRequest) -> Dict[str, float]:
+        assert self.model_serving is not None
+        response = await self.model_serving.post("/predict", json=payload.model_dump(by_alias=True))
+        response.raise_for_status()
+        body = response.json()
+        return {"estimate": float(body["estimate"]), "confidence": float(body["confidence"])}
+
+    async def explain(self, payload: ValuationRequest) -> List[Explanation]:
+        assert self.model_serving is not None
+        response = await self.model_serving.post("/explain", json=payload.model_dump(by_alias=True))
+        response.raise_for_status()
+        return [Explanation.model_validate(item) for item in response.json()["explanations"]]
+
+    async def interest_rates(self) -> Dict[str, Any]:
+        assert self.data_feeds is not None
+        response = await self.data_feeds.get("/feeds/interest-rates")
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        for client in (self.comparable_engine, self.model_serving, self.data_feeds):
+            if client is not None:
+                await client.aclose()
+
+
+def _client(base_url: str, timeout_seconds: float) -> Optional[httpx.AsyncClient]:
+    if not base_url:
+        return None
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=httpx.Timeout(timeout_seconds),
+        headers={"User-Agent": "valora-orchestrator/0.1.0"},
+    )
@@ -1,20 +1,75 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 
-from services.valuation_orchestrator.app.routes import jobs, uploads, valuations
+from services.valuation_orchestrator.app.clients import DownstreamClients
+from services.valuation_orchestrator.app.routes import jobs, uploads, valuations, workers
 from services.valuation_orchestrator.app.service import ValuationService
-from services.valuation_orchestrator.app.storage.jobs import InMemoryJobStore
+from services.valuation_orchestrator.app.settings import get_settings
+from services.valuation_orchestrator.app.storage.jobs import JobStore, create_job_store
+from services.valuation_orchestrator.app.workers import JobWorkerPool
+
+
+STALE_JOB_ERROR = "Job was interrupted before it finished; resubmit it"
+
+
+async def fail_stale_jobs(job_store: JobStore, stale_seconds: float) -> int:
+    """Fails jobs left queued or running by a worker that restarted or crashed."""
+    older_than = datetime.utcnow() - timedelta(seconds=stale_seconds)
+    return await run_in_threadpool(job_store.fail_stale, older_than, STALE_JOB_ERROR)
+
+
+async def sweep_jobs(
+    job_store: JobStore, interval_seconds: float, stale_seconds: float
+) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await fail_stale_jobs(job_store, stale_seconds)
+        await run_in_threadpool(job_store.purge_expired)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    app.state.valuation_service = ValuationService()
-    app.state.job_store = InMemoryJobStore()
+    settings = get_settings()
+    app.state.downstream_clients = DownstreamClients(
+        comparable_engine_url=settings.comparable_engine_url,
+        model_serving_url=settings.model_serving_url,
+        data_feeds_url=settings.data_feeds_url,
+        timeout_seconds=settings.downstream_timeout_seconds,
+    )
+    app.state.valuation_service = ValuationService(app.state.downstream_clients)
+    app.state.job_store = create_job_store(
+        settings.job_store_backend,
+        path=settings.job_store_path,
+        ttl_seconds=settings.job_ttl_seconds,
+    )
+    # Jobs a previous process left queued or running would otherwise be polled forever.
+    await fail_stale_jobs(app.state.job_store, settings.job_stale_seconds)
+    app.state.job_workers = JobWorkerPool(
+        app.state.job_store,
+        processes=settings.worker_processes,
+        concurrency=settings.worker_concurrency,
+        queue_depth=settings.job_queue_depth,
+        chunk_size=settings.job_chunk_size,
+        job_timeout_seconds=settings.job_timeout_seconds,
+    )
+    await app.state.job_workers.start()
+    purger = asyncio.create_task(
+        sweep_jobs(
+            app.state.job_store, settings.job_purge_interval_seconds, settings.job_stale_seconds
+        )
+    )
     yield
+    purger.cancel()
+    await app.state.job_workers.stop()
+    app.state.job_store.close()
+    await app.state.downstream_clients.close()
 
 
 app = FastAPI(title="VALORA Valuation Orchestrator", lifespan=lifespan)
@@ -22,3 +77,4 @@ app = FastAPI(title="VALORA Valuation Orchestrator", lifespan=lifespan)
 app.include_router(valuations.router)
 app.include_router(jobs.router)
 app.include_router(uploads.router)
+app.include_router(workers.router)
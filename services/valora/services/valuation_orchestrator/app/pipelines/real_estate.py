@@ -1,59 +1,292 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Any
+import hashlib
+import json
+import math
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from services.valuation_orchestrator.app.clients import DownstreamClients
+from services.valuation_orchestrator.app.stages import Stage, StageContext, StageGraph
+from services.valuation_orchestrator.app.storage.result_cache import (
+    SQLiteValuationCache,
+    ValuationCache,
+)
+from valora_common.cache import LRUTTLCache
 from valora_common.schemas.valuation import Comparable, Explanation, ValuationRequest, ValuationResponse
 
 
+class InvalidAttributeError(ValueError):
+    """An attribute the pricing formula needs is present but not a finite number."""
+
+    def __init__(self, index: Optional[int], attribute: str) -> None:
+        prefix = "" if index is None else f"Item {index}: "
+        super().__init__(f"{prefix}{attribute} must be a number")
+        self.index = index
+        self.attribute = attribute
+
+
 class RealEstatePipeline:
     """Placeholder real estate valuation pipeline for early development and testing."""
 
-    def __init__(self, *, cache_ttl_minutes: int = 15) -> None:
-        self._cache_ttl = timedelta(minutes=cache_ttl_minutes)
-        self._cache: dict[str, tuple[datetime, ValuationResponse]] = {}
+    BASE_PRICE_SQFT = 225.0
+    BEDROOM_ADJUSTMENT = 12000
+    BATHROOM_ADJUSTMENT = 9000
+    PRICE_FLOOR = 100000
+    CONFIDENCE = 0.75
+    INTERVAL_SPREAD = 0.05
+    METHOD = "baseline_gbr_v0"
+    # Attributions are measured against this home; sqft is snapped to this grid first.
+    REFERENCE_HOME = {"living_area_sqft": 1600, "bedrooms": 3, "bathrooms": 2}
+    EXPLANATION_SQFT_STEP = 10
+
+    def __init__(
+        self,
+        *,
+        cache_ttl_minutes: int = 15,
+        cache_max_entries: int = 10000,
+        cache: Optional[ValuationCache] = None,
+    ) -> None:
+        if cache is None:
+            cache = LRUTTLCache(max_entries=cache_max_entries, ttl_seconds=cache_ttl_minutes * 60)
+        self._cache: ValuationCache = cache
+        # SQLite reads and writes can wait on another worker's lock; the in-memory cache
+        # is a dict lookup, cheaper than the threadpool hop.
+        self._cache_blocks = isinstance(cache, SQLiteValuationCache)
+        self._explanations: LRUTTLCache[Tuple[float, ...], list[Explanation]] = LRUTTLCache(
+            max_entries=cache_max_entries, ttl_seconds=cache_ttl_minutes * 60
+        )
 
     def valuate(self, payload: ValuationRequest) -> ValuationResponse:
+        """Values one request.
+
+        Missing or null attributes take the baseline defaults; any other non-numeric value
+        raises :class:`InvalidAttributeError`, as in :meth:`valuate_batch`.
+        """
+        self._validate(payload.attributes)
         cache_key = self._cache_key(payload)
         cached = self._cache.get(cache_key)
-        if cached and datetime.utcnow() - cached[0] < self._cache_ttl:
-            return cached[1]
+        if cached is not None:
+            return cached.model_copy(update={"metadata": {**cached.metadata, "cache_hit": True}})
 
         estimate = self._baseline_estimate(payload.attributes)
         response = ValuationResponse(
             valuation_id=f"val_{datetime.utcnow().timestamp():.0f}",
             estimate=estimate,
-            confidence=0.75,
-            interval_low=estimate * 0.95,
-            interval_high=estimate * 1.05,
-            method="baseline_gbr_v0",
-            explanations=self._mock_explanations(payload.attributes),
+            confidence=self.CONFIDENCE,
+            interval_low=estimate * (1 - self.INTERVAL_SPREAD),
+            interval_high=estimate * (1 + self.INTERVAL_SPREAD),
+            method=self.METHOD,
+            explanations=self._explain(payload.attributes),
             comps=self._mock_comps(payload.attributes),
             metadata={"cache_hit": False},
         )
-        self._cache[cache_key] = (datetime.utcnow(), response)
+        self._cache.set(cache_key, response)
         return response
 
-    def _baseline_estimate(self, attributes: dict[str, Any]) -> float:
-        sqft = attributes.get("living_area_sqft", 1600)
-        beds = attributes.get("bedrooms", 3)
-        baths = attributes.get("bathrooms", 2)
-        base_price_sqft = 225.0
-        adjustment = (beds - 3) * 12000 + (baths - 2) * 9000
-        return max(sqft * base_price_sqft + adjustment, 100000)
-
-    def _mock_explanations(self, attributes: dict[str, Any]) -> list[Explanation]:
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def stage_graph(self, clients: DownstreamClients, timeouts: Mapping[str, float]) -> StageGraph:
+        """Comps, prediction, explanations and market data, fetched concurrently.
+
+        Each stage calls its service when ``clients`` has one and falls back to the local
+        placeholder (synthetic comps, baseline estimate and attributions, no market
+        data) when it is not configured, errors or overruns its entry in ``timeouts``.
+        A comps search that finds nothing counts as an error.
+        """
+
+        def stage(
+            name: str,
+            remote: Optional[Callable[[ValuationRequest], Awaitable[Any]]],
+            fallback: Callable[[dict[str, Any]], Any],
+        ) -> Stage:
+            def local(context: StageContext) -> Any:
+                return fallback(context["payload"].attributes)
+
+            async def run(context: StageContext) -> Any:
+                if remote is None:
+                    return local(context)
+                return await remote(context["payload"])
+
+            return Stage(name=name, run=run, timeout_seconds=timeouts.get(name), fallback=local)
+
+        async def search_comps(payload: ValuationRequest) -> list[Comparable]:
+            found = await clients.search_comps(payload)
+            if not found:
+                # No comps is no more useful than a failed search; fall back to synthetic ones.
+                raise LookupError("comparable engine returned no comps")
+            return found
+
+        async def interest_rates(payload: ValuationRequest) -> Dict[str, Any]:
+            # Market data is the same for every request; the payload is not needed.
+            return await clients.interest_rates()
+
+        comps = search_comps if clients.comparable_engine else None
+        predict = self._remote_prediction(clients) if clients.model_serving else None
+        explain = clients.explain if clients.model_serving else None
+        market = interest_rates if clients.data_feeds else None
+        return StageGraph(
+            [
+                stage("comps", comps, self._mock_comps),
+                stage("predict", predict, self._baseline_prediction),
+                stage("explain", explain, self._explain),
+                stage("market", market, lambda attributes: None),
+            ]
+        )
+
+    async def valuate_staged(
+        self, payload: ValuationRequest, graph: StageGraph
+    ) -> ValuationResponse:
+        """Like :meth:`valuate`, but assembled from the stages of ``graph``.
+
+        Per-stage status and latency land in ``metadata["stages"]``. Responses that needed
+        a fallback are degraded, so they are returned but not cached.
+        """
+        self._validate(payload.attributes)
+        cache_key = self._cache_key(payload)
+        cached = await self._cache_call(self._cache.get, cache_key)
+        if cached is not None:
+            return cached.model_copy(update={"metadata": {**cached.metadata, "cache_hit": True}})
+
+        result = await graph.run({"payload": payload})
+        prediction = result.outputs["predict"]
+        estimate = prediction["estimate"]
+        metadata: Dict[str, Any] = {"cache_hit": False, **result.metadata()}
+        if result.outputs["market"] is not None:
+            metadata["market"] = result.outputs["market"]
+        response = ValuationResponse(
+            valuation_id=f"val_{datetime.utcnow().timestamp():.0f}",
+            estimate=estimate,
+            confidence=prediction["confidence"],
+            interval_low=estimate * (1 - self.INTERVAL_SPREAD),
+            interval_high=estimate * (1 + self.INTERVAL_SPREAD),
+            method=prediction["method"],
+            explanations=result.outputs["explain"],
+            comps=result.outputs["comps"],
+            metadata=metadata,
+        )
+        if not any(timing.fallback for timing in result.timings.values()):
+            await self._cache_call(self._cache.set, cache_key, response)
+        return response
+
+    def valuate_batch(self, payloads: Sequence[ValuationRequest]) -> list[ValuationResponse]:
+        """Values a whole portfolio in one vectorized pass.
+
+        Estimates, intervals and confidence are computed over NumPy arrays; only the
+        response objects are assembled per row. Batches bypass the result cache since
+        portfolio revaluations always want fresh numbers. Missing or null attributes take
+        the baseline defaults; any other non-numeric value raises
+        :class:`InvalidAttributeError` naming the item before anything is computed.
+        """
+        if not payloads:
+            return []
+        attributes = [payload.attributes for payload in payloads]
+        estimates = self._baseline_estimates(attributes)
+        lows = estimates * (1 - self.INTERVAL_SPREAD)
+        highs = estimates * (1 + self.INTERVAL_SPREAD)
+        confidences = np.full(len(attributes), self.CONFIDENCE)
+
+        stamp = f"{datetime.utcnow().timestamp():.0f}"
+        explanations = self._batch_explanations(attributes)
         return [
-            Explanation(feature="living_area_sqft", direction="+", magnitude=0.31),
-            Explanation(feature="year_built", direction="+", magnitude=0.12),
-            Explanation(
-                feature="condition_score",
-                direction="+",
-                magnitude=0.07,
-                human_readable="Above-average property condition adds value",
-            ),
+            ValuationResponse(
+                valuation_id=f"val_{stamp}_{index}",
+                estimate=estimate,
+                confidence=confidence,
+                interval_low=low,
+                interval_high=high,
+                method=self.METHOD,
+                explanations=row_explanations,
+                comps=self._mock_comps(row),
+                metadata={"cache_hit": False, "batch": True},
+            )
+            for index, (row, estimate, low, high, confidence, row_explanations) in enumerate(
+                zip(
+                    attributes,
+                    estimates.tolist(),
+                    lows.tolist(),
+                    highs.tolist(),
+                    confidences.tolist(),
+                    explanations,
+                )
+            )
         ]
 
+    async def _cache_call(self, method: Callable[..., Any], *args: Any) -> Any:
+        if self._cache_blocks:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    def _baseline_prediction(self, attributes: dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "estimate": self._baseline_estimate(attributes),
+            "confidence": self.CONFIDENCE,
+            "method": self.METHOD,
+        }
+
+    @staticmethod
+    def _remote_prediction(
+        clients: DownstreamClients,
+    ) -> Callable[[ValuationRequest], Awaitable[Dict[str, Any]]]:
+        async def predict(payload: ValuationRequest) -> Dict[str, Any]:
+            return {**await clients.predict(payload), "method": "model_serving"}
+
+        return predict
+
+    def _validate(self, attributes: dict[str, Any]) -> None:
+        for key, default in self.REFERENCE_HOME.items():
+            _value(attributes, key, default)
+
+    def _baseline_estimate(self, attributes: dict[str, Any]) -> float:
+        sqft = _value(attributes, "living_area_sqft", 1600)
+        beds = _value(attributes, "bedrooms", 3)
+        baths = _value(attributes, "bathrooms", 2)
+        adjustment = (beds - 3) * self.BEDROOM_ADJUSTMENT + (baths - 2) * self.BATHROOM_ADJUSTMENT
+        return max(sqft * self.BASE_PRICE_SQFT + adjustment, self.PRICE_FLOOR)
+
+    def _baseline_estimates(self, attributes: Sequence[dict[str, Any]]) -> np.ndarray:
+        sqft = _column(attributes, "living_area_sqft", 1600)
+        beds = _column(attributes, "bedrooms", 3)
+        baths = _column(attributes, "bathrooms", 2)
+        adjustment = (beds - 3) * self.BEDROOM_ADJUSTMENT + (baths - 2) * self.BATHROOM_ADJUSTMENT
+        return np.maximum(sqft * self.BASE_PRICE_SQFT + adjustment, self.PRICE_FLOOR)
+
+    def _explain(self, attributes: dict[str, Any]) -> list[Explanation]:
+        return self._batch_explanations([attributes])[0]
+
+    def _batch_explanations(self, attributes: Sequence[dict[str, Any]]) -> list[list[Explanation]]:
+        """Exact attributions of the baseline formula, computed for the whole batch at once.
+
+        Each feature is credited with its price adjustment relative to
+        ``REFERENCE_HOME``. Results are cached per method and snapped feature vector, so
+        repeated or near-identical homes reuse them.
+        """
+        step = self.EXPLANATION_SQFT_STEP
+        reference = self.REFERENCE_HOME
+        living_area = _column(attributes, "living_area_sqft", reference["living_area_sqft"])
+        features = np.column_stack(
+            [
+                np.round(living_area / step) * step,
+                _column(attributes, "bedrooms", reference["bedrooms"]),
+                _column(attributes, "bathrooms", reference["bathrooms"]),
+            ]
+        )
+        keys = [(self.METHOD, *row) for row in features.tolist()]
+
+        def compute(indexes: list[int]) -> list[list[Explanation]]:
+            weights = np.array(
+                [self.BASE_PRICE_SQFT, self.BEDROOM_ADJUSTMENT, self.BATHROOM_ADJUSTMENT]
+            )
+            baseline = np.array(list(reference.values()), dtype=np.float64)
+            contributions = (features[indexes] - baseline) * weights
+            return [_top_explanations(list(reference), row) for row in contributions.tolist()]
+
+        return self._explanations.get_or_compute_many(keys, compute)
+
     def _mock_comps(self, attributes: dict[str, Any]) -> list[Comparable]:
         address = attributes.get("address", "123 Main St")
         city = attributes.get("city", "Sample City")
@@ -77,9 +310,81 @@ class RealEstatePipeline:
         ]
 
     def _cache_key(self, payload: ValuationRequest) -> str:
-        key_parts = [
-            payload.class_,
-            str(payload.attributes.get("address")),
-            str(payload.attributes.get("zip")),
-        ]
-        return "|".join(key_parts)
+        """Fingerprints every attribute and option, since any of them can shape the response.
+
+        Values are normalized first so cosmetic differences (case, whitespace, ``1600`` vs
+        ``1600.0``, key order) share an entry while any real difference does not.
+        """
+        fingerprint = json.dumps(
+            [payload.class_, _normalize(payload.attributes), _normalize(payload.options)],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _top_explanations(features: list[str], contributions: list[float]) -> list[Explanation]:
+    # A non-finite contribution has no meaningful share; it is left out rather than
+    # turning every magnitude into NaN.
+    finite = [(name, value) for name, value in zip(features, contributions) if math.isfinite(value)]
+    ranked = sorted(finite, key=lambda item: -abs(item[1]))
+    total = sum(abs(value) for _, value in ranked)
+    return [
+        Explanation(
+            feature=feature,
+            direction="+" if value > 0 else "-",
+            magnitude=round(abs(value) / total, 4),
+            human_readable=f"{feature} {'adds' if value > 0 else 'subtracts'} ${abs(value):,.0f}",
+        )
+        for feature, value in ranked
+        if value
+    ]
+
+
+def _column(rows: Sequence[dict[str, Any]], key: str, default: float) -> np.ndarray:
+    """``key`` of every row as floats; a missing or null value takes ``default``."""
+    values = [row.get(key) for row in rows]
+    try:
+        column = np.fromiter(
+            (default if value is None else value for value in values),
+            dtype=np.float64,
+            count=len(values),
+        )
+    except (TypeError, ValueError):
+        # Rare: find the first value that does not convert, to name its item.
+        for index, value in enumerate(values):
+            try:
+                float(default if value is None else value)
+            except (TypeError, ValueError):
+                raise InvalidAttributeError(index, key) from None
+        raise
+    invalid = np.flatnonzero(~np.isfinite(column))
+    if invalid.size:
+        raise InvalidAttributeError(int(invalid[0]), key)
+    return column
+
+
+def _value(row: dict[str, Any], key: str, default: float) -> float:
+    """:func:`_column` for a single request, whose errors name no item."""
+    value = row.get(key)
+    try:
+        number = float(default if value is None else value)
+    except (TypeError, ValueError):
+        raise InvalidAttributeError(None, key) from None
+    if not math.isfinite(number):
+        raise InvalidAttributeError(None, key)
+    return number
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return str(value)
@@ -1,22 +1,50 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import List, Optional
 
-from services.valuation_orchestrator.app.storage.jobs import InMemoryJobStore
-from valora_common.schemas.valuation import JobStatus
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from services.valuation_orchestrator.app.storage.jobs import JobState, JobStore
+from valora_common.schemas.valuation import BatchValuationResponse, JobStatus
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 
-def get_job_store() -> InMemoryJobStore:
+def get_job_store() -> JobStore:
     from services.valuation_orchestrator.app.main import app
 
     return app.state.job_store  # type: ignore[no-any-return]
 
 
+@router.get("", response_model=List[JobStatus])
+async def list_jobs(
+    status_filter: Optional[JobState] = Query(default=None, alias="status"),
+    submitted_after: Optional[datetime] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    job_store: JobStore = Depends(get_job_store),
+) -> List[JobStatus]:
+    # SQLite can wait out another worker's write; keep that off the event loop.
+    return await run_in_threadpool(
+        job_store.list_jobs, status=status_filter, submitted_after=submitted_after, limit=limit
+    )
+
+
 @router.get("/{job_id}", response_model=JobStatus)
-async def get_job(job_id: str, job_store: InMemoryJobStore = Depends(get_job_store)) -> JobStatus:
+async def get_job(job_id: str, job_store: JobStore = Depends(get_job_store)) -> JobStatus:
+    try:
+        return await run_in_threadpool(job_store.get, job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from exc
+
+
+@router.get("/{job_id}/results", response_model=BatchValuationResponse)
+async def get_job_results(
+    job_id: str, job_store: JobStore = Depends(get_job_store)
+) -> BatchValuationResponse:
     try:
-        return job_store.get(job_id)
+        results = await run_in_threadpool(job_store.get_results, job_id)
     except KeyError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from exc
+    return BatchValuationResponse(count=len(results), results=results)
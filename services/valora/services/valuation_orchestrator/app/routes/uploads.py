@@ -1,25 +1,70 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Union
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from services.valuation_orchestrator.app.settings import Settings, get_settings
+from services.valuation_orchestrator.app.storage.uploads import (
+    UnsupportedMediaTypeError,
+    UploadError,
+    UploadTooLargeError,
+    stream_image_upload,
+)
 
 UPLOAD_DIR = Path(__file__).resolve().parent.parent / ".." / "uploads"
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 router = APIRouter(prefix="/valuations", tags=["Valuations"])
 
+_IMAGE_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["image"],
+                    "properties": {"image": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
 
-@router.post("/{valuation_id}/images", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{valuation_id}/images",
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_IMAGE_UPLOAD_BODY,
+)
 async def upload_images(
     valuation_id: str,
-    image: Annotated[UploadFile, File(...)],
-) -> dict[str, str]:
-    if not image.content_type or not image.content_type.startswith("image/"):
-        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Only images allowed")
-    destination = UPLOAD_DIR / f"{valuation_id}_{image.filename}"
-    contents = await image.read()
-    with destination.open("wb") as handle:
-        handle.write(contents)
-    return {"status": "stored", "path": str(destination)}
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> dict[str, Union[str, int]]:
+    directory = Path(settings.upload_dir) if settings.upload_dir else UPLOAD_DIR
+    try:
+        stored = await stream_image_upload(
+            request,
+            directory,
+            valuation_id,
+            max_bytes=settings.max_upload_bytes,
+            flush_bytes=settings.upload_flush_bytes,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+        ) from exc
+    except UnsupportedMediaTypeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)
+        ) from exc
+    except UploadError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return {
+        "status": "stored",
+        "path": str(stored.path),
+        "bytes": stored.size,
+        "sha256": stored.sha256,
+    }
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-import uuid
-from typing import Annotated, Union
+from typing import Annotated, Any, Dict, Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
+from services.valuation_orchestrator.app.pipelines.real_estate import InvalidAttributeError
 from services.valuation_orchestrator.app.service import UnsupportedAssetClassError, ValuationService
-from services.valuation_orchestrator.app.storage.jobs import InMemoryJobStore
-from valora_common.schemas.valuation import AcceptedResponse, ValuationRequest, ValuationResponse
+from services.valuation_orchestrator.app.workers import JobQueueFullError, JobWorkerPool
+from valora_common.schemas.valuation import (
+    AcceptedResponse,
+    BatchValuationRequest,
+    BatchValuationResponse,
+    ValuationRequest,
+    ValuationResponse,
+)
 
 router = APIRouter(prefix="/valuations", tags=["Valuations"])
 
@@ -18,27 +25,64 @@ def get_service() -> ValuationService:
     return app.state.valuation_service  # type: ignore[no-any-return]
 
 
-def get_job_store() -> InMemoryJobStore:
+def get_job_workers() -> JobWorkerPool:
     from services.valuation_orchestrator.app.main import app
 
-    return app.state.job_store  # type: ignore[no-any-return]
+    return app.state.job_workers  # type: ignore[no-any-return]
 
 
 @router.post("", response_model=Union[ValuationResponse, AcceptedResponse])
 async def create_valuation(
     payload: ValuationRequest,
     service: Annotated[ValuationService, Depends(get_service)],
-    job_store: Annotated[InMemoryJobStore, Depends(get_job_store)],
+    job_workers: Annotated[JobWorkerPool, Depends(get_job_workers)],
 ) -> Union[ValuationResponse, AcceptedResponse]:
     if payload.class_ == "real_estate":
         try:
-            return service.valuate(payload)
+            return await service.valuate_async(payload)
         except UnsupportedAssetClassError as exc:  # pragma: no cover - defensive
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=f"Unsupported asset class: {payload.class_}",
             ) from exc
-    # Autos default to async placeholder to match roadmap sequencing.
-    job_id = f"job_{uuid.uuid4().hex}"
-    job_store.create(job_id)
-    return AcceptedResponse(job_id=job_id, status="queued", estimated_completion_seconds=120)
+        except InvalidAttributeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+            ) from exc
+    # Autos run on the background worker pool to match roadmap sequencing.
+    try:
+        job = await job_workers.enqueue([payload])
+    except JobQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Valuation job queue is full",
+            headers={"Retry-After": "5"},
+        ) from exc
+    return AcceptedResponse(job_id=job.job_id, status="queued", estimated_completion_seconds=120)
+
+
+@router.post("/batch", response_model=BatchValuationResponse)
+async def create_valuation_batch(
+    payload: BatchValuationRequest,
+    service: Annotated[ValuationService, Depends(get_service)],
+) -> BatchValuationResponse:
+    # Large portfolios are CPU bound; keep them off the event loop.
+    try:
+        results = await run_in_threadpool(service.valuate_batch, payload.items)
+    except UnsupportedAssetClassError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unsupported asset class: {exc}",
+        ) from exc
+    except InvalidAttributeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+    return BatchValuationResponse(count=len(results), results=results)
+
+
+@router.get("/cache/stats")
+async def valuation_cache_stats(
+    service: Annotated[ValuationService, Depends(get_service)],
+) -> Dict[str, Dict[str, Any]]:
+    return service.cache_stats()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from services.valuation_orchestrator.app.workers import JobWorkerPool
+
+router = APIRouter(prefix="/workers", tags=["Workers"])
+
+
+def get_job_workers() -> JobWorkerPool:
+    from services.valuation_orchestrator.app.main import app
+
+    return app.state.job_workers  # type: ignore[no-any-return]
+
+
+@router.get("/stats")
+async def worker_stats(workers: JobWorkerPool = Depends(get_job_workers)) -> dict[str, Any]:
+    return workers.stats()
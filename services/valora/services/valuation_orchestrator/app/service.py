@@ -1,11 +1,22 @@
 from __future__ import annotations
 
-from typing import Callable, Dict
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
+from fastapi.concurrency import run_in_threadpool
+
+from services.valuation_orchestrator.app.clients import DownstreamClients
 from services.valuation_orchestrator.app.pipelines.auto import AutoPipeline
-from services.valuation_orchestrator.app.pipelines.real_estate import RealEstatePipeline
+from services.valuation_orchestrator.app.pipelines.real_estate import (
+    InvalidAttributeError,
+    RealEstatePipeline,
+)
+from services.valuation_orchestrator.app.settings import get_settings
+from services.valuation_orchestrator.app.storage.result_cache import create_valuation_cache
 from valora_common.schemas.valuation import ValuationRequest, ValuationResponse
 
+BatchPipeline = Callable[[Sequence[ValuationRequest]], List[ValuationResponse]]
+
 
 class UnsupportedAssetClassError(ValueError):
     pass
@@ -14,11 +25,26 @@ class UnsupportedAssetClassError(ValueError):
 class ValuationService:
     """Dispatches valuation requests to the correct asset pipeline."""
 
-    def __init__(self) -> None:
+    def __init__(self, clients: Optional[DownstreamClients] = None) -> None:
+        settings = get_settings()
+        cache = create_valuation_cache(
+            settings.valuation_cache_backend,
+            path=settings.valuation_cache_path,
+            max_entries=settings.valuation_cache_max_entries,
+            ttl_seconds=settings.valuation_cache_ttl_minutes * 60,
+        )
+        real_estate = RealEstatePipeline(cache=cache)
+        self._real_estate = real_estate
+        self._real_estate_graph = real_estate.stage_graph(
+            clients or DownstreamClients(), settings.stage_timeouts
+        )
         self._pipelines: Dict[str, Callable[[ValuationRequest], ValuationResponse]] = {
-            "real_estate": RealEstatePipeline().valuate,
+            "real_estate": real_estate.valuate,
             "auto": AutoPipeline().valuate,
         }
+        self._batch_pipelines: Dict[str, BatchPipeline] = {
+            "real_estate": real_estate.valuate_batch,
+        }
 
     def valuate(self, payload: ValuationRequest) -> ValuationResponse:
         try:
@@ -26,3 +52,40 @@ class ValuationService:
         except KeyError as exc:
             raise UnsupportedAssetClassError(payload.class_) from exc
         return pipeline(payload)
+
+    async def valuate_async(self, payload: ValuationRequest) -> ValuationResponse:
+        """Event-loop entry point; real estate runs its stages concurrently."""
+        if payload.class_ == "real_estate":
+            return await self._real_estate.valuate_staged(payload, self._real_estate_graph)
+        return await run_in_threadpool(self.valuate, payload)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {"real_estate": self._real_estate.cache_stats()}
+
+    def valuate_batch(self, payloads: Sequence[ValuationRequest]) -> List[ValuationResponse]:
+        """Values a mixed batch, handing each asset class to its pipeline in one call.
+
+        Classes without a vectorized pipeline fall back to per-request valuation. Results
+        are returned in the order of ``payloads``.
+        """
+        positions: Dict[str, List[int]] = defaultdict(list)
+        for index, payload in enumerate(payloads):
+            if payload.class_ not in self._pipelines:
+                raise UnsupportedAssetClassError(payload.class_)
+            positions[payload.class_].append(index)
+
+        results: List[ValuationResponse | None] = [None] * len(payloads)
+        for asset_class, indexes in positions.items():
+            group = [payloads[index] for index in indexes]
+            batch_pipeline = self._batch_pipelines.get(asset_class)
+            if batch_pipeline is not None:
+                try:
+                    responses = batch_pipeline(group)
+                except InvalidAttributeError as exc:
+                    # Report the item's position in the whole batch, not in its group.
+                    raise InvalidAttributeError(indexes[exc.index], exc.attribute) from exc
+            else:
+                responses = [self._pipelines[asset_class](payload) for payload in group]
+            for index, response in zip(indexes, responses):
+                results[index] = response
+        return results  # type: ignore[return-value]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+
+class Settings:
+    def __init__(self) -> None:
+        self.environment = os.getenv("ENVIRONMENT", "local")
+        # 0 runs jobs on an in-process thread pool instead of worker processes.
+        self.worker_processes = int(os.getenv("VALUATION_WORKER_PROCESSES", "2"))
+        self.worker_concurrency = int(os.getenv("VALUATION_WORKER_CONCURRENCY", "4"))
+        self.job_queue_depth = int(os.getenv("VALUATION_JOB_QUEUE_DEPTH", "1000"))
+        self.job_chunk_size = int(os.getenv("VALUATION_JOB_CHUNK_SIZE", "100"))
+        self.job_timeout_seconds = float(os.getenv("VALUATION_JOB_TIMEOUT_SECONDS", "120"))
+        self.valuation_cache_backend = os.getenv("VALUATION_CACHE_BACKEND", "memory")
+        self.valuation_cache_path = os.getenv("VALUATION_CACHE_PATH", "./valuation_cache.db")
+        self.valuation_cache_ttl_minutes = int(os.getenv("VALUATION_CACHE_TTL_MINUTES", "15"))
+        self.valuation_cache_max_entries = int(os.getenv("VALUATION_CACHE_MAX_ENTRIES", "10000"))
+        # Empty keeps uploads next to the service package.
+        self.upload_dir = os.getenv("UPLOAD_DIR", "")
+        self.max_upload_bytes = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+        self.upload_flush_bytes = int(os.getenv("UPLOAD_FLUSH_BYTES", str(1024 * 1024)))
+        self.job_store_backend = os.getenv("JOB_STORE_BACKEND", "sqlite")
+        self.job_store_path = os.getenv("JOB_STORE_PATH", "./valuation_jobs.db")
+        self.job_ttl_seconds = float(os.getenv("JOB_TTL_SECONDS", "86400"))
+        self.job_purge_interval_seconds = float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", "300"))
+        # Queued or running jobs untouched this long belong to a worker that died. Keep it
+        # above how long a live worker can hold a job in its queue or between chunks.
+        self.job_stale_seconds = float(os.getenv("JOB_STALE_SECONDS", "900"))
+        # Empty URLs keep the matching valuation stage on its local placeholder.
+        self.comparable_engine_url = os.getenv("COMPARABLE_ENGINE_URL", "")
+        self.model_serving_url = os.getenv("MODEL_SERVING_URL", "")
+        self.data_feeds_url = os.getenv("DATA_FEEDS_URL", "")
+        self.downstream_timeout_seconds = float(os.getenv("DOWNSTREAM_TIMEOUT_SECONDS", "5.0"))
+        self.stage_timeouts = {
+            "comps": float(os.getenv("COMPS_STAGE_TIMEOUT_SECONDS", "1.0")),
+            "predict": float(os.getenv("PREDICT_STAGE_TIMEOUT_SECONDS", "1.0")),
+            "explain": float(os.getenv("EXPLAIN_STAGE_TIMEOUT_SECONDS", "1.0")),
+            "market": float(os.getenv("MARKET_STAGE_TIMEOUT_SECONDS", "0.5")),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Mapping, Optional, Sequence, Tuple
+
+StageStatus = Literal["ok", "timeout", "error"]
+StageContext = Mapping[str, Any]
+
+
+class StageGraphError(ValueError):
+    pass
+
+
+class StageFailedError(RuntimeError):
+    def __init__(self, stage: str, reason: str) -> None:
+        super().__init__(f"Stage '{stage}' failed: {reason}")
+        self.stage = stage
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One unit of work in a valuation.
+
+    ``run`` receives the shared context plus the outputs of ``depends_on`` under their
+    stage names. When it raises or overruns ``timeout_seconds`` the synchronous
+    ``fallback`` supplies the output instead; without one the whole graph fails.
+    """
+
+    name: str
+    run: Callable[[StageContext], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    timeout_seconds: Optional[float] = None
+    fallback: Optional[Callable[[StageContext], Any]] = None
+
+
+@dataclass
+class StageTiming:
+    status: StageStatus
+    latency_ms: float
+    fallback: bool = False
+    error: Optional[str] = None
+
+    def as_metadata(self) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "status": self.status,
+            "latency_ms": round(self.latency_ms, 2),
+            "fallback": self.fallback,
+        }
+        if self.error:
+            entry["error"] = self.error
+        return entry
+
+
+@dataclass
+class StageGraphResult:
+    outputs: Dict[str, Any]
+    timings: Dict[str, StageTiming]
+    total_ms: float
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "stages": {name: timing.as_metadata() for name, timing in self.timings.items()},
+            "stages_total_ms": round(self.total_ms, 2),
+        }
+
+
+@dataclass
+class StageGraph:
+    """Runs stages as soon as their dependencies finish, independent ones concurrently.
+
+    End-to-end latency is the longest dependency chain rather than the sum of all
+    stages. Every stage is bounded by its own timeout.
+    """
+
+    stages: Sequence[Stage]
+    _order: List[Stage] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._order = _topological_order(self.stages)
+
+    async def run(self, context: StageContext) -> StageGraphResult:
+        started = time.perf_counter()
+        timings: Dict[str, StageTiming] = {}
+        tasks: Dict[str, asyncio.Task[Any]] = {}
+        for stage in self._order:
+            dependencies = [tasks[name] for name in stage.depends_on]
+            tasks[stage.name] = asyncio.create_task(
+                self._run_stage(stage, context, dependencies, timings), name=f"stage-{stage.name}"
+            )
+        try:
+            values = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return StageGraphResult(
+            outputs=dict(zip(tasks, values)),
+            timings={stage.name: timings[stage.name] for stage in self._order},
+            total_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        context: StageContext,
+        dependencies: List[asyncio.Task[Any]],
+        timings: Dict[str, StageTiming],
+    ) -> Any:
+        upstream = await asyncio.gather(*dependencies)
+        stage_context = {**context, **dict(zip(stage.depends_on, upstream))}
+        started = time.perf_counter()
+        try:
+            output = await asyncio.wait_for(stage.run(stage_context), stage.timeout_seconds)
+        except asyncio.TimeoutError:
+            status: StageStatus = "timeout"
+            reason = f"exceeded {stage.timeout_seconds}s"
+        except Exception as exc:  # noqa: BLE001 - any stage failure may fall back
+            status = "error"
+            reason = f"{type(exc).__name__}: {exc}"
+        else:
+            timings[stage.name] = StageTiming("ok", (time.perf_counter() - started) * 1000)
+            return output
+        if stage.fallback is None:
+            timings[stage.name] = StageTiming(
+                status, (time.perf_counter() - started) * 1000, error=reason
+            )
+            raise StageFailedError(stage.name, reason)
+        output = stage.fallback(stage_context)
+        timings[stage.name] = StageTiming(
+            status, (time.perf_counter() - started) * 1000, fallback=True, error=reason
+        )
+        return output
+
+
+def _topological_order(stages: Sequence[Stage]) -> List[Stage]:
+    by_name: Dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise StageGraphError(f"Duplicate stage '{stage.name}'")
+        by_name[stage.name] = stage
+    for stage in stages:
+        for dependency in stage.depends_on:
+            if dependency not in by_name:
+                raise StageGraphError(
+                    f"Stage '{stage.name}' depends on unknown stage '{dependency}'"
+                )
+
+    ordered: List[Stage] = []
+    state: Dict[str, str] = {}
+
+    def visit(stage: Stage) -> None:
+        if state.get(stage.name) == "done":
+            return
+        if state.get(stage.name) == "visiting":
+            raise StageGraphError(f"Stage graph has a cycle through '{stage.name}'")
+        state[stage.name] = "visiting"
+        for dependency in stage.depends_on:
+            visit(by_name[dependency])
+        state[stage.name] = "done"
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import threading
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, Literal
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Literal, Protocol
 
-from valora_common.schemas.valuation import JobProgress, JobStatus
+from pydantic import TypeAdapter
+
+from services.valuation_orchestrator.app.storage.sqlite import SQLiteConnections
+from valora_common.schemas.valuation import JobProgress, JobStatus, ValuationResponse
 
 JobState = Literal["queued", "running", "succeeded", "failed", "partial"]
 
+FINISHED_STATES: tuple[JobState, ...] = ("succeeded", "failed", "partial")
+UNFINISHED_STATES: tuple[JobState, ...] = ("queued", "running")
+
+_RESULTS_ADAPTER = TypeAdapter(List[ValuationResponse])
+
 
 @dataclass
 class JobRecord:
@@ -18,24 +27,66 @@ class JobRecord:
     updated_at: datetime
     progress: JobProgress = field(default_factory=JobProgress)
     result_url: str | None = None
+    error: str | None = None
+    results: List[ValuationResponse] = field(default_factory=list)
+
+
+class JobStore(Protocol):
+    def create(self, job_id: str, *, total: int = 0) -> JobStatus: ...
+
+    def update(
+        self,
+        job_id: str,
+        *,
+        status: JobState,
+        progress: JobProgress | None = None,
+        result_url: str | None = None,
+        error: str | None = None,
+        results: List[ValuationResponse] | None = None,
+    ) -> JobStatus: ...
+
+    def get(self, job_id: str) -> JobStatus: ...
+
+    def get_results(self, job_id: str) -> List[ValuationResponse]: ...
+
+    def list_jobs(
+        self,
+        *,
+        status: JobState | None = None,
+        submitted_after: datetime | None = None,
+        limit: int = 100,
+    ) -> List[JobStatus]: ...
+
+    def fail_stale(self, older_than: datetime, error: str) -> int: ...
+
+    def purge_expired(self, now: datetime | None = None) -> int: ...
+
+    def close(self) -> None: ...
 
 
 class InMemoryJobStore:
-    """Simple thread-unsafe job store for prototyping."""
+    """Simple in-process job store for prototyping.
 
-    def __init__(self) -> None:
+    A lock guards the records, since callers run it from the threadpool like any store.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 86400) -> None:
         self._jobs: Dict[str, JobRecord] = {}
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._lock = threading.Lock()
 
-    def create(self, job_id: str) -> JobStatus:
+    def create(self, job_id: str, *, total: int = 0) -> JobStatus:
         now = datetime.utcnow()
         record = JobRecord(
             job_id=job_id,
             status="queued",
             submitted_at=now,
             updated_at=now,
+            progress=JobProgress(total=total),
         )
-        self._jobs[job_id] = record
-        return self._to_status(record)
+        with self._lock:
+            self._jobs[job_id] = record
+            return self._to_status(record)
 
     def update(
         self,
@@ -44,18 +95,73 @@ class InMemoryJobStore:
         status: JobState,
         progress: JobProgress | None = None,
         result_url: str | None = None,
+        error: str | None = None,
+        results: List[ValuationResponse] | None = None,
     ) -> JobStatus:
-        record = self._jobs[job_id]
-        record.status = status
-        if progress:
-            record.progress = progress
-        record.result_url = result_url
-        record.updated_at = datetime.utcnow()
-        return self._to_status(record)
+        with self._lock:
+            record = self._jobs[job_id]
+            record.status = status
+            if progress:
+                record.progress = progress
+            record.result_url = result_url
+            record.error = error
+            if results is not None:
+                record.results = results
+            record.updated_at = datetime.utcnow()
+            return self._to_status(record)
 
     def get(self, job_id: str) -> JobStatus:
-        record = self._jobs[job_id]
-        return self._to_status(record)
+        with self._lock:
+            return self._to_status(self._jobs[job_id])
+
+    def get_results(self, job_id: str) -> List[ValuationResponse]:
+        with self._lock:
+            return list(self._jobs[job_id].results)
+
+    def list_jobs(
+        self,
+        *,
+        status: JobState | None = None,
+        submitted_after: datetime | None = None,
+        limit: int = 100,
+    ) -> List[JobStatus]:
+        with self._lock:
+            records = [
+                record
+                for record in self._jobs.values()
+                if (status is None or record.status == status)
+                and (submitted_after is None or record.submitted_at > submitted_after)
+            ]
+            records.sort(key=lambda record: record.submitted_at, reverse=True)
+            return [self._to_status(record) for record in records[:limit]]
+
+    def fail_stale(self, older_than: datetime, error: str) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            stale = [
+                record
+                for record in self._jobs.values()
+                if record.status in UNFINISHED_STATES and record.updated_at < older_than
+            ]
+            for record in stale:
+                record.status = "failed"
+                record.error = error
+                record.updated_at = now
+            return len(stale)
+
+    def purge_expired(self, now: datetime | None = None) -> int:
+        cutoff = (now or datetime.utcnow()) - self._ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, record in self._jobs.items() if record.updated_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+    def close(self) -> None:
+        with self._lock:
+            self._jobs.clear()
 
     def _to_status(self, record: JobRecord) -> JobStatus:
         return JobStatus(
@@ -65,4 +171,172 @@ class InMemoryJobStore:
             updated_at=record.updated_at,
             progress=record.progress,
             result_url=record.result_url,
+            error=record.error,
+        )
+
+
+class SQLiteJobStore:
+    """Durable job store on SQLite in WAL mode.
+
+    Every uvicorn worker on the host opens the same database file; WAL lets readers run
+    alongside the single writer and ``busy_timeout`` absorbs short write contention.
+    Each thread gets its own connection. Jobs are purged once they have not been
+    touched for ``ttl_seconds``, finished or not, so jobs a dead worker abandoned do not
+    stay forever.
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            submitted_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            progress TEXT NOT NULL,
+            result_url TEXT,
+            error TEXT,
+            results BLOB
         )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_jobs_status_submitted ON jobs (status, submitted_at)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_submitted ON jobs (submitted_at)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_status_updated ON jobs (status, updated_at)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_updated ON jobs (updated_at)",
+    )
+    _COLUMNS = "job_id, status, submitted_at, updated_at, progress, result_url, error"
+
+    def __init__(
+        self, path: str | Path, *, ttl_seconds: float = 86400, busy_timeout_ms: int = 5000
+    ) -> None:
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._db = SQLiteConnections(path, busy_timeout_ms=busy_timeout_ms, schema=self._SCHEMA)
+
+    def create(self, job_id: str, *, total: int = 0) -> JobStatus:
+        now = datetime.utcnow()
+        status = JobStatus(
+            job_id=job_id,
+            status="queued",
+            submitted_at=now,
+            updated_at=now,
+            progress=JobProgress(total=total),
+        )
+        self._db.connection().execute(
+            "INSERT INTO jobs (job_id, status, submitted_at, updated_at, progress)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (job_id, "queued", now.isoformat(), now.isoformat(), status.progress.model_dump_json()),
+        )
+        return status
+
+    def update(
+        self,
+        job_id: str,
+        *,
+        status: JobState,
+        progress: JobProgress | None = None,
+        result_url: str | None = None,
+        error: str | None = None,
+        results: List[ValuationResponse] | None = None,
+    ) -> JobStatus:
+        connection = self._db.connection()
+        encoded_results = _RESULTS_ADAPTER.dump_json(results) if results is not None else None
+        cursor = connection.execute(
+            """
+            UPDATE jobs
+            SET status = ?,
+                progress = COALESCE(?, progress),
+                result_url = ?,
+                error = ?,
+                results = COALESCE(?, results),
+                updated_at = ?
+            WHERE job_id = ?
+            """,
+            (
+                status,
+                progress.model_dump_json() if progress else None,
+                result_url,
+                error,
+                encoded_results,
+                datetime.utcnow().isoformat(),
+                job_id,
+            ),
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(job_id)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> JobStatus:
+        row = self._db.connection().execute(
+            f"SELECT {self._COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return self._to_status(row)
+
+    def get_results(self, job_id: str) -> List[ValuationResponse]:
+        row = self._db.connection().execute(
+            "SELECT results FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return _RESULTS_ADAPTER.validate_json(row[0]) if row[0] else []
+
+    def list_jobs(
+        self,
+        *,
+        status: JobState | None = None,
+        submitted_after: datetime | None = None,
+        limit: int = 100,
+    ) -> List[JobStatus]:
+        clauses: List[str] = []
+        params: List[object] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if submitted_after is not None:
+            clauses.append("submitted_at > ?")
+            params.append(submitted_after.isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._db.connection().execute(
+            f"SELECT {self._COLUMNS} FROM jobs {where} ORDER BY submitted_at DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [self._to_status(row) for row in rows]
+
+    def fail_stale(self, older_than: datetime, error: str) -> int:
+        placeholders = ", ".join("?" for _ in UNFINISHED_STATES)
+        cursor = self._db.connection().execute(
+            f"""
+            UPDATE jobs SET status = 'failed', error = ?, updated_at = ?
+            WHERE status IN ({placeholders}) AND updated_at < ?
+            """,
+            (error, datetime.utcnow().isoformat(), *UNFINISHED_STATES, older_than.isoformat()),
+        )
+        return cursor.rowcount
+
+    def purge_expired(self, now: datetime | None = None) -> int:
+        cutoff = ((now or datetime.utcnow()) - self._ttl).isoformat()
+        cursor = self._db.connection().execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _to_status(self, row: tuple) -> JobStatus:
+        job_id, status, submitted_at, updated_at, progress, result_url, error = row
+        return JobStatus(
+            job_id=job_id,
+            status=status,
+            submitted_at=datetime.fromisoformat(submitted_at),
+            updated_at=datetime.fromisoformat(updated_at),
+            progress=JobProgress.model_validate_json(progress),
+            result_url=result_url,
+            error=error,
+        )
+
+
+def create_job_store(backend: str, *, path: str, ttl_seconds: float) -> JobStore:
+    if backend == "memory":
+        return InMemoryJobStore(ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteJobStore(path, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown job store backend: {backend}")
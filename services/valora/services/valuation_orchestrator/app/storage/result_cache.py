@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Protocol
+
+from services.valuation_orchestrator.app.storage.sqlite import SQLiteConnections
+from valora_common.cache import LRUTTLCache
+from valora_common.schemas.valuation import ValuationResponse
+
+
+class ValuationCache(Protocol):
+    def get(self, key: str) -> Optional[ValuationResponse]: ...
+
+    def set(self, key: str, value: ValuationResponse) -> None: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class SQLiteValuationCache:
+    """Pipeline result cache shared by every worker process on a host.
+
+    Responses are stored as JSON in a WAL-mode SQLite file, so a valuation computed by one
+    uvicorn worker is a hit for all the others. Entries expire after ``ttl_seconds``; once
+    the table grows past ``max_entries`` the least recently read entries are trimmed.
+    Hit/miss counters are per process, the size is shared.
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS valuation_cache (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_valuation_cache_accessed ON valuation_cache (accessed_at)",
+        "CREATE INDEX IF NOT EXISTS ix_valuation_cache_expires ON valuation_cache (expires_at)",
+    )
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        busy_timeout_ms: int = 5000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        # Recency only needs to be coarse; skipping most touches keeps hits read-only.
+        self._touch_interval = min(ttl_seconds / 20, 5.0)
+        self._trim_every = max(1, max_entries // 100)
+        self._writes_since_trim = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._db = SQLiteConnections(path, busy_timeout_ms=busy_timeout_ms, schema=self._SCHEMA)
+
+    def get(self, key: str) -> Optional[ValuationResponse]:
+        connection = self._db.connection()
+        row = connection.execute(
+            "SELECT value, expires_at, accessed_at FROM valuation_cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = self._clock()
+        if row is None or row[1] <= now:
+            with self._lock:
+                self._misses += 1
+            return None
+        if now - row[2] >= self._touch_interval:
+            connection.execute(
+                "UPDATE valuation_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        with self._lock:
+            self._hits += 1
+        return ValuationResponse.model_validate_json(row[0])
+
+    def set(self, key: str, value: ValuationResponse) -> None:
+        now = self._clock()
+        self._db.connection().execute(
+            """
+            INSERT OR REPLACE INTO valuation_cache (key, value, expires_at, accessed_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (key, value.model_dump_json(), now + self._ttl, now),
+        )
+        with self._lock:
+            self._writes_since_trim += 1
+            due = self._writes_since_trim >= self._trim_every
+            if due:
+                self._writes_since_trim = 0
+        if due:
+            self.trim()
+
+    def trim(self) -> int:
+        """Drops expired entries, then the least recently read ones above ``max_entries``."""
+        connection = self._db.connection()
+        removed = connection.execute(
+            "DELETE FROM valuation_cache WHERE expires_at <= ?", (self._clock(),)
+        ).rowcount
+        (size,) = connection.execute("SELECT COUNT(*) FROM valuation_cache").fetchone()
+        excess = size - self._max_entries
+        if excess > 0:
+            evicted = connection.execute(
+                """
+                DELETE FROM valuation_cache WHERE key IN (
+                    SELECT key FROM valuation_cache ORDER BY accessed_at LIMIT ?
+                )
+                """,
+                (excess,),
+            ).rowcount
+            with self._lock:
+                self._evictions += evicted
+            removed += evicted
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        (size,) = self._db.connection().execute("SELECT COUNT(*) FROM valuation_cache").fetchone()
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "sqlite",
+                "size": size,
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def create_valuation_cache(
+    backend: str, *, path: str, max_entries: int, ttl_seconds: float
+) -> ValuationCache:
+    if backend == "memory":
+        return LRUTTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteValuationCache(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown valuation cache backend: {backend}")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+
+class SQLiteConnections:
+    """Per-thread connections to one WAL-mode SQLite file, closed together.
+
+    Each thread opens its own connection on first use, so worker threads never share
+    one. Connections run in autocommit mode with ``busy_timeout_ms``, so writers from
+    other threads and processes wait for each other instead of failing. ``schema``
+    statements run once, on the first connection.
+    """
+
+    def __init__(
+        self, path: str | Path, *, busy_timeout_ms: int = 5000, schema: Sequence[str] = ()
+    ) -> None:
+        self.path = str(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        connection = self.connection()
+        for statement in schema:
+            connection.execute(statement)
+
+    def connection(self) -> sqlite3.Connection:
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            connection.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
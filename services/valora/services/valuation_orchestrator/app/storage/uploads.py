@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # pragma: no cover - python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError  # type: ignore[no-redef]
+    from multipart.multipart import MultipartParser, parse_options_header  # type: ignore[no-redef]
+
+
+class UploadError(ValueError):
+    pass
+
+
+class UploadTooLargeError(UploadError):
+    pass
+
+
+class UnsupportedMediaTypeError(UploadError):
+    pass
+
+
+@dataclass
+class StoredUpload:
+    path: Path
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+
+
+@dataclass
+class _PartState:
+    field_name: str
+    headers: dict[bytes, bytes] = field(default_factory=dict)
+    header_field: bytearray = field(default_factory=bytearray)
+    header_value: bytearray = field(default_factory=bytearray)
+    capturing: bool = False
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    pending: List[bytes] = field(default_factory=list)
+    pending_size: int = 0
+    size: int = 0
+    seen: bool = False
+
+    def on_part_begin(self) -> None:
+        self.headers = {}
+        self.capturing = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers[bytes(self.header_field).lower()] = bytes(self.header_value)
+        self.header_field.clear()
+        self.header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        if name != self.field_name or b"filename" not in options or self.seen:
+            return
+        self.capturing = True
+        self.seen = True
+        self.filename = options[b"filename"].decode("utf-8", errors="replace")
+        self.content_type = self.headers.get(b"content-type", b"").decode("latin-1")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.capturing:
+            self.pending.append(data[start:end])
+            self.pending_size += end - start
+            self.size += end - start
+
+    def on_part_end(self) -> None:
+        self.capturing = False
+
+    def take_pending(self) -> List[bytes]:
+        pending, self.pending, self.pending_size = self.pending, [], 0
+        return pending
+
+
+def _write_chunks(handle: BinaryIO, digest: "hashlib._Hash", chunks: List[bytes]) -> None:
+    for chunk in chunks:
+        digest.update(chunk)
+        handle.write(chunk)
+
+
+async def stream_image_upload(
+    request: Request,
+    directory: Path,
+    prefix: str,
+    *,
+    field_name: str = "image",
+    max_bytes: int,
+    flush_bytes: int = 1024 * 1024,
+) -> StoredUpload:
+    """Streams one image part of a multipart request straight to disk.
+
+    The body is parsed as it arrives rather than spooled first. Declared and actual
+    sizes are checked against ``max_bytes`` before anything is written past the limit,
+    and the SHA-256 of the content is computed on the way through. File I/O and hashing
+    run in the threadpool, in ``flush_bytes`` batches, so the event loop never blocks on
+    disk. The file appears under its final name only once it is complete.
+    """
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + 64 * 1024:
+        raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadError("Expected a multipart/form-data body")
+
+    part = _PartState(field_name=field_name)
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": part.on_part_begin,
+            "on_header_field": part.on_header_field,
+            "on_header_value": part.on_header_value,
+            "on_header_end": part.on_header_end,
+            "on_headers_finished": part.on_headers_finished,
+            "on_part_data": part.on_part_data,
+            "on_part_end": part.on_part_end,
+        },
+    )
+    digest = hashlib.sha256()
+    handle: Optional[BinaryIO] = None
+    temporary: Optional[Path] = None
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if part.seen and not (part.content_type or "").startswith("image/"):
+                raise UnsupportedMediaTypeError("Only images allowed")
+            if part.size > max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+            if part.pending_size >= flush_bytes:
+                if handle is None:
+                    handle, temporary = await _open_temporary(directory, prefix)
+                await run_in_threadpool(_write_chunks, handle, digest, part.take_pending())
+        parser.finalize()
+        if not part.seen:
+            raise UploadError(f"Missing '{field_name}' file part")
+        if handle is None:
+            handle, temporary = await _open_temporary(directory, prefix)
+        await run_in_threadpool(_write_chunks, handle, digest, part.take_pending())
+        await run_in_threadpool(handle.close)
+        handle = None
+        filename = Path(part.filename or "upload").name or "upload"
+        destination = directory / f"{prefix}_{filename}"
+        assert temporary is not None
+        await run_in_threadpool(os.replace, temporary, destination)
+        temporary = None
+    except MultipartParseError as exc:
+        raise UploadError("Malformed multipart body") from exc
+    finally:
+        if handle is not None:
+            await run_in_threadpool(handle.close)
+        if temporary is not None:
+            await run_in_threadpool(temporary.unlink, True)
+
+    return StoredUpload(
+        path=destination,
+        filename=filename,
+        content_type=part.content_type or "application/octet-stream",
+        size=part.size,
+        sha256=digest.hexdigest(),
+    )
+
+
+async def _open_temporary(directory: Path, prefix: str) -> tuple[BinaryIO, Path]:
+    await run_in_threadpool(directory.mkdir, parents=True, exist_ok=True)
+    temporary = directory / f".{prefix}_{os.urandom(8).hex()}.part"
+    handle = await run_in_threadpool(temporary.open, "wb")
+    return handle, temporary
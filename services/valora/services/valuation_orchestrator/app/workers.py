@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from services.valuation_orchestrator.app.service import ValuationService
+from services.valuation_orchestrator.app.storage.jobs import JobState, JobStore
+from valora_common.schemas.valuation import (
+    JobProgress,
+    JobStatus,
+    ValuationRequest,
+    ValuationResponse,
+)
+
+ChunkOutcome = Tuple[bool, Dict[str, Any]]
+
+_LATENCY_WINDOW = 500
+
+_worker_service: Optional[ValuationService] = None
+
+
+class JobQueueFullError(RuntimeError):
+    pass
+
+
+def _valuate_chunk(payloads: List[Dict[str, Any]]) -> List[ChunkOutcome]:
+    """Executor entry point; builds one ValuationService per worker process."""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = ValuationService()
+    outcomes: List[ChunkOutcome] = []
+    for raw in payloads:
+        try:
+            response = _worker_service.valuate(ValuationRequest.model_validate(raw))
+        except Exception as exc:  # noqa: BLE001 - reported back on the job
+            outcomes.append((False, {"error": f"{type(exc).__name__}: {exc}"}))
+        else:
+            outcomes.append((True, response.model_dump(mode="json")))
+    return outcomes
+
+
+@dataclass
+class QueuedJob:
+    job_id: str
+    payloads: List[ValuationRequest]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class JobWorkerPool:
+    """Runs queued valuation jobs on an executor behind a bounded asyncio queue.
+
+    ``concurrency`` consumer tasks pull jobs off the queue and ship them to the executor
+    in chunks, so a large batch only ever occupies one consumer and at most one pool slot
+    at a time and the event loop stays free to serve the API. Job store calls run in the
+    threadpool too, since a SQLite store can wait on another worker's write lock.
+    """
+
+    def __init__(
+        self,
+        job_store: JobStore,
+        *,
+        processes: int = 2,
+        concurrency: int = 4,
+        queue_depth: int = 1000,
+        chunk_size: int = 100,
+        job_timeout_seconds: float = 120.0,
+    ) -> None:
+        self._job_store = job_store
+        self._processes = processes
+        self._concurrency = max(concurrency, 1)
+        self._chunk_size = max(chunk_size, 1)
+        self._job_timeout = job_timeout_seconds
+        self._queue: asyncio.Queue[QueuedJob] = asyncio.Queue(maxsize=queue_depth)
+        self._executor: Optional[Executor] = None
+        self._consumers: List[asyncio.Task[None]] = []
+        self._running = 0
+        self._completed: Dict[str, int] = {"succeeded": 0, "failed": 0, "partial": 0}
+        self._wait_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._run_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    async def start(self) -> None:
+        if self._processes > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._concurrency, thread_name_prefix="valuation-job"
+            )
+        self._consumers = [
+            asyncio.create_task(self._consume(), name=f"valuation-job-consumer-{index}")
+            for index in range(self._concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def enqueue(self, payloads: Sequence[ValuationRequest]) -> JobStatus:
+        if self._queue.full():
+            raise JobQueueFullError("Valuation job queue is full")
+        job_id = f"job_{uuid.uuid4().hex}"
+        status = await run_in_threadpool(self._job_store.create, job_id, total=len(payloads))
+        try:
+            self._queue.put_nowait(QueuedJob(job_id=job_id, payloads=list(payloads)))
+        except asyncio.QueueFull as exc:  # filled up while the job was being recorded
+            await self._update(job_id, status="failed", error="Valuation job queue is full")
+            raise JobQueueFullError("Valuation job queue is full") from exc
+        return status
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "processes": self._processes,
+            "concurrency": self._concurrency,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "running": self._running,
+            "completed": dict(self._completed),
+            "job_timeout_seconds": self._job_timeout,
+            "queue_wait_ms": _summarize(self._wait_ms),
+            "run_ms": _summarize(self._run_ms),
+        }
+
+    async def _consume(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: QueuedJob) -> None:
+        started = time.monotonic()
+        self._wait_ms.append((started - job.enqueued_at) * 1000)
+        progress = JobProgress(total=len(job.payloads))
+        results: List[ValuationResponse] = []
+        errors: List[str] = []
+        self._running += 1
+        await self._update(job.job_id, status="running", progress=progress.model_copy())
+        try:
+            await asyncio.wait_for(self._execute(job, progress, results, errors), self._job_timeout)
+        except asyncio.TimeoutError:
+            errors.append(f"Job exceeded {self._job_timeout:.0f}s timeout")
+            progress.failed = progress.total - progress.succeeded
+            progress.processed = progress.total
+        except Exception as exc:  # noqa: BLE001 - executor or pool failure
+            errors.append(f"{type(exc).__name__}: {exc}")
+            progress.failed = progress.total - progress.succeeded
+            progress.processed = progress.total
+        finally:
+            self._running -= 1
+            self._run_ms.append((time.monotonic() - started) * 1000)
+
+        state = _final_state(progress)
+        self._completed[state] += 1
+        await self._update(
+            job.job_id,
+            status=state,
+            progress=progress.model_copy(),
+            error="; ".join(errors[:5]) or None,
+            results=results,
+        )
+
+    async def _execute(
+        self,
+        job: QueuedJob,
+        progress: JobProgress,
+        results: List[ValuationResponse],
+        errors: List[str],
+    ) -> None:
+        assert self._executor is not None, "JobWorkerPool.start() was not awaited"
+        loop = asyncio.get_running_loop()
+        for offset in range(0, len(job.payloads), self._chunk_size):
+            chunk = [
+                payload.model_dump(by_alias=True)
+                for payload in job.payloads[offset : offset + self._chunk_size]
+            ]
+            outcomes = await loop.run_in_executor(self._executor, _valuate_chunk, chunk)
+            for ok, body in outcomes:
+                if ok:
+                    results.append(ValuationResponse.model_validate(body))
+                    progress.succeeded += 1
+                else:
+                    errors.append(body["error"])
+                    progress.failed += 1
+                progress.processed += 1
+            await self._update(job.job_id, status="running", progress=progress.model_copy())
+
+    async def _update(self, job_id: str, **changes: Any) -> JobStatus:
+        return await run_in_threadpool(self._job_store.update, job_id, **changes)
+
+
+def _final_state(progress: JobProgress) -> JobState:
+    if progress.failed == 0:
+        return "succeeded"
+    if progress.succeeded == 0:
+        return "failed"
+    return "partial"
+
+
+def _summarize(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50": round(ordered[len(ordered) // 2], 2),
+        "p95": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 2),
+        "max": round(ordered[-1], 2),
+    }
@@ -0,0 +1,84 @@
+from valora_common.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache: LRUTTLCache[str, int] = LRUTTLCache(max_entries=4, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache: LRUTTLCache[str, int] = LRUTTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_is_shared_between_pipelines(tmp_path):
+    from services.valuation_orchestrator.app.pipelines.real_estate import RealEstatePipeline
+    from services.valuation_orchestrator.app.storage.result_cache import SQLiteValuationCache
+    from valora_common.schemas.valuation import ValuationRequest
+
+    path = tmp_path / "cache.db"
+    request = ValuationRequest(
+        class_="real_estate", attributes={"address": "5 Birch Ln", "living_area_sqft": 1750}
+    )
+    first_worker = RealEstatePipeline(
+        cache=SQLiteValuationCache(path, max_entries=10, ttl_seconds=60)
+    )
+    second_worker = RealEstatePipeline(
+        cache=SQLiteValuationCache(path, max_entries=10, ttl_seconds=60)
+    )
+
+    computed = first_worker.valuate(request)
+    shared = second_worker.valuate(request)
+
+    assert shared.metadata["cache_hit"] is True
+    assert shared.estimate == computed.estimate
+    assert shared.comps == computed.comps
+
+
+def test_sqlite_cache_enforces_ttl_and_size(tmp_path):
+    from services.valuation_orchestrator.app.storage.result_cache import SQLiteValuationCache
+    from valora_common.schemas.valuation import ValuationResponse
+
+    clock = FakeClock()
+    cache = SQLiteValuationCache(tmp_path / "cache.db", max_entries=2, ttl_seconds=10, clock=clock)
+    response = ValuationResponse(
+        valuation_id="val_1",
+        estimate=100.0,
+        confidence=0.5,
+        interval_low=90.0,
+        interval_high=110.0,
+        method="test",
+        explanations=[],
+        comps=[],
+    )
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.set(key, response)
+
+    assert cache.stats()["size"] == 2
+    assert cache.get("a") is None
+    clock.now += 10
+    assert cache.get("c") is None
@@ -0,0 +1,255 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.comparable_engine.app.live import LiveSalesIndex
+from services.comparable_engine.app.sales import SalesTable
+from services.comparable_engine.app.spatial import GridIndex, haversine_mi
+from services.comparable_engine.app.store import CompsBatch, CompsQuery, SalesStore, SortedColumn
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(7)
+    return rng.uniform(-89, 89, 50000), rng.uniform(-180, 180, 50000)
+
+
+def test_haversine_known_distance():
+    # Chicago to New York, about 711 miles on a spherical Earth.
+    distance = haversine_mi(41.8781, -87.6298, np.array([40.7128]), np.array([-74.0060]))
+    assert float(distance[0]) == pytest.approx(711.0, abs=1)
+
+
+@pytest.mark.parametrize("origin", [(41.9, -87.6), (89.5, 20.0), (-12.0, 179.95), (0.0, -180.0)])
+def test_grid_queries_match_brute_force(points, origin):
+    latitudes, longitudes = points
+    index = GridIndex(latitudes, longitudes, cell_degrees=0.5)
+    distances = haversine_mi(*origin, latitudes, longitudes)
+
+    rows, nearest = index.nearest(*origin, 12)
+    inside, _ = index.within(*origin, 250.0)
+
+    assert np.allclose(nearest, np.sort(distances)[:12])
+    assert np.allclose(distances[rows], nearest)
+    assert sorted(inside.tolist()) == np.flatnonzero(distances <= 250.0).tolist()
+
+
+def test_sales_table_round_trips_through_npz(tmp_path):
+    sales = SalesTable.synthetic(50)
+    loaded = SalesTable.load(sales.save(tmp_path / "sales.npz"))
+
+    assert len(loaded) == 50
+    assert loaded.source == "synthetic"
+    assert np.array_equal(loaded.sale_date, sales.sale_date)
+
+
+def test_sorted_column_range_skips_unknown_values():
+    column = SortedColumn(np.array([3.0, np.nan, 1.0, 2.0, 3.0]))
+
+    assert sorted(column.between(2, None).tolist()) == [0, 3, 4]
+    assert column.between(None, 1).tolist() == [2]
+    assert column.count(4, None) == 0
+
+
+@pytest.mark.parametrize(
+    "ranges",
+    [{}, {"bedrooms": (3, 3)}, {"year_built": (1990, None), "living_area_sqft": (None, 1500)}],
+)
+def test_store_ranking_matches_scoring_every_sale(ranges):
+    store = SalesStore(SalesTable.synthetic(20000), cell_degrees=0.01)
+    rng = np.random.default_rng(1)
+    for row in rng.choice(len(store), 20):
+        query = CompsQuery(
+            latitude=float(store.sales.latitude[row]) + 0.002,
+            longitude=float(store.sales.longitude[row]),
+            subject={"living_area_sqft": 1800.0, "bedrooms": 3.0, "year_built": 1990.0},
+            ranges=ranges,
+            k=8,
+        )
+        rows, _, penalties = store.rank(query)
+        everything = np.arange(len(store))[store._passes(np.arange(len(store)), ranges)]
+        distances = haversine_mi(
+            query.latitude,
+            query.longitude,
+            store.sales.latitude[everything],
+            store.sales.longitude[everything],
+        )
+        nearby = distances <= query.max_distance_mi
+        scores = store._score(everything[nearby], distances[nearby], query.subject)
+        expected = np.sort(scores)[: query.k]
+
+        assert np.allclose(penalties, expected)
+        for name, (low, high) in ranges.items():
+            values = store.columns[name][rows]
+            assert np.all(values >= (low if low is not None else -np.inf))
+            assert np.all(values <= (high if high is not None else np.inf))
+
+
+def test_live_index_matches_a_rebuild_through_updates_and_merges():
+    sales = SalesTable.synthetic(6000)
+    index = LiveSalesIndex(sales.take(np.arange(4000)), max_delta_segments=2, merge_ratio=0.3)
+    rng = np.random.default_rng(3)
+    live = dict.fromkeys(sales.sale_id[:4000].tolist())
+    snapshots = [index.snapshot()]
+    for start in range(4000, 6000, 250):
+        retired = rng.choice(list(live), 100, replace=False).tolist()
+        # Re-insert a few live sales under their own ids: an update, not a duplicate.
+        updated = [
+            int(sale_id.split("_")[1]) for sale_id in list(live)[:10] if sale_id not in retired
+        ]
+        rows = np.concatenate([np.arange(start, start + 250), updated])
+        index.apply(sales.take(rows), retired)
+        for sale_id in retired:
+            live.pop(sale_id)
+        live.update(dict.fromkeys(sales.sale_id[rows].tolist()))
+        snapshots.append(index.snapshot())
+    index.wait_for_merges()
+    final = index.snapshot()
+    index.close()
+
+    expected = SalesStore(sales.take(np.sort([int(i.split("_")[1]) for i in live])))
+    assert len(final) == len(live) == len(expected)
+    assert index.stats()["merges"] >= 1
+    assert len(snapshots[0]) == 4000  # old snapshots are untouched by later updates
+    subject = {"living_area_sqft": 1800.0, "bedrooms": 3.0}
+    batch = CompsBatch(
+        latitudes=rng.normal(41.88, 0.15, 12),
+        longitudes=rng.normal(-87.63, 0.15, 12),
+        subjects={name: np.full(12, value) for name, value in subject.items()},
+        k=6,
+    )
+    batched = final.search_batch(batch)
+    for position in range(len(batch)):
+        query = CompsQuery(
+            latitude=float(batch.latitudes[position]),
+            longitude=float(batch.longitudes[position]),
+            subject=subject,
+            k=6,
+        )
+        want = [comp.comparable_id for comp in expected.search(query)]
+        assert [comp.comparable_id for comp in final.search(query)] == want
+        assert [comp.comparable_id for comp in batched[position]] == want
+
+
+def test_comps_endpoint_ranks_and_filters_sales(monkeypatch):
+    from services.comparable_engine.app.main import app
+    from services.comparable_engine.app.settings import get_settings
+
+    monkeypatch.setenv("COMPS_SYNTHETIC_ROWS", "5000")
+    get_settings.cache_clear()
+    try:
+        with TestClient(app) as client:
+            params = {"class_": "real_estate", "latitude": 41.88, "longitude": -87.63}
+            nearest = client.get("/comps", params={**params, "k": 5}).json()["results"]
+            close = client.get("/comps", params={**params, "radius_mi": 0.5, "k": 100}).json()[
+                "results"
+            ]
+            other = client.get("/comps", params={**params, "class_": "auto"}).json()["results"]
+            filtered = client.get(
+                "/comps",
+                params={
+                    **params,
+                    "living_area_sqft": 2000,
+                    "min_bedrooms": 4,
+                    "sold_after": "2024-01-01",
+                },
+            ).json()["results"]
+    finally:
+        get_settings.cache_clear()
+
+    similarities = [comp["similarity"] for comp in nearest]
+    assert len(nearest) == 5
+    assert similarities == sorted(similarities, reverse=True)
+    assert {"bedrooms", "living_area_sqft"} <= nearest[0]["attributes"].keys()
+    assert close and all(comp["distance_mi"] <= 0.5 for comp in close)
+    assert other == []
+    assert len(filtered) == 10
+    assert all(comp["attributes"]["bedrooms"] >= 4 for comp in filtered)
+    assert all(comp["sale_date"] >= "2024-01-01" for comp in filtered)
+
+
+def test_batch_endpoint_streams_the_same_comps_as_single_calls(monkeypatch):
+    from services.comparable_engine.app.main import app
+    from services.comparable_engine.app.settings import get_settings
+
+    monkeypatch.setenv("COMPS_SYNTHETIC_ROWS", "5000")
+    monkeypatch.setenv("COMPS_BATCH_CHUNK_SIZE", "2")
+    get_settings.cache_clear()
+    subjects = [(41.88, -87.63, 1800.0), (41.95, -87.70, None), (41.80, -87.60, 2600.0)]
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/comps/batch",
+                json={
+                    "class": "real_estate",
+                    "latitude": [lat for lat, _, _ in subjects],
+                    "longitude": [lon for _, lon, _ in subjects],
+                    "living_area_sqft": [sqft for _, _, sqft in subjects],
+                    "filters": {"min_bedrooms": 2},
+                    "k": 4,
+                },
+            )
+            singles = []
+            for lat, lon, sqft in subjects:
+                params = {"class_": "real_estate", "latitude": lat, "longitude": lon, "k": 4}
+                params.update({"min_bedrooms": 2, **({"living_area_sqft": sqft} if sqft else {})})
+                singles.append(client.get("/comps", params=params).json()["results"])
+            mismatched = client.post(
+                "/comps/batch", json={"class": "real_estate", "latitude": [1.0], "longitude": []}
+            )
+            out_of_range = client.post(
+                "/comps/batch",
+                json={"class": "real_estate", "latitude": [41.9, 95.0], "longitude": [0.0, 200.0]},
+            )
+    finally:
+        get_settings.cache_clear()
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    for line, single in zip(lines, singles):
+        assert [comp["comparable_id"] for comp in line["results"]] == [
+            comp["comparable_id"] for comp in single
+        ]
+    assert mismatched.status_code == 422
+    assert out_of_range.status_code == 422
+    errors = {tuple(error["loc"][1:]) for error in out_of_range.json()["detail"]}
+    assert errors == {("latitude", 1), ("longitude", 1)}
+
+
+def test_sales_updates_endpoint_inserts_and_retires_comps(monkeypatch):
+    from services.comparable_engine.app.main import app
+    from services.comparable_engine.app.settings import get_settings
+
+    monkeypatch.setenv("COMPS_SYNTHETIC_ROWS", "5000")
+    get_settings.cache_clear()
+    sale = {
+        "sale_id": "feed-1",
+        "address": "1 Test Ave",
+        "price": 455000,
+        "latitude": 41.9001,
+        "longitude": -87.6401,
+        "bedrooms": 3,
+        "living_area_sqft": 1800,
+        "sale_date": "2024-06-29",
+    }
+    params = {"class_": "real_estate", "latitude": 41.9, "longitude": -87.64, "k": 3}
+    params.update({"living_area_sqft": 1800, "bedrooms": 3})
+    try:
+        with TestClient(app) as client:
+            inserted = client.post("/sales/updates", json={"sales": [sale]}).json()
+            first = client.get("/comps", params=params).json()["results"][0]
+            client.post("/sales/updates", json={"sales": [{**sale, "price": 470000}]})
+            updated = client.get("/comps", params=params).json()["results"]
+            retired = client.post("/sales/updates", json={"retired": ["feed-1"]}).json()
+            after = client.get("/comps", params=params).json()["results"]
+    finally:
+        get_settings.cache_clear()
+
+    assert inserted["live"] == 5001 and inserted["segments"][-1] == 1
+    assert first["comparable_id"] == "feed-1" and first["source"] == "feed"
+    assert [comp["price"] for comp in updated if comp["comparable_id"] == "feed-1"] == [470000]
+    assert retired["live"] == 5000
+    assert "feed-1" not in {comp["comparable_id"] for comp in after}
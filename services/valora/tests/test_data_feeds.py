@@ -2,14 +2,37 @@ import os
 
 os.environ.setdefault("DATA_FEED_RATE_LIMIT", "2")
 os.environ.setdefault("DATA_FEED_WINDOW_SECONDS", "60")
+os.environ.setdefault("DATA_FEED_RATE_LIMIT_STORE", "memory")
 
+import asyncio
+import random
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
-from services.data_feeds.app.main import app
+from services.data_feeds.app import security
+from services.data_feeds.app.cache import FeedCache
+from services.data_feeds.app.clients.external import DataFeedClient
+from services.data_feeds.app.main import app, lifespan
+from services.data_feeds.app.scheduler import FeedRefresher
+from valora_common.ratelimit import RateLimit
 
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module", autouse=True)
+def running_app():
+    with client:
+        yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limits():
+    # Every test starts with a full allowance, whatever ran before it.
+    security.rate_limiter.store.reset()
+
+
 def test_interest_rates_returns_sample():
     response = client.get("/feeds/interest-rates")
     assert response.status_code == 200
@@ -41,3 +64,238 @@ def test_rate_limit_enforced():
     # Third request should be throttled
     response = client.get("/feeds/interest-rates")
     assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_cache_fetches_once_per_key_for_concurrent_misses():
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"rate": calls}
+
+    cache = FeedCache(ttl_seconds=60, stale_seconds=600, max_entries=8)
+    waiters = [asyncio.create_task(cache.get("rates", fetch)) for _ in range(50)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(result == {"rate": 1} for result in results)
+    stats = cache.stats()["keys"]["rates"]
+    assert stats["misses"] == 50 and stats["coalesced"] == 49 and stats["fetches"] == 1
+
+
+async def test_cache_serves_stale_while_one_refresh_runs():
+    clock = FakeClock()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await release.wait()
+        return calls
+
+    cache = FeedCache(ttl_seconds=60, stale_seconds=600, max_entries=8, clock=clock)
+    assert await cache.get("rates", fetch) == 1
+    clock.now += 61
+    stale = await asyncio.gather(*(cache.get("rates", fetch) for _ in range(20)))
+    assert stale == [1] * 20 and calls == 2
+    release.set()
+    await asyncio.sleep(0.01)
+    assert await cache.get("rates", fetch) == 2
+    clock.now += 61 + 600
+    assert await cache.get("rates", fetch) == 3  # too old to serve: waits for the fetch
+
+    stats = cache.stats()["keys"]["rates"]
+    assert stats["stale_hits"] == 20 and stats["hits"] == 1 and stats["fetches"] == 3
+
+
+async def test_cache_keeps_stale_value_when_refresh_fails_and_bounds_size():
+    clock = FakeClock()
+
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    cache = FeedCache(ttl_seconds=60, stale_seconds=600, max_entries=2, clock=clock)
+
+    async def value():
+        return "ok"
+
+    await cache.get("a", value)
+    clock.now += 61
+    assert await cache.get("a", failing) == "ok"
+    await asyncio.sleep(0)
+    assert await cache.get("a", failing) == "ok"
+    assert cache.stats()["keys"]["a"]["errors"] >= 1
+    with pytest.raises(RuntimeError):
+        await cache.get("b", failing)
+
+    for key in ("c", "d", "e"):
+        await cache.get(key, value)
+    assert len(cache) == 2 and cache.stats()["evictions"] == 2
+
+
+async def test_cache_stats_stay_bounded_for_keys_that_never_store():
+    cache = FeedCache(ttl_seconds=60, stale_seconds=600, max_entries=3, clock=FakeClock())
+
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    async def value():
+        return "ok"
+
+    await cache.get("kept", value)
+    for index in range(50):
+        with pytest.raises(RuntimeError):
+            await cache.get(f"missing-{index}", failing)
+
+    keys = cache.stats()["keys"]
+    assert len(keys) == 3
+    assert keys["kept"]["misses"] == 1 and keys["missing-49"]["errors"] == 1
+
+
+def test_cache_stats_endpoint_reports_feed_keys():
+    client.get("/feeds/interest-rates")
+    client.get("/feeds/interest-rates")
+    stats = client.get("/feeds/cache/stats").json()
+    assert stats["keys"]["interest_rates"]["fetches"] == 1
+    assert stats["keys"]["interest_rates"]["hits"] >= 1
+
+
+async def test_feed_client_sends_every_call_through_the_shared_client(monkeypatch):
+    monkeypatch.setenv("PROPERTY_SALES_API_URL", "https://sales.example/v1")
+    monkeypatch.setenv("DATA_FEED_API_KEY", "secret")
+    seen = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"type": request.url.params["type"]})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as http:
+        feeds = DataFeedClient(http)
+        residential = await feeds.fetch_residential_sales()
+        commercial = await feeds.fetch_commercial_sales()
+
+    assert residential == {"type": "residential"} and commercial == {"type": "commercial"}
+    assert [request.headers["x-api-key"] for request in seen] == ["secret", "secret"]
+
+
+async def test_lifespan_opens_and_closes_one_pooled_client():
+    previous = app.state.feed_client
+    try:
+        async with lifespan(app):
+            http = app.state.feed_client._http
+            assert isinstance(http, httpx.AsyncClient) and not http.is_closed
+        assert http.is_closed
+    finally:
+        app.state.feed_client = previous
+
+
+async def test_refresher_backs_off_on_failures_and_recovers():
+    clock = FakeClock()
+    cache = FeedCache(ttl_seconds=300, stale_seconds=600, max_entries=8, clock=clock)
+    outcomes = [RuntimeError("down"), RuntimeError("down"), RuntimeError("down"), {"v": 1}]
+
+    async def fetch():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    refresher = FeedRefresher(
+        cache,
+        {"rates": fetch},
+        interval_seconds=240,
+        retry_base_seconds=2,
+        retry_max_seconds=5,
+        clock=clock,
+        rng=random.Random(0),
+    )
+    delays = []
+    for _ in range(4):
+        await refresher.refresh("rates")
+        delays.append(refresher.stats()["feeds"]["rates"]["next_refresh_in_seconds"])
+    clock.now += 30
+    feed = refresher.stats()["feeds"]["rates"]
+
+    assert 1 <= delays[0] <= 2 and 2 <= delays[1] <= 4 and 2.5 <= delays[2] <= 5
+    assert 216 <= delays[3] <= 264
+    assert feed["failures"] == 3 and feed["consecutive_failures"] == 0
+    assert feed["last_refresh_age_seconds"] == 30
+    assert await cache.get("rates", fetch) == {"v": 1}
+
+
+async def test_refresher_runs_each_feed_on_its_own_schedule():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    cache = FeedCache(ttl_seconds=0.05, stale_seconds=0, max_entries=8)
+    refresher = FeedRefresher(cache, {"rates": fetch}, interval_seconds=0.01, jitter=0.5)
+    await refresher.start()
+    await asyncio.sleep(0.1)
+    await refresher.stop()
+    settled = len(calls)
+    await asyncio.sleep(0.03)
+
+    assert settled >= 3 and len(calls) == settled
+
+
+def test_feed_status_reports_last_refresh_age_per_feed():
+    status = client.get("/feeds/status").json()
+    assert set(status["feeds"]) == {"interest_rates", "residential_sales", "commercial_sales"}
+    for feed in status["feeds"].values():
+        assert feed["refreshes"] >= 1 and feed["last_refresh_age_seconds"] is not None
+
+
+def test_feed_routes_serve_cached_bytes_with_etags(monkeypatch):
+    monkeypatch.setattr(security.rate_limiter, "limit", RateLimit(100, 60))
+    plain = client.get("/feeds/interest-rates", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/feeds/interest-rates", headers={"Accept-Encoding": "gzip"})
+    revalidated = client.get(
+        "/feeds/interest-rates", headers={"If-None-Match": f'"stale", {plain.headers["etag"]}'}
+    )
+    other_variant = client.get(
+        "/feeds/interest-rates",
+        headers={"Accept-Encoding": "identity", "If-None-Match": zipped.headers["etag"]},
+    )
+
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.json() == plain.json()
+    assert plain.headers["etag"] != zipped.headers["etag"]
+    assert plain.headers["etag"].startswith('"') and plain.headers["vary"] == "Accept-Encoding"
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert other_variant.status_code == 304
+
+
+def test_feed_routes_honour_accept_encoding_q_values(monkeypatch):
+    monkeypatch.setattr(security.rate_limiter, "limit", RateLimit(100, 60))
+
+    def encoding(accept: str):
+        response = client.get("/feeds/interest-rates", headers={"Accept-Encoding": accept})
+        return response.headers.get("content-encoding")
+
+    assert encoding("gzip;q=0, identity") is None
+    assert encoding("GZIP; q=0.0") is None
+    assert encoding("*;q=0") is None
+    assert encoding("*, gzip;q=0") is None
+    assert encoding("br") is None
+    assert encoding("gzip;q=0.5, identity;q=1") == "gzip"
+    assert encoding("deflate, *") == "gzip"
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.model_serving.app.explain import AttributionEngine
+from services.model_serving.app.quantize import FeatureQuantizer
+from services.model_serving.app.trees import TreeEnsemble
+from services.valuation_orchestrator.app.pipelines.real_estate import RealEstatePipeline
+from valora_common.cache import LRUTTLCache
+
+FEATURES = ("living_area_sqft", "latitude")
+
+
+def _model(version: str = "v1") -> TreeEnsemble:
+    # sqft <= 2000 ? (150 | 250) : 400, internal nodes carry their subtree means
+    tree = (
+        np.array([0, 1, -2, -2, -2]),
+        np.array([2000.0, 41.9, -2, -2, -2]),
+        np.array([1, 3, -1, -1, -1]),
+        np.array([2, 4, -1, -1, -1]),
+        None,
+        np.array([250.0, 200.0, 400.0, 150.0, 250.0]),
+    )
+    return TreeEnsemble.from_arrays([tree], base_score=0.0, feature_names=FEATURES, version=version)
+
+
+def test_quantizer_snaps_near_identical_rows_together():
+    quantizer = FeatureQuantizer.from_spec("latitude=0.01", significant_digits=3)
+    rows = np.array([[1602, 41.881], [1600, 41.879], [1650, 41.95], [np.nan, 0]])
+
+    quantized = quantizer.quantize(rows, FEATURES)
+    keys = quantizer.keys(quantized)
+
+    assert keys[0] == keys[1]
+    assert keys[2] != keys[0]
+    assert np.isnan(quantized[3, 0]) and quantized[3, 1] == 0
+
+
+def test_attributions_are_cached_by_version_and_quantized_row():
+    engine = AttributionEngine(FeatureQuantizer(), LRUTTLCache(max_entries=100, ttl_seconds=60))
+    rows = np.array([[1602, 41.8], [1600, 41.8], [2500, 41.8]])
+
+    bias, contributions = engine.contributions(_model(), rows)
+    engine.contributions(_model(), rows[:1])
+    engine.contributions(_model("v2"), rows[:1])
+
+    assert bias == 250.0
+    assert contributions[0].tolist() == contributions[1].tolist() == [-50.0, -50.0]
+    assert contributions[2].tolist() == [150.0, 0.0]
+    stats = engine.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 3, 3)
+
+
+def test_explain_endpoint_uses_registry_model(tmp_path, monkeypatch):
+    from services.model_serving.app.main import app
+    from services.model_serving.app.settings import get_settings
+
+    _model().save(tmp_path / "real_estate" / "default" / "v1")
+    monkeypatch.setenv("MODEL_REGISTRY_PATH", str(tmp_path))
+    get_settings.cache_clear()
+    try:
+        with TestClient(app) as client:
+            payload = {
+                "class": "real_estate",
+                "attributes": {"living_area_sqft": 1500, "latitude": 42.0},
+            }
+            explanations = client.post("/explain", json=payload).json()["explanations"]
+            client.post("/explain", json=payload)
+            stats = client.get("/explain/stats").json()
+    finally:
+        get_settings.cache_clear()
+
+    assert [(item["feature"], item["direction"]) for item in explanations] == [
+        ("living_area_sqft", "-"),
+        ("latitude", "+"),
+    ]
+    assert explanations[0]["contribution"] == -50.0
+    assert stats["cache"]["hits"] == 1
+
+
+def test_pipeline_explanations_follow_the_baseline_formula():
+    pipeline = RealEstatePipeline()
+    rows = [
+        {"living_area_sqft": 2000, "bedrooms": 2},
+        {"living_area_sqft": 2003, "bedrooms": 2},
+        {},
+    ]
+
+    explanations = pipeline._batch_explanations(rows)
+
+    sqft, bedrooms = explanations[0]
+    assert (sqft.feature, sqft.direction) == ("living_area_sqft", "+")
+    assert (bedrooms.feature, bedrooms.direction) == ("bedrooms", "-")
+    assert sqft.magnitude == pytest.approx(90000 / 102000, abs=1e-4)
+    assert explanations[1] is explanations[0]
+    assert explanations[2] == []
@@ -0,0 +1,125 @@
+import base64
+import sys
+from pathlib import Path
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "real_estate"))
+
+from ml.model_inference import analyze_images, analyze_images_batch  # noqa: E402
+
+
+def _encode(image) -> str:
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return base64.b64encode(encoded.tobytes()).decode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def photos():
+    rng = np.random.default_rng(0)
+    bright_sharp = rng.integers(100, 256, size=(64, 64, 3), dtype=np.uint8)
+    dark_flat = np.full((64, 64, 3), 30, dtype=np.uint8)
+    return [_encode(bright_sharp), _encode(dark_flat), _encode(bright_sharp)]
+
+
+def test_batch_matches_sequential_verdict(photos):
+    sequential = analyze_images(photos)
+    batch = analyze_images_batch(photos, max_workers=2)
+
+    assert {key: batch[key] for key in sequential} == sequential
+    assert [image["condition"] for image in batch["images"]] == ["good", "fair", "good"]
+    assert batch["images"][1]["brightness"] == pytest.approx(30.0)
+
+
+def test_batch_reports_undecodable_images(photos):
+    garbage = base64.b64encode(b"not an image").decode("utf-8")
+
+    result = analyze_images_batch([photos[1], garbage], max_workers=1)
+
+    assert result["images"][1] == {"error": "undecodable image"}
+    assert result["condition"] == "fair"
+
+
+def test_undecodable_images_are_reported_with_or_without_a_cache(photos, tmp_path):
+    from ml.analysis_cache import ImageAnalysisCache
+
+    garbage = base64.b64encode(b"not an image").decode("utf-8")
+    cache = ImageAnalysisCache(str(tmp_path / "scores.db"), max_entries=10)
+
+    uncached = analyze_images([photos[0], garbage])
+    assert uncached == analyze_images([photos[0], garbage], cache=cache)
+    assert uncached["condition"] == "good"
+
+
+def test_cache_skips_repeat_photos(photos, tmp_path):
+    from ml.analysis_cache import ImageAnalysisCache
+
+    cache = ImageAnalysisCache(str(tmp_path / "scores.db"), max_entries=10)
+    first = analyze_images_batch(photos, max_workers=1, cache=cache)
+    second = analyze_images(photos, cache=cache)
+
+    # photos[0] and photos[2] share content, so only two distinct hashes exist
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert {key: first[key] for key in second} == second
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    from ml.analysis_cache import ImageAnalysisCache
+
+    cache = ImageAnalysisCache(str(tmp_path / "scores.db"), max_entries=2)
+    cache.put("a", {"condition": "good"})
+    cache.put("b", {"condition": "fair"})
+    cache.get("a")
+    cache.put("c", {"condition": "good"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"condition": "good"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_fast_path_scores_reduced_grayscale(photos, tmp_path):
+    from ml.analysis_cache import ImageAnalysisCache
+    from ml.model_inference import FAST_REDUCTION
+
+    cache = ImageAnalysisCache(str(tmp_path / "scores.db"), max_entries=10)
+    full = analyze_images_batch(photos, max_workers=1, cache=cache)
+    fast = analyze_images_batch(photos, max_workers=1, cache=cache, fast=True)
+
+    assert fast == analyze_images_batch(photos, max_workers=1, reduction=FAST_REDUCTION)
+
+    assert fast["images"][1]["brightness"] == pytest.approx(full["images"][1]["brightness"], abs=1)
+    assert fast["images"][1]["condition"] == "fair"
+    # fast-path scores never answer a full-resolution lookup, or the other way round
+    assert cache.stats()["size"] == 4
+    with pytest.raises(ValueError):
+        analyze_images(photos, reduction=3)
+
+
+def test_binary_ingest_matches_base64_path(photos):
+    from ml.ingest import image_buffers_from_body
+    from ml.model_inference import analyze_image_buffers
+
+    raw = [base64.b64decode(photo) for photo in photos]
+    body = b"".join(
+        b'--xyz\r\nContent-Disposition: form-data; name="images"; filename="p.png"\r\n'
+        b"Content-Type: image/png\r\n\r\n" + photo + b"\r\n"
+        for photo in raw
+    ) + b'--xyz\r\nContent-Disposition: form-data; name="assetId"\r\n\r\ndemo\r\n--xyz--\r\n'
+
+    buffers = image_buffers_from_body(body, "multipart/form-data; boundary=xyz")
+
+    assert [bytes(buffer) for buffer in buffers] == raw
+    assert all(buffer.obj is body for buffer in buffers)
+    result = analyze_image_buffers(buffers)
+    assert {key: result[key] for key in analyze_images(photos)} == analyze_images(photos)
+    assert image_buffers_from_body(raw[1], "image/png")[0].obj is raw[1]
+    with pytest.raises(ValueError):
+        image_buffers_from_body(body, "application/json")
+    with pytest.raises(ValueError, match="Unterminated"):
+        image_buffers_from_body(body[:-9], "multipart/form-data; boundary=xyz")
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.valuation_orchestrator.app.storage.jobs import InMemoryJobStore, SQLiteJobStore
+from valora_common.schemas.valuation import JobProgress, ValuationResponse
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        job_store = InMemoryJobStore(ttl_seconds=60)
+    else:
+        job_store = SQLiteJobStore(tmp_path / "jobs.db", ttl_seconds=60)
+    yield job_store
+    job_store.close()
+
+
+def _response(estimate: float) -> ValuationResponse:
+    return ValuationResponse(
+        valuation_id="val_test",
+        estimate=estimate,
+        confidence=0.7,
+        interval_low=estimate * 0.9,
+        interval_high=estimate * 1.1,
+        method="test",
+        explanations=[],
+        comps=[],
+    )
+
+
+def test_create_update_get_round_trip(store):
+    store.create("job_1", total=2)
+    store.update("job_1", status="running", progress=JobProgress(processed=1, total=2, succeeded=1))
+    status = store.update("job_1", status="succeeded", results=[_response(1000.0)])
+
+    assert status.status == "succeeded"
+    assert status.progress.succeeded == 1
+    assert store.get("job_1") == status
+    assert [result.estimate for result in store.get_results("job_1")] == [1000.0]
+
+
+def test_missing_job_raises_key_error(store):
+    with pytest.raises(KeyError):
+        store.get("job_missing")
+    with pytest.raises(KeyError):
+        store.update("job_missing", status="failed")
+
+
+def test_list_jobs_filters_by_status(store):
+    store.create("job_a")
+    store.create("job_b")
+    store.update("job_b", status="failed", error="boom")
+
+    assert [job.job_id for job in store.list_jobs(status="failed")] == ["job_b"]
+    assert {job.job_id for job in store.list_jobs()} == {"job_a", "job_b"}
+
+
+def test_purge_removes_every_job_past_retention(store):
+    store.create("job_done")
+    store.update("job_done", status="succeeded")
+    store.create("job_abandoned")
+
+    assert store.purge_expired(now=datetime.utcnow()) == 0
+    assert store.purge_expired(now=datetime.utcnow() + timedelta(seconds=120)) == 2
+    assert store.list_jobs() == []
+
+
+def test_fail_stale_only_touches_old_unfinished_jobs(store):
+    store.create("job_queued")
+    store.create("job_running")
+    store.update("job_running", status="running")
+    store.create("job_done")
+    store.update("job_done", status="succeeded")
+
+    assert store.fail_stale(datetime.utcnow() - timedelta(seconds=60), "interrupted") == 0
+    assert store.fail_stale(datetime.utcnow() + timedelta(seconds=1), "interrupted") == 2
+    assert {job.job_id for job in store.list_jobs(status="failed")} == {"job_queued", "job_running"}
+    assert store.get("job_running").error == "interrupted"
+    assert store.get("job_done").status == "succeeded"
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+from services.valuation_orchestrator.app.storage.jobs import InMemoryJobStore
+from services.valuation_orchestrator.app.workers import JobWorkerPool
+from valora_common.schemas.valuation import ValuationRequest
+
+
+async def test_job_with_failing_item_is_partial():
+    store = InMemoryJobStore()
+    pool = JobWorkerPool(store, processes=0, concurrency=1, chunk_size=1)
+    await pool.start()
+    try:
+        job = await pool.enqueue(
+            [
+                ValuationRequest(class_="auto", attributes={"make": "Toyota", "mileage": 42000}),
+                ValuationRequest(
+                    class_="auto", attributes={"make": "Toyota", "mileage": "unknown"}
+                ),
+            ]
+        )
+        for _ in range(200):
+            status = store.get(job.job_id)
+            if status.status not in ("queued", "running"):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await pool.stop()
+
+    assert status.status == "partial"
+    assert status.progress.succeeded == 1
+    assert status.progress.failed == 1
+    assert "TypeError" in (status.error or "")
+    assert len(store.get_results(job.job_id)) == 1
+    assert pool.stats()["completed"]["partial"] == 1
+
+
+class _ThreadRecordingStore(InMemoryJobStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads = set()
+
+    def create(self, job_id, *, total=0):
+        self.threads.add(threading.get_ident())
+        return super().create(job_id, total=total)
+
+    def update(self, job_id, **changes):
+        self.threads.add(threading.get_ident())
+        return super().update(job_id, **changes)
+
+
+async def test_job_store_calls_stay_off_the_event_loop():
+    store = _ThreadRecordingStore()
+    pool = JobWorkerPool(store, processes=0, concurrency=1)
+    await pool.start()
+    try:
+        job = await pool.enqueue([ValuationRequest(class_="auto", attributes={"make": "Toyota"})])
+        for _ in range(200):
+            if store.get(job.job_id).status not in ("queued", "running"):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await pool.stop()
+
+    assert store.get(job.job_id).status == "succeeded"
+    assert store.threads and threading.get_ident() not in store.threads
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.model_serving.app.predictor import BaselinePredictor, PredictionCache
+from services.model_serving.app.quantize import FeatureQuantizer
+from services.model_serving.app.registry import ModelNotFoundError, ModelRegistry
+from services.model_serving.app.trees import TreeEnsemble
+from valora_common.cache import LRUTTLCache
+from valora_common.schemas.valuation import ValuationRequest
+
+
+def _constant_model(value: float) -> TreeEnsemble:
+    leaf = (np.array([-2]), np.array([-2.0]), np.array([-1]), np.array([-1]), None, np.array([0.0]))
+    return TreeEnsemble.from_arrays([leaf], base_score=value, feature_names=("living_area_sqft",))
+
+
+@pytest.fixture
+def model_root(tmp_path):
+    _constant_model(100.0).save(tmp_path / "real_estate" / "default" / "v1")
+    _constant_model(200.0).save(tmp_path / "real_estate" / "default" / "v2")
+    _constant_model(300.0).save(tmp_path / "real_estate" / "midwest" / "v1")
+    return tmp_path
+
+
+def _score(model: TreeEnsemble) -> float:
+    return float(model.predict(np.zeros((1, 1)))[0])
+
+
+def test_models_load_lazily_and_regions_fall_back(model_root):
+    registry = ModelRegistry(model_root)
+    assert registry.stats()["loads"] == 0
+
+    assert _score(registry.get("real_estate", "midwest")) == 300.0
+    assert _score(registry.get("real_estate", "south")) == 200.0  # highest version, default region
+    assert registry.get("auto") is None
+    assert isinstance(registry.get("real_estate").value, np.memmap)
+    assert registry.stats()["loads"] == 2
+
+
+def test_unknown_regions_share_the_default_entry(model_root):
+    registry = ModelRegistry(model_root)
+    for index in range(500):
+        registry.get("real_estate", f"region-{index}")
+    assert _score(registry.get("real_estate", "../default")) == 200.0
+    assert _score(registry.get("real_estate", "midwest/../../real_estate/midwest")) == 200.0
+    assert set(registry.stats()["active"]) == {"real_estate/default"}
+    with pytest.raises(ModelNotFoundError):
+        registry.activate("real_estate", "../real_estate/default", "v1")
+
+    # a region directory added later is served after the next refresh
+    _constant_model(400.0).save(model_root / "real_estate" / "south" / "v1")
+    registry.refresh()
+    assert _score(registry.get("real_estate", "south")) == 400.0
+
+
+def test_least_recently_used_model_is_unmapped(model_root):
+    registry = ModelRegistry(model_root, max_resident=1)
+    registry.get("real_estate", "midwest")
+    registry.get("real_estate")
+
+    stats = registry.stats()
+    assert stats["resident"] == ["real_estate/default/v2"]
+    assert stats["evictions"] == 1
+
+
+def test_activate_swaps_atomically_and_reaches_other_workers(model_root):
+    registry = ModelRegistry(model_root)
+    other_worker = ModelRegistry(model_root)
+    swaps = []
+    registry.add_swap_listener(lambda *swap: swaps.append(swap))
+    in_flight = registry.get("real_estate")
+    other_worker.get("real_estate")
+
+    registry.activate("real_estate", "default", "v1")
+    other_worker.refresh()
+
+    assert _score(in_flight) == 200.0
+    assert _score(registry.get("real_estate")) == 100.0
+    assert _score(other_worker.get("real_estate")) == 100.0
+    assert swaps == [("real_estate", "default", "v2", "v1")]
+    with pytest.raises(ModelNotFoundError):
+        registry.activate("real_estate", "default", "v9")
+
+
+def test_prediction_cache_shares_near_identical_rows_until_a_swap(model_root):
+    registry = ModelRegistry(model_root)
+    cache = PredictionCache(FeatureQuantizer(), LRUTTLCache(max_entries=100, ttl_seconds=60))
+    registry.add_swap_listener(cache.invalidate)
+    predictor = BaselinePredictor(registry, cache=cache)
+    requests = [
+        ValuationRequest.model_validate(
+            {"class": "real_estate", "attributes": {"living_area_sqft": sqft}}
+        )
+        for sqft in (1600, 1602, 1598, 2400)
+    ]
+
+    first = predictor.predict_batch(requests)
+    again = predictor.predict_batch(requests[:1])
+    registry.activate("real_estate", "default", "v1")
+    swapped = predictor.predict_batch(requests[:1])
+
+    assert [result["estimate"] for result in first] == [200.0] * 4
+    stats = cache.cache.stats()
+    assert (stats["misses"], stats["hits"], stats["size"]) == (3, 1, 1)
+    assert again[0]["estimate"] == 200.0
+    assert swapped[0]["estimate"] == 100.0
+
+
+def test_activate_endpoint(model_root, monkeypatch):
+    from services.model_serving.app.main import app
+    from services.model_serving.app.settings import get_settings
+
+    monkeypatch.setenv("MODEL_REGISTRY_PATH", str(model_root))
+    get_settings.cache_clear()
+    try:
+        with TestClient(app) as client:
+            payload = {"class": "real_estate", "attributes": {"living_area_sqft": 1800}}
+            before = client.post("/predict", json=payload).json()["estimate"]
+            activated = client.post("/models/real_estate/default/activate", json={"version": "v1"})
+            after = client.post("/predict", json=payload).json()["estimate"]
+            missing = client.post("/models/real_estate/default/activate", json={"version": "v9"})
+            cache = client.get("/predict/stats").json()["cache"]
+    finally:
+        get_settings.cache_clear()
+
+    assert (before, after) == (200.0, 100.0)
+    assert activated.status_code == 200
+    assert missing.status_code == 404
+    assert (cache["misses"], cache["size"]) == (2, 1)
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from services.model_serving.app.batching import MicroBatcher
+from services.model_serving.app.main import app
+from services.model_serving.app.settings import get_settings
+
+
+def test_predict_runs_through_batcher():
+    with TestClient(app) as client:
+        response = client.post(
+            "/predict", json={"class": "real_estate", "attributes": {"living_area_sqft": 2000}}
+        )
+        stats = client.get("/predict/stats").json()
+
+    assert response.status_code == 200
+    assert response.json() == {"estimate": 420000.0, "confidence": 0.74}
+    assert stats["items"] == 1
+
+
+async def test_malformed_payload_does_not_fail_its_batch(monkeypatch):
+    monkeypatch.setenv("PREDICT_BATCH_WINDOW_MS", "20")
+    get_settings.cache_clear()
+    sizes = [2000, "abc", None, 1000]
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://model") as client:
+                responses = await asyncio.gather(
+                    *(
+                        client.post(
+                            "/predict",
+                            json={"class": "real_estate", "attributes": {"living_area_sqft": sqft}},
+                        )
+                        for sqft in sizes
+                    )
+                )
+                stats = (await client.get("/predict/stats")).json()
+    finally:
+        get_settings.cache_clear()
+
+    assert [response.status_code for response in responses] == [200, 422, 422, 200]
+    assert responses[0].json()["estimate"] == 420000.0
+    assert responses[3].json()["estimate"] == 210000.0
+    assert stats["batches"] == 1
+
+
+async def test_concurrent_calls_share_a_batch():
+    calls = []
+
+    def handler(items):
+        calls.append(list(items))
+        return [ValueError("odd") if item % 2 else item * 10 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=4, window_ms=50)
+    await batcher.start()
+    try:
+        results = await asyncio.gather(
+            *(batcher.submit(item) for item in range(6)), return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+    # a full batch closes before its window, the remainder waits out the window
+    assert [len(batch) for batch in calls] == [4, 2]
+    assert results[0] == 0 and results[4] == 40
+    assert isinstance(results[1], ValueError)
+    assert batcher.stats()["largest_batch"] == 4
+
+
+async def test_batch_filled_by_staggered_calls_closes_before_its_window():
+    calls = []
+
+    def handler(items):
+        calls.append(list(items))
+        return items
+
+    batcher = MicroBatcher(handler, max_batch_size=4, window_ms=1000)
+    await batcher.start()
+    try:
+        began = time.perf_counter()
+        pending = []
+        for item in range(4):
+            # each call arrives after the collector has taken the first one off the queue
+            pending.append(asyncio.create_task(batcher.submit(item)))
+            await asyncio.sleep(0.01)
+        results = await asyncio.gather(*pending)
+        elapsed = time.perf_counter() - began
+    finally:
+        await batcher.stop()
+
+    assert calls == [[0, 1, 2, 3]] and results == [0, 1, 2, 3]
+    assert elapsed < 0.5
+
+
+async def test_handler_failure_fails_only_the_items_that_cause_it():
+    def handler(items):
+        if 13 in items:
+            raise TypeError("unlucky")
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=8, window_ms=20)
+    await batcher.start()
+    try:
+        results = await asyncio.gather(
+            *(batcher.submit(item) for item in (1, 13, 2)), return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+    assert results[0] == 10 and results[2] == 20
+    assert isinstance(results[1], TypeError)
+
+
+async def test_handler_failure_fails_whole_batch():
+    def handler(items):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(handler, max_batch_size=8, window_ms=1)
+    await batcher.start()
+    try:
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    finally:
+        await batcher.stop()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        await batcher.submit(3)
@@ -0,0 +1,155 @@
+import multiprocessing
+import sqlite3
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from valora_common.ratelimit import (
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    SQLiteBucketStore,
+    create_bucket_store,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBucketStore()
+    else:
+        store = SQLiteBucketStore(str(tmp_path / "buckets.sqlite3"))
+        yield store
+        store.close()
+
+
+def test_burst_is_capped_across_a_window_boundary(store):
+    # A fixed window lets 2x the limit through around its edge; a bucket does not.
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(10, 60), store, scope="test", clock=clock)
+    clock.now = 1059.0
+    assert sum(limiter.check("client").allowed for _ in range(20)) == 10
+    clock.now = 1061.0
+    assert sum(limiter.check("client").allowed for _ in range(20)) == 0
+
+
+def test_tokens_refill_at_the_average_rate(store):
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(2, 60, burst=3), store, scope="test", clock=clock)
+    assert [limiter.check("client").allowed for _ in range(4)] == [True, True, True, False]
+
+    denied = limiter.check("client")
+    assert denied.remaining == 0 and denied.retry_after == pytest.approx(30.0)
+    clock.now += 29.9
+    assert not limiter.check("client").allowed
+    clock.now += 0.1
+    assert limiter.check("client").allowed
+    clock.now += 90.0
+    assert limiter.check("client").remaining == 2
+    assert limiter.check("other").remaining == 2
+
+
+def test_scopes_have_separate_allowances(store):
+    clock = FakeClock()
+    gateway = RateLimiter(RateLimit(1, 60), store, scope="gateway", clock=clock)
+    marketplace = RateLimiter(RateLimit(1, 60), store, scope="marketplace", clock=clock)
+    assert gateway.check("client").allowed and marketplace.check("client").allowed
+    assert not gateway.check("client").allowed
+
+
+def test_memory_store_drops_refilled_and_excess_buckets():
+    clock = FakeClock()
+    store = MemoryBucketStore(max_entries=3)
+    limiter = RateLimiter(RateLimit(1, 10), store, scope="test", clock=clock)
+    for client in ("a", "b", "c", "d"):
+        limiter.check(client)
+    assert len(store) == 3
+
+    clock.now += 10.0
+    limiter.check("e")
+    assert len(store) == 1 and store.evictions == 4
+
+
+def test_sqlite_store_prunes_refilled_buckets(tmp_path):
+    clock = FakeClock()
+    store = SQLiteBucketStore(str(tmp_path / "buckets.sqlite3"), prune_interval_seconds=5)
+    limiter = RateLimiter(RateLimit(1, 10), store, scope="test", clock=clock)
+    for client in ("a", "b", "c"):
+        limiter.check(client)
+    assert len(store) == 3
+
+    clock.now += 10.0
+    limiter.check("d")
+    assert len(store) == 1
+    store.close()
+
+
+def _take_all(path: str, attempts: int) -> int:
+    # A generous busy timeout: this test counts exact grants, so none may fail open.
+    store = SQLiteBucketStore(path, busy_timeout_seconds=5.0)
+    limiter = RateLimiter(RateLimit(50, 3600), store, scope="test")
+    return sum(limiter.check("client").allowed for _ in range(attempts))
+
+
+def test_sqlite_store_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "buckets.sqlite3")
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        allowed = pool.starmap(_take_all, [(path, 40), (path, 40)])
+    assert sum(allowed) == 50
+
+
+def test_dependency_answers_429_with_retry_after():
+    limiter = RateLimiter(RateLimit(1, 60), MemoryBucketStore(), scope="test")
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(limiter)])
+    async def limited() -> dict:
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/limited").status_code == 200
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Rate limit exceeded"}
+    assert response.headers["retry-after"] == "60"
+
+
+def test_sqlite_store_fails_open_while_another_worker_holds_the_lock(tmp_path):
+    path = str(tmp_path / "buckets.sqlite3")
+    store = SQLiteBucketStore(path, busy_timeout_seconds=0.01)
+    limiter = RateLimiter(RateLimit(1, 60), store, scope="test")
+    assert limiter.check("client").allowed
+
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    try:
+        began = time.perf_counter()
+        decision = limiter.check("client")
+        waited = time.perf_counter() - began
+    finally:
+        other_worker.execute("ROLLBACK")
+        other_worker.close()
+
+    assert decision.allowed and store.failed_open == 1
+    assert waited < 0.5
+    assert not limiter.check("client").allowed
+    store.close()
+
+
+def test_old_sqlite_falls_back_to_memory(monkeypatch, tmp_path):
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 31, 1))
+    with pytest.raises(RuntimeError, match="3.35"):
+        SQLiteBucketStore(str(tmp_path / "buckets.sqlite3"))
+    with pytest.warns(RuntimeWarning):
+        store = create_bucket_store(str(tmp_path / "buckets.sqlite3"))
+    assert isinstance(store, MemoryBucketStore)
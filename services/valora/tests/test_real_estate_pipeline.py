@@ -1,4 +1,7 @@
-from services.valuation_orchestrator.app.pipelines.real_estate import RealEstatePipeline
+from services.valuation_orchestrator.app.pipelines.real_estate import (
+    RealEstatePipeline,
+    _top_explanations,
+)
 from valora_common.schemas.valuation import ValuationRequest
 
 
@@ -22,3 +25,69 @@ def test_real_estate_pipeline_returns_estimate():
     assert valuation.interval_low < valuation.interval_high
     assert valuation.method == "baseline_gbr_v0"
     assert valuation.comps
+
+
+def test_real_estate_batch_matches_single_valuation():
+    pipeline = RealEstatePipeline()
+    requests = [
+        ValuationRequest(
+            class_="real_estate",
+            attributes={
+                "address": f"{index} Elm St",
+                "living_area_sqft": 900 + index * 250,
+                "bedrooms": 2 + index % 3,
+            },
+        )
+        for index in range(5)
+    ]
+
+    batch = pipeline.valuate_batch(requests)
+
+    assert len(batch) == len(requests)
+    for request, valuation in zip(requests, batch):
+        single = RealEstatePipeline().valuate(request)
+        assert valuation.estimate == single.estimate
+        assert valuation.interval_low == single.interval_low
+        assert valuation.interval_high == single.interval_high
+        assert valuation.confidence == single.confidence
+
+
+def test_cache_key_covers_pricing_attributes():
+    pipeline = RealEstatePipeline()
+    small = ValuationRequest(
+        class_="real_estate", attributes={"address": "9 Pine Rd", "living_area_sqft": 1200}
+    )
+    large = ValuationRequest(
+        class_="real_estate", attributes={"address": "9 Pine Rd", "living_area_sqft": 2400}
+    )
+    same_as_small = ValuationRequest(
+        class_="real_estate", attributes={"living_area_sqft": 1200.0, "address": " 9 pine  RD"}
+    )
+
+    first = pipeline.valuate(small)
+    second = pipeline.valuate(large)
+    repeat = pipeline.valuate(same_as_small)
+
+    assert second.estimate > first.estimate
+    assert repeat.metadata["cache_hit"] is True
+    assert repeat.estimate == first.estimate
+    stats = pipeline.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_cache_is_bounded():
+    pipeline = RealEstatePipeline(cache_max_entries=2)
+    for sqft in (1000, 1100, 1200):
+        pipeline.valuate(
+            ValuationRequest(class_="real_estate", attributes={"living_area_sqft": sqft})
+        )
+
+    stats = pipeline.cache_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_non_finite_contributions_are_left_out_of_explanations():
+    explanations = _top_explanations(["living_area_sqft", "bedrooms"], [float("nan"), -9000.0])
+
+    assert [(item.feature, item.magnitude) for item in explanations] == [("bedrooms", 1.0)]
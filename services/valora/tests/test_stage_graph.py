@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from services.model_serving.app.main import app as model_serving_app
+from services.valuation_orchestrator.app.clients import DownstreamClients
+from services.valuation_orchestrator.app.pipelines.real_estate import RealEstatePipeline
+from services.valuation_orchestrator.app.stages import (
+    Stage,
+    StageFailedError,
+    StageGraph,
+    StageGraphError,
+)
+from services.valuation_orchestrator.app.storage.result_cache import SQLiteValuationCache
+from valora_common.schemas.valuation import ValuationRequest
+
+
+def _sleeper(seconds, value):
+    async def run(context):
+        await asyncio.sleep(seconds)
+        return value
+
+    return run
+
+
+async def test_independent_stages_overlap():
+    graph = StageGraph([Stage(name, _sleeper(0.1, name)) for name in ("a", "b", "c")])
+
+    started = time.perf_counter()
+    result = await graph.run({})
+
+    assert time.perf_counter() - started < 0.25
+    assert result.outputs == {"a": "a", "b": "b", "c": "c"}
+    assert result.metadata()["stages"]["a"]["status"] == "ok"
+
+
+async def test_dependent_stage_sees_upstream_output():
+    async def double(context):
+        return context["base"] * 2
+
+    graph = StageGraph(
+        [Stage("double", double, depends_on=("base",)), Stage("base", _sleeper(0, 21))]
+    )
+
+    assert (await graph.run({})).outputs["double"] == 42
+
+
+async def test_timeout_uses_fallback_and_failure_without_one_raises():
+    async def broken(context):
+        raise RuntimeError("boom")
+
+    graph = StageGraph(
+        [
+            Stage(
+                "slow",
+                _sleeper(1, "late"),
+                timeout_seconds=0.05,
+                fallback=lambda context: "fallback",
+            )
+        ]
+    )
+    result = await graph.run({})
+    assert result.outputs["slow"] == "fallback"
+    assert result.timings["slow"].status == "timeout"
+    assert result.timings["slow"].fallback is True
+
+    with pytest.raises(StageFailedError, match="boom"):
+        await StageGraph([Stage("broken", broken)]).run({})
+    with pytest.raises(StageGraphError):
+        StageGraph([Stage("a", broken, depends_on=("b",)), Stage("b", broken, depends_on=("a",))])
+
+
+async def test_real_estate_stages_mix_remote_and_fallback():
+    clients = DownstreamClients()
+    clients.model_serving = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=model_serving_app), base_url="http://model-serving"
+    )
+    clients.comparable_engine = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(503)), base_url="http://comps"
+    )
+    pipeline = RealEstatePipeline()
+    graph = pipeline.stage_graph(clients, {"comps": 0.5, "predict": 1.0, "explain": 1.0})
+    payload = ValuationRequest(class_="real_estate", attributes={"living_area_sqft": 2000})
+
+    try:
+        async with model_serving_app.router.lifespan_context(model_serving_app):
+            response = await pipeline.valuate_staged(payload, graph)
+            repeat = await pipeline.valuate_staged(payload, graph)
+    finally:
+        await clients.close()
+
+    stages = response.metadata["stages"]
+    assert response.method == "model_serving"
+    assert response.estimate == 420000
+    assert stages["predict"]["status"] == "ok"
+    assert stages["comps"]["fallback"] is True
+    assert {comp.source for comp in response.comps} == {"synthetic"}
+    # degraded responses are not cached
+    assert repeat.metadata["cache_hit"] is False
+
+
+async def test_empty_comps_search_falls_back_to_synthetic_comps():
+    clients = DownstreamClients()
+    clients.comparable_engine = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"results": []})),
+        base_url="http://comps",
+    )
+    pipeline = RealEstatePipeline()
+    graph = pipeline.stage_graph(clients, {"comps": 0.5})
+    payload = ValuationRequest(class_="real_estate", attributes={"living_area_sqft": 2000})
+
+    try:
+        response = await pipeline.valuate_staged(payload, graph)
+    finally:
+        await clients.close()
+
+    comps_stage = response.metadata["stages"]["comps"]
+    assert comps_stage["fallback"] is True and "no comps" in comps_stage["error"]
+    assert response.comps and {comp.source for comp in response.comps} == {"synthetic"}
+
+
+async def test_real_estate_market_stage_uses_data_feeds_and_caches():
+    rates = {"rates": {"fed_funds_target": 5.25}}
+    clients = DownstreamClients()
+    clients.data_feeds = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=rates)),
+        base_url="http://data-feeds",
+    )
+    pipeline = RealEstatePipeline()
+    graph = pipeline.stage_graph(clients, {"market": 1.0})
+    payload = ValuationRequest(class_="real_estate", attributes={"living_area_sqft": 2000})
+
+    try:
+        response = await pipeline.valuate_staged(payload, graph)
+        repeat = await pipeline.valuate_staged(payload, graph)
+    finally:
+        await clients.close()
+
+    assert response.metadata["stages"]["market"]["status"] == "ok"
+    assert response.metadata["market"] == rates
+    assert repeat.metadata["cache_hit"] is True
+    assert pipeline.cache_stats()["size"] == 1
+
+
+async def test_staged_path_reads_and_writes_the_sqlite_cache_off_the_event_loop(tmp_path):
+    threads = []
+
+    class RecordingCache(SQLiteValuationCache):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value):
+            threads.append(threading.get_ident())
+            super().set(key, value)
+
+    cache = RecordingCache(tmp_path / "cache.db", max_entries=10, ttl_seconds=60)
+    pipeline = RealEstatePipeline(cache=cache)
+    graph = pipeline.stage_graph(DownstreamClients(), {})
+    payload = ValuationRequest(class_="real_estate", attributes={"living_area_sqft": 2000})
+
+    await pipeline.valuate_staged(payload, graph)
+    repeat = await pipeline.valuate_staged(payload, graph)
+    cache.close()
+
+    assert repeat.metadata["cache_hit"] is True
+    assert len(threads) == 3 and threading.get_ident() not in threads
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from services.model_serving.app.predictor import BaselinePredictor
+from services.model_serving.app.registry import ModelRegistry
+from services.model_serving.app.trees import TreeEnsemble
+from valora_common.schemas.valuation import ValuationRequest
+
+FEATURES = ("living_area_sqft", "bedrooms")
+
+
+def _stump_ensemble() -> TreeEnsemble:
+    # tree 0: sqft <= 2000 ? 100 : (bedrooms <= 3 ? 200 : 300); tree 1: bedrooms <= 2 ? -10 : 10
+    first = (
+        np.array([0, -2, 1, -2, -2]),
+        np.array([2000.0, -2, 3.0, -2, -2]),
+        np.array([1, -1, 3, -1, -1]),
+        np.array([2, -1, 4, -1, -1]),
+        np.array([False, False, True, False, False]),
+        np.array([0.0, 100.0, 0.0, 200.0, 300.0]),
+    )
+    second = (
+        np.array([1, -2, -2]),
+        np.array([2.0, -2, -2]),
+        np.array([1, -1, -1]),
+        np.array([2, -1, -1]),
+        None,
+        np.array([0.0, -10.0, 10.0]),
+    )
+    return TreeEnsemble.from_arrays([first, second], base_score=1000.0, feature_names=FEATURES)
+
+
+def test_flattened_traversal_follows_thresholds_and_missing_values():
+    model = _stump_ensemble()
+    rows = np.array([[1500, 2], [2500, 3], [2500, 5], [2500, np.nan]])
+
+    assert model.max_depth == 2
+    assert model.predict(rows).tolist() == [1090.0, 1210.0, 1310.0, 1210.0]
+
+
+def test_save_and_memory_mapped_load_round_trip(tmp_path):
+    model = _stump_ensemble()
+    loaded = TreeEnsemble.load(model.save(tmp_path / "model"), mmap=True)
+    rows = model.feature_matrix([{"living_area_sqft": 2500, "bedrooms": 4}, {"bedrooms": None}])
+
+    assert isinstance(loaded.value, np.memmap)
+    assert loaded.feature_names == FEATURES
+    np.testing.assert_array_equal(loaded.predict(rows), model.predict(rows))
+
+
+def test_predictor_prices_real_estate_with_registry_model(tmp_path):
+    _stump_ensemble().save(tmp_path / "real_estate" / "default" / "v1")
+    predictor = BaselinePredictor(registry=ModelRegistry(tmp_path))
+    payloads = [
+        ValuationRequest(
+            class_="real_estate", attributes={"living_area_sqft": 1500, "bedrooms": 4}
+        ),
+        ValuationRequest(class_="auto", attributes={}),
+    ]
+
+    results = predictor.predict_batch(payloads)
+
+    assert results[0]["estimate"] == 1110.0
+    assert results[1]["estimate"] == BaselinePredictor.AUTO_ESTIMATE
+
+
+def test_matches_scikit_learn_predictions():
+    ensemble = pytest.importorskip("sklearn.ensemble")
+    rng = np.random.default_rng(0)
+    features = rng.uniform(0, 100, size=(2000, 4))
+    target = features[:, 0] * 3 + np.sin(features[:, 1]) * 20 + rng.normal(0, 5, 2000)
+
+    for model in (
+        ensemble.GradientBoostingRegressor(n_estimators=60, max_depth=4).fit(features, target),
+        ensemble.RandomForestRegressor(n_estimators=20, max_depth=6, random_state=0).fit(
+            features, target
+        ),
+    ):
+        flat = TreeEnsemble.from_sklearn(model, ["a", "b", "c", "d"])
+        np.testing.assert_allclose(
+            flat.predict(features), model.predict(features), rtol=1e-9, atol=1e-6
+        )
+
+
+def test_contributions_add_up_to_prediction():
+    model = _stump_ensemble()
+    rows = np.array([[1500, 2], [2500, 3], [2500, 5], [2500, np.nan]])
+
+    bias, contributions = model.contributions(rows)
+
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), model.predict(rows))
+    # internal nodes are worth 0 here, so the bedrooms split that picks each leaf takes it all
+    assert contributions[1].tolist() == [0.0, 210.0]
@@ -1,7 +1,20 @@
+import hashlib
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_SCRATCH = tempfile.mkdtemp()
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(_SCRATCH, "jobs.db"))
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_SCRATCH, "uploads"))
+
 import pytest
 from fastapi.testclient import TestClient
 
 from services.valuation_orchestrator.app.main import app
+from services.valuation_orchestrator.app.settings import Settings, get_settings
+from services.valuation_orchestrator.app.storage.jobs import SQLiteJobStore
 
 
 @pytest.fixture()
@@ -27,6 +40,72 @@ def test_real_estate_valuation_completes_synchronously(client: TestClient):
     assert data["status"] == "completed"
     assert data["estimate"] > 0
     assert data["comps"]
+    assert set(data["metadata"]["stages"]) == {"comps", "predict", "explain", "market"}
+
+    repeat = client.post("/valuations", json=payload).json()
+    assert repeat["metadata"]["cache_hit"] is True
+    stats = client.get("/valuations/cache/stats").json()["real_estate"]
+    assert stats["hits"] >= 1
+
+
+def test_batch_valuation_preserves_order(client: TestClient):
+    items = [
+        {"class": "real_estate", "attributes": {"address": "1 Oak Ave", "living_area_sqft": 1200}},
+        {
+            "class": "auto",
+            "attributes": {"make": "Toyota", "model": "Camry", "year": 2021, "trim": "SE"},
+        },
+        {"class": "real_estate", "attributes": {"address": "2 Oak Ave", "living_area_sqft": 2400}},
+    ]
+
+    response = client.post("/valuations/batch", json={"items": items})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3
+    methods = [result["method"] for result in data["results"]]
+    assert methods == ["baseline_gbr_v0", "hedonic_v0", "baseline_gbr_v0"]
+    assert data["results"][2]["estimate"] > data["results"][0]["estimate"]
+
+
+def test_batch_null_attributes_take_defaults_and_bad_values_name_the_item(client: TestClient):
+    items = [
+        {"class": "real_estate", "attributes": {"living_area_sqft": 1600, "bedrooms": 3}},
+        {"class": "auto", "attributes": {"make": "Toyota", "model": "Camry", "year": 2021}},
+        {"class": "real_estate", "attributes": {"living_area_sqft": None, "bedrooms": None}},
+    ]
+
+    response = client.post("/valuations/batch", json={"items": items})
+    assert response.status_code == 200
+    first, _, nulls = response.json()["results"]
+    assert nulls["estimate"] == first["estimate"]
+    assert all(0 <= item["magnitude"] <= 1 for item in nulls["explanations"])
+
+    items[2]["attributes"]["bedrooms"] = "three"
+    response = client.post("/valuations/batch", json={"items": items})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Item 2: bedrooms must be a number"
+
+
+def test_single_valuation_treats_null_and_garbage_attributes_like_the_batch(client: TestClient):
+    reference = {"living_area_sqft": 1600, "bedrooms": 3, "address": "9 Null Ct"}
+    expected = client.post("/valuations", json={"class": "real_estate", "attributes": reference})
+
+    nulls = {"living_area_sqft": None, "bedrooms": None, "address": "9 Null Ct"}
+    response = client.post("/valuations", json={"class": "real_estate", "attributes": nulls})
+    assert response.status_code == 200
+    assert response.json()["estimate"] == expected.json()["estimate"]
+
+    garbage = {"living_area_sqft": "abc", "address": "9 Null Ct"}
+    response = client.post("/valuations", json={"class": "real_estate", "attributes": garbage})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "living_area_sqft must be a number"
+
+
+def test_empty_batch_is_rejected(client: TestClient):
+    response = client.post("/valuations/batch", json={"items": []})
+
+    assert response.status_code == 422
 
 
 def test_auto_valuation_returns_job_reference(client: TestClient):
@@ -50,12 +129,38 @@ def test_auto_valuation_returns_job_reference(client: TestClient):
     assert "job_id" in data
     job_id = data["job_id"]
 
-    job_response = client.get(f"/jobs/{job_id}")
+    job_body = _wait_for_job(client, job_id)
 
-    assert job_response.status_code == 200
-    job_body = job_response.json()
     assert job_body["job_id"] == job_id
-    assert job_body["status"] == "queued"
+    assert job_body["status"] == "succeeded"
+    assert job_body["progress"] == {"processed": 1, "total": 1, "succeeded": 1, "failed": 0}
+
+    results = client.get(f"/jobs/{job_id}/results").json()
+    assert results["count"] == 1
+    assert results["results"][0]["method"] == "hedonic_v0"
+
+    listed = client.get("/jobs", params={"status": "succeeded"}).json()
+    assert job_id in {job["job_id"] for job in listed}
+
+
+def test_worker_stats_are_exposed(client: TestClient):
+    response = client.get("/workers/stats")
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["queue_capacity"] > 0
+    assert {"queue_depth", "running", "completed", "run_ms"} <= stats.keys()
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout_seconds: float = 30.0) -> dict:
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        response = client.get(f"/jobs/{job_id}")
+        assert response.status_code == 200
+        body = response.json()
+        if body["status"] not in ("queued", "running") or time.monotonic() > deadline:
+            return body
+        time.sleep(0.05)
 
 
 def test_unknown_job_returns_404(client: TestClient):
@@ -64,6 +169,26 @@ def test_unknown_job_returns_404(client: TestClient):
     assert response.status_code == 404
 
 
+def test_jobs_left_unfinished_by_a_previous_process_fail_at_startup():
+    store = SQLiteJobStore(os.environ["JOB_STORE_PATH"])
+    store.create("job_interrupted", total=3)
+    store.update("job_interrupted", status="running")
+    store.create("job_fresh", total=1)
+    an_hour_ago = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    store._db.connection().execute(
+        "UPDATE jobs SET updated_at = ? WHERE job_id = 'job_interrupted'", (an_hour_ago,)
+    )
+    store.close()
+
+    with TestClient(app) as test_client:
+        interrupted = test_client.get("/jobs/job_interrupted").json()
+        fresh = test_client.get("/jobs/job_fresh").json()
+
+    assert interrupted["status"] == "failed" and "interrupted" in interrupted["error"]
+    # recent jobs may still belong to a live worker sharing the file
+    assert fresh["status"] == "queued"
+
+
 def test_image_upload(tmp_path, client: TestClient):
     file_path = tmp_path / "photo.jpg"
     file_path.write_bytes(b"fake-image-bytes")
@@ -74,3 +199,31 @@ def test_image_upload(tmp_path, client: TestClient):
     assert response.status_code == 201
     body = response.json()
     assert body["status"] == "stored"
+    assert body["bytes"] == len(b"fake-image-bytes")
+    assert body["sha256"] == hashlib.sha256(b"fake-image-bytes").hexdigest()
+    assert Path(body["path"]).read_bytes() == b"fake-image-bytes"
+
+
+def test_image_upload_rejects_non_images(client: TestClient):
+    response = client.post(
+        "/valuations/demo/images", files={"image": ("notes.txt", b"hello", "text/plain")}
+    )
+
+    assert response.status_code == 415
+
+
+def test_image_upload_enforces_max_size(client: TestClient):
+    settings = Settings()
+    settings.max_upload_bytes = 1024
+    settings.upload_flush_bytes = 256
+    app.dependency_overrides[get_settings] = lambda: settings
+    try:
+        response = client.post(
+            "/valuations/demo/images", files={"image": ("big.jpg", b"x" * 4096, "image/jpeg")}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 413
+    leftovers = list(Path(os.environ["UPLOAD_DIR"]).glob("*big.jpg*"))
+    assert leftovers == []
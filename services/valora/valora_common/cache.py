@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUTTLCache(Generic[K, V]):
+    """Thread-safe bounded cache with LRU eviction and per-entry TTL expiry.
+
+    Expired entries are dropped when they are read and by :meth:`purge_expired`; once
+    ``max_entries`` is reached the least recently used entry makes room for the new one.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute_many(
+        self, keys: Sequence[K], compute: Callable[[List[int]], Sequence[V]]
+    ) -> List[V]:
+        """Values for ``keys``, computing every distinct miss in a single call.
+
+        ``compute`` receives the position in ``keys`` of the first occurrence of each
+        missing key and returns their values in that order; they are cached on the way out.
+        """
+        found: Dict[K, V] = {}
+        missing: Dict[K, int] = {}
+        for index, key in enumerate(keys):
+            if key in found or key in missing:
+                continue
+            value = self.get(key)
+            if value is None:
+                missing[key] = index
+            else:
+                found[key] = value
+        if missing:
+            for key, value in zip(missing, compute(list(missing.values()))):
+                self.set(key, value)
+                found[key] = value
+        return [found[key] for key in keys]
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            now = self._clock()
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            self._expirations += len(expired)
+            return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
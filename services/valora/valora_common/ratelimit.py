@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Protocol
+
+from fastapi import HTTPException, Request, status
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``requests`` per ``per_seconds`` on average, in bursts of at most ``burst``.
+
+    A bucket holds up to ``burst`` tokens (``requests`` when unset) and refills one every
+    ``per_seconds / requests`` seconds; each request takes a token. Unlike a fixed
+    window, a client can never get more than ``burst`` requests through at once.
+    """
+
+    requests: int
+    per_seconds: float
+    burst: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.requests < 1 or self.per_seconds <= 0:
+            raise ValueError("a rate limit needs at least one request per positive period")
+        if self.burst is not None and self.burst < 1:
+            raise ValueError("burst must be at least 1")
+
+    @property
+    def capacity(self) -> int:
+        return self.burst if self.burst is not None else self.requests
+
+    @property
+    def interval(self) -> float:
+        """Seconds to refill one token."""
+        return self.per_seconds / self.requests
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+class BucketStore(Protocol):
+    """Token buckets by key.
+
+    A bucket is stored as the single time at which it will be full again: ``full_at``
+    at or before now means ``capacity`` tokens, and each token taken pushes it one
+    refill interval further out. A request is allowed while that leaves it no more than
+    ``capacity`` intervals ahead. Buckets that have refilled hold nothing a fresh one
+    would not, so stores drop them freely.
+    """
+
+    def take(self, key: str, limit: RateLimit, now: float) -> Decision: ...
+
+    def reset(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+def _decision(allowed: bool, full_at: float, limit: RateLimit, now: float) -> Decision:
+    interval = limit.interval
+    # Tokens left is how far full_at sits below the bucket's capacity horizon.
+    remaining = max(int((now + limit.capacity * interval - full_at) / interval + 1e-9), 0)
+    retry_after = 0.0 if allowed else max(full_at - (limit.capacity - 1) * interval - now, 0.0)
+    return Decision(allowed=allowed, remaining=remaining, retry_after=retry_after)
+
+
+class MemoryBucketStore:
+    """Buckets for this process only, at most ``max_entries`` of them.
+
+    Checks are a dict lookup. Each one also drops refilled buckets from the least
+    recently used end, so idle clients do not accumulate; past ``max_entries`` the
+    least recently used bucket goes even if it has not refilled.
+    """
+
+    def __init__(self, *, max_entries: int = 100_000) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def take(self, key: str, limit: RateLimit, now: float) -> Decision:
+        interval = limit.interval
+        with self._lock:
+            full_at = max(self._buckets.get(key, now), now)
+            allowed = full_at - now <= (limit.capacity - 1) * interval
+            if allowed:
+                full_at += interval
+            self._buckets[key] = full_at
+            self._buckets.move_to_end(key)
+            self._evict(now)
+        return _decision(allowed, full_at, limit, now)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            key, full_at = next(iter(buckets.items()))
+            if full_at > now and len(buckets) <= self.max_entries:
+                break
+            del buckets[key]
+            self.evictions += 1
+
+
+# UPSERT ... RETURNING, which the check is a single statement of, arrived in 3.35.
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_buckets (key TEXT PRIMARY KEY, full_at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS rate_buckets_full_at ON rate_buckets (full_at);
+"""
+
+# One statement, so concurrent workers update a bucket atomically. The WHERE clause
+# turns a denial into no update, and so into no returned row.
+_TAKE = """
+INSERT INTO rate_buckets (key, full_at) VALUES (:key, :now + :interval)
+ON CONFLICT (key) DO UPDATE SET full_at = max(full_at, :now) + :interval
+WHERE full_at <= :now + :headroom
+RETURNING full_at
+"""
+
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file, shared by every worker process on the host.
+
+    A check is one indexed upsert. The file holds nothing worth keeping across a
+    restart, so it runs in WAL mode without syncing to disk; put it on a tmpfs such
+    as ``/dev/shm`` to keep it off the disk entirely. Refilled buckets are deleted
+    every ``prune_interval_seconds``. Each process opens its own connection on first
+    use, so stores created before a fork stay safe to use.
+
+    Checks run on the caller's thread, often the event loop, so a check waits at most
+    ``busy_timeout_seconds`` for another worker's write lock. Past that, or if the file
+    cannot be used at all, the request is let through and counted in ``failed_open``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        prune_interval_seconds: float = 60.0,
+        busy_timeout_seconds: float = 0.02,
+    ) -> None:
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"SQLiteBucketStore needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or "
+                f"newer for UPSERT ... RETURNING; this Python has {sqlite3.sqlite_version}"
+            )
+        self.path = path
+        self.prune_interval_seconds = prune_interval_seconds
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self.failed_open = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._next_prune = 0.0
+
+    def take(self, key: str, limit: RateLimit, now: float) -> Decision:
+        interval = limit.interval
+        params = {
+            "key": key,
+            "now": now,
+            "interval": interval,
+            "headroom": (limit.capacity - 1) * interval,
+        }
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(_TAKE, params).fetchone()
+                allowed = row is not None
+                if not allowed:
+                    row = connection.execute(
+                        "SELECT full_at FROM rate_buckets WHERE key = ?", (key,)
+                    ).fetchone()
+            except sqlite3.OperationalError:
+                # Locked past the busy timeout, or the file is unusable: stalling every
+                # request on this worker would be worse than letting this one through.
+                self.failed_open += 1
+                return Decision(allowed=True, remaining=0, retry_after=0.0)
+            if now >= self._next_prune:
+                self._next_prune = now + self.prune_interval_seconds
+                try:
+                    connection.execute("DELETE FROM rate_buckets WHERE full_at <= ?", (now,))
+                except sqlite3.OperationalError:
+                    pass  # refilled rows are harmless; the next prune takes them
+        return _decision(allowed, row[0] if row is not None else now, limit, now)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM rate_buckets")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connect().execute("SELECT count(*) FROM rate_buckets").fetchone()[0])
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            # Setting up the file happens once per process, so it may wait longer.
+            connection = sqlite3.connect(
+                self.path, timeout=1.0, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.executescript(_SCHEMA)
+            busy_timeout_ms = max(int(self.busy_timeout_seconds * 1000), 1)
+            connection.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+
+def client_host(request: Request) -> str:
+    return request.client.host if request.client else "anonymous"
+
+
+class RateLimiter:
+    """FastAPI dependency allowing each client ``limit``, answering 429 past it.
+
+    Buckets are keyed by ``scope`` and ``key(request)`` (the client address by
+    default), so services and routes can share one store with separate allowances.
+    The check is synchronous but O(1), and declared ``async`` so it runs inline on the
+    event loop rather than paying for a threadpool hop on every request; stores bound
+    how long it can block (see :class:`SQLiteBucketStore`)::
+
+        limiter = RateLimiter(RateLimit(60, 60), MemoryBucketStore(), scope="gateway")
+        router = APIRouter(dependencies=[Depends(limiter)])
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        store: BucketStore,
+        *,
+        scope: str,
+        key: Callable[[Request], str] = client_host,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.limit = limit
+        self.store = store
+        self.scope = scope
+        self._key = key
+        # Wall-clock time by default: it is the clock every worker process agrees on.
+        self._clock = clock
+
+    def check(self, identifier: str) -> Decision:
+        return self.store.take(f"{self.scope}:{identifier}", self.limit, self._clock())
+
+    async def __call__(self, request: Request) -> None:
+        decision = self.check(self._key(request))
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(max(math.ceil(decision.retry_after), 1))},
+            )
+
+
+def create_bucket_store(location: str) -> BucketStore:
+    """``memory`` for buckets in this process alone, else the path of a SQLite file.
+
+    On a system SQLite too old for :class:`SQLiteBucketStore` this warns and falls back
+    to memory, so each worker enforces the limit on its own instead of failing requests.
+    """
+    if location in {"", "memory"}:
+        return MemoryBucketStore()
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        warnings.warn(
+            f"SQLite {sqlite3.sqlite_version} is too old for a shared rate-limit store; "
+            "keeping buckets per process instead",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return MemoryBucketStore()
+    return SQLiteBucketStore(location)
@@ -16,6 +16,12 @@ class Comparable(BaseModel):
     attributes: Dict[str, Any] = Field(default_factory=dict)
     source: Optional[str] = None
     sale_date: Optional[datetime] = None
+    similarity: Optional[float] = Field(
+        None,
+        ge=0,
+        le=1,
+        description="1 for a sale identical to the subject, towards 0 as it differs",
+    )
 
 
 class Explanation(BaseModel):
@@ -48,6 +54,15 @@ class ValuationResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class BatchValuationRequest(BaseModel):
+    items: List[ValuationRequest] = Field(..., min_length=1, max_length=50000)
+
+
+class BatchValuationResponse(BaseModel):
+    count: int = Field(..., ge=0)
+    results: List[ValuationResponse]
+
+
 class AcceptedResponse(BaseModel):
     job_id: str
     status: Literal["accepted", "queued"] = "accepted"
@@ -68,3 +83,4 @@ class JobStatus(BaseModel):
     updated_at: datetime
     progress: JobProgress
     result_url: Optional[HttpUrl] = None
+    error: Optional[str] = None